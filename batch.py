@@ -0,0 +1,237 @@
+"""
+Procesamiento por lotes
+-----------------------
+Ejecuta cálculos leídos de un archivo JSONL en varios procesos de cálculo.
+
+Cada línea de entrada es un objeto JSON con los argumentos de
+``calculator_core.compute``, por ejemplo::
+
+    {"calculation_type": "Area", "function": "x**2", "variable": "x", "lower_bound": "0", "upper_bound": "1"}
+
+Los resultados se escriben en formato JSONL en el mismo orden que la entrada.
+Cada trabajo tiene un tiempo máximo: si lo supera, su proceso se termina (y
+se recrea) y la línea recibe un registro de error, de modo que un cálculo
+lento no detiene el resto del lote.
+
+Uso:
+    python batch.py trabajos.jsonl -o resultados.jsonl --workers 8 --timeout 30
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import calculator_core
+from calculation_worker import CalculationWorker
+from calculator_core import compute
+
+# Segundos máximos por trabajo por defecto
+DEFAULT_TIMEOUT = 60.0
+
+# Segundos entre consultas a los procesos mientras se espera el trabajo más antiguo
+POLL_INTERVAL = 0.05
+
+# Trabajos enviados o terminados sin escribir, por proceso
+PENDING_PER_WORKER = 2
+
+
+def read_jobs(lines):
+    """
+    Interpreta las líneas de entrada como trabajos, omitiendo las líneas vacías.
+
+    Una línea que no es JSON válido no detiene la lectura: se entrega como un
+    ``ValueError`` que ``run_job`` convierte en un registro de error.
+
+    Args:
+        lines (iterable): Líneas de texto en formato JSONL
+
+    Yields:
+        dict | ValueError: Argumentos del cálculo, o el error de la línea
+    """
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as error:
+            yield ValueError(f"Línea {number}: JSON inválido ({error})")
+
+
+def run_job(job):
+    """
+    Ejecuta un trabajo y lo convierte en un registro serializable a JSON.
+
+    Los errores se devuelven en el registro en lugar de propagarse para que un
+    trabajo inválido no detenga el lote completo.
+
+    Args:
+        job (dict | ValueError): Argumentos de ``compute``, o el error de lectura de la línea
+
+    Returns:
+        dict: Registro con ``calculation_type``, ``result``, ``text`` y ``error``
+    """
+    record = {"calculation_type": None, "result": None, "text": None, "error": None}
+    if isinstance(job, ValueError):
+        record["error"] = f"{type(job).__name__}: {job}"
+        return record
+    if not isinstance(job, dict):
+        record["error"] = f"TypeError: el trabajo debe ser un objeto JSON, no {type(job).__name__}"
+        return record
+    record["calculation_type"] = job.get("calculation_type")
+    try:
+        calculation = compute(**job)
+    except Exception as error:
+        record["error"] = f"{type(error).__name__}: {error}"
+    else:
+        record["result"] = str(calculation["value"])
+        record["text"] = calculation["text"]
+    return record
+
+
+# Configuración de la caché ya aplicada en este proceso de cálculo
+_configured = None
+
+# Marca el fin de los trabajos (una línea ``null`` es un trabajo válido, aunque erróneo)
+_END = object()
+
+
+def _warm_up():
+    """Trabajo vacío; su respuesta indica que el proceso ya importó sus módulos."""
+    return True
+
+
+def _run_configured(job, cache_size, cache_path):
+    """Ejecuta un trabajo en un proceso de cálculo, configurando antes su caché si hace falta."""
+    global _configured
+    if _configured != (cache_size, cache_path):
+        calculator_core.configure_cache(cache_size, cache_path)
+        _configured = (cache_size, cache_path)
+    return run_job(job)
+
+
+def _error_record(job, message):
+    """Registro de error de un trabajo que no devolvió resultado."""
+    calculation_type = job.get("calculation_type") if isinstance(job, dict) else None
+    return {"calculation_type": calculation_type, "result": None, "text": None, "error": message}
+
+
+def run_batch(jobs, output, workers=None, cache_size=256, cache_path=None, timeout=DEFAULT_TIMEOUT):
+    """
+    Ejecuta los trabajos en paralelo y escribe los resultados en orden.
+
+    Cada trabajo se ejecuta en un ``CalculationWorker``; el que supera
+    ``timeout`` se cancela (terminando su proceso) y se registra como
+    ``TimeoutError``. Los resultados que terminan antes que uno anterior
+    esperan su turno, con a lo sumo ``PENDING_PER_WORKER`` trabajos sin
+    escribir por proceso.
+
+    Args:
+        jobs (iterable): Trabajos a ejecutar
+        output (file): Archivo de salida en modo texto
+        workers (int): Número de procesos (por defecto, uno por núcleo)
+        cache_size (int): Entradas de la caché en memoria de cada proceso
+        cache_path (str): Base de datos SQLite compartida por los procesos, o None
+        timeout (float): Segundos máximos por trabajo
+
+    Returns:
+        int: Número de trabajos procesados
+
+    Raises:
+        ValueError: Si ``workers`` o ``timeout`` no son positivos
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("El número de procesos debe ser al menos 1.")
+    if not timeout > 0:
+        raise ValueError("El tiempo máximo por trabajo debe ser positivo.")
+
+    pool = [CalculationWorker(preload=("calculator_core",), daemon=False) for _ in range(workers)]
+    for worker in pool:
+        worker.submit(_warm_up)
+    jobs = iter(jobs)
+    running = {}    # proceso -> (índice, trabajo, plazo)
+    finished = {}   # índice -> registro
+    submitted = written = 0
+    exhausted = False
+    try:
+        while True:
+            for worker in pool:
+                if exhausted or worker.busy or submitted - written >= PENDING_PER_WORKER * workers:
+                    continue
+                job = next(jobs, _END)
+                if job is _END:
+                    exhausted = True
+                    break
+                worker.submit(_run_configured, job, cache_size, cache_path)
+                running[worker] = (submitted, job, time.monotonic() + timeout)
+                submitted += 1
+            if exhausted and not running:
+                break
+
+            # Se espera al trabajo más antiguo, que es el que detiene la salida
+            outcomes = {}
+            if running:
+                oldest = min(running, key=lambda worker: running[worker][0])
+                outcomes[oldest] = oldest.wait(max(0.0, min(POLL_INTERVAL, running[oldest][2] - time.monotonic())))
+            else:
+                # Todos los procesos están importando sus módulos
+                time.sleep(POLL_INTERVAL)
+            for worker in pool:
+                outcome = outcomes[worker] if worker in outcomes else worker.poll()
+                if worker not in running:
+                    continue
+                index, job, deadline = running[worker]
+                if outcome is None:
+                    if time.monotonic() < deadline:
+                        continue
+                    # Terminar el proceso es la única forma de detener SymPy; el nuevo se prepara
+                    # antes de recibir otro trabajo para que importar no cuente en su plazo
+                    worker.cancel()
+                    worker.submit(_warm_up)
+                    record = _error_record(job, f"TimeoutError: el trabajo superó el tiempo máximo de {timeout:g} s")
+                else:
+                    ok, payload = outcome
+                    record = payload if ok else _error_record(job, payload)
+                del running[worker]
+                finished[index] = record
+
+            while written in finished:
+                output.write(json.dumps({"index": written, **finished.pop(written)}) + "\n")
+                written += 1
+    finally:
+        for worker in pool:
+            worker.close()
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ejecuta cálculos por lotes desde un archivo JSONL.")
+    parser.add_argument("input", help="Archivo JSONL de trabajos ('-' para la entrada estándar)")
+    parser.add_argument("-o", "--output", default="-", help="Archivo JSONL de resultados ('-' para la salida estándar)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Número de procesos (por defecto, uno por núcleo)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Segundos máximos por trabajo")
+    parser.add_argument("--cache", default=None, help="Base de datos SQLite para conservar resultados entre ejecuciones")
+    parser.add_argument("--cache-size", type=int, default=256, help="Entradas de la caché en memoria de cada proceso")
+    args = parser.parse_args(argv)
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers debe ser al menos 1")
+    if not args.timeout > 0:
+        parser.error("--timeout debe ser positivo")
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    target = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        run_batch(read_jobs(source), target, args.workers, args.cache_size, args.cache, args.timeout)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+"""
+Benchmarks
+----------
+Mide el tiempo de cada etapa de un cálculo sobre un corpus versionado de expresiones.
+
+Cada expresión de ``benchmark_corpus.json`` se ejecuta con todos los tipos de
+cálculo que le corresponden y se cronometran por separado las etapas:
+
+    - parse: interpretación de los textos de entrada
+    - solve: operación simbólica sin simplificar y sin cachés
+    - simplify: simplificación del resultado con la política por defecto
+      (solo Integral, Derivative, Partial Derivative y Gradient / Hessian)
+    - lambdify: generación de los evaluadores numéricos
+    - sample: muestreo de las curvas o mallas
+    - render: gráfico completo dibujado fuera de pantalla con el motor Agg
+
+De cada etapa se guarda el menor tiempo de las repeticiones, que es el menos
+afectado por la carga de la máquina.
+
+Uso:
+    python benchmark.py run -o actual.json
+    python benchmark.py compare base.json actual.json --threshold 0.25
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+
+import matplotlib
+import numpy as np
+import sympy as sp
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+import evaluators
+from calculator_core import (BOUNDED_TYPES, CALCULATION_TYPES, SIMPLIFIED_TYPES, compute, parse_expression,
+                             simplify_calculation)
+from integral_plan import clear_plans
+from mesh import surface_mesh
+from plots import DEFAULT_BUDGET, gradient_panels, plot_calculation
+from sampling import adaptive_sample
+from simplification import DEFAULT_POLICY, clear_simplified
+
+# Corpus usado si no se indica otro
+DEFAULT_CORPUS = "benchmark_corpus.json"
+
+# Etapas medidas, en orden de ejecución
+STAGES = ["parse", "solve", "simplify", "lambdify", "sample", "render"]
+
+# Tipos de cálculo de una variable que se ejecutan con cada entrada de "functions"
+SINGLE_VARIABLE_TYPES = [calculation_type for calculation_type in CALCULATION_TYPES
+                         if calculation_type not in ("Partial Derivative", "Gradient / Hessian", "Chain Rule")]
+
+# Umbrales por defecto de compare: aumento relativo y aumento absoluto mínimo (segundos)
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_MIN_DELTA = 0.005
+
+
+def load_corpus(path=DEFAULT_CORPUS):
+    """
+    Lee un corpus de expresiones.
+
+    Args:
+        path (str): Archivo JSON del corpus
+
+    Returns:
+        dict: Corpus con las claves ``version``, ``functions``, ``multivariate`` y ``compositions``
+    """
+    with open(path, encoding="utf-8") as corpus_file:
+        return json.load(corpus_file)
+
+
+def corpus_jobs(corpus, calculation_types=None):
+    """
+    Genera los trabajos de un corpus, uno por expresión y tipo de cálculo.
+
+    Args:
+        corpus (dict): Corpus devuelto por ``load_corpus``
+        calculation_types (list): Tipos a incluir (por defecto, todos)
+
+    Yields:
+        tuple: Identificador estable del trabajo y argumentos de ``compute``
+    """
+    selected = calculation_types or CALCULATION_TYPES
+    for entry in corpus.get("functions", []):
+        for calculation_type in SINGLE_VARIABLE_TYPES:
+            if calculation_type not in selected:
+                continue
+            job = {"calculation_type": calculation_type, "function": entry["function"],
+                   "variable": entry.get("variable", "x")}
+            if calculation_type == "Limit":
+                job["limit_point"] = entry["limit_point"]
+            elif calculation_type in BOUNDED_TYPES:
+                job["lower_bound"] = entry["lower_bound"]
+                job["upper_bound"] = entry["upper_bound"]
+            yield _job_id(job), job
+    if "Partial Derivative" in selected:
+        for entry in corpus.get("multivariate", []):
+            job = {"calculation_type": "Partial Derivative", "function": entry["function"],
+                   "variable": entry.get("variable", "x"), "variable_2": entry["variable_2"]}
+            yield _job_id(job), job
+    if "Gradient / Hessian" in selected:
+        for entry in corpus.get("multivariate", []):
+            job = {"calculation_type": "Gradient / Hessian", "function": entry["function"], "hessian": True}
+            yield _job_id(job), job
+    if "Chain Rule" in selected:
+        for entry in corpus.get("compositions", []):
+            job = {"calculation_type": "Chain Rule", "variable": entry.get("variable", "x"),
+                   "outer_function": entry["outer_function"], "inner_function": entry["inner_function"]}
+            yield _job_id(job), job
+
+
+def _job_id(job):
+    """Construye un identificador legible a partir de los argumentos del trabajo."""
+    parameters = ", ".join(f"{name}={value}" for name, value in job.items() if name != "calculation_type")
+    return f"{job['calculation_type']}: {parameters}"
+
+
+def _timed(callable_, *args, **kwargs):
+    """Ejecuta ``callable_`` y devuelve su resultado y los segundos transcurridos."""
+    start = time.perf_counter()
+    value = callable_(*args, **kwargs)
+    return value, time.perf_counter() - start
+
+
+def _plotted_expressions(calculation):
+    """Devuelve las expresiones que se grafican de un cálculo y sus variables."""
+    calculation_type = calculation["calculation_type"]
+    variable = calculation.get("variable")
+    value = calculation["value"]
+    if calculation_type == "Partial Derivative":
+        return [calculation["function"], value], (variable, calculation["variable_2"])
+    if calculation_type == "Gradient / Hessian":
+        _, expressions = gradient_panels(calculation["function"], calculation["variables"], *value)
+        return [expressions], calculation["variables"]
+    if calculation_type == "Chain Rule":
+        return [calculation["inner_function"], value], variable
+    expressions = [calculation["function"]]
+    if isinstance(value, sp.Expr) and variable in value.free_symbols:
+        expressions.append(value)
+    return expressions, variable
+
+
+def _sample_range(calculation):
+    """Intervalo de muestreo: los límites del cálculo si son finitos, o [-10, 10]."""
+    try:
+        return float(calculation["lower_bound"]), float(calculation["upper_bound"])
+    except (KeyError, TypeError):
+        return -10.0, 10.0
+
+
+def benchmark_job(job, budget=DEFAULT_BUDGET):
+    """
+    Mide una vez cada etapa de un trabajo.
+
+    Las cachés de resultados, planes de integración y evaluadores se vacían
+    antes de cada etapa que las usa, así que cada medición parte de cero.
+
+    Args:
+        job (dict): Argumentos de ``compute``
+        budget (int): Número máximo de puntos por curva
+
+    Returns:
+        dict: Segundos por etapa; las etapas que no aplican se omiten
+    """
+    timings = {}
+    calculation_type = job["calculation_type"]
+
+    texts = [job[name] for name in ("function", "outer_function", "inner_function", "limit_point",
+                                     "lower_bound", "upper_bound") if job.get(name)]
+    evaluators.clear()
+    _, timings["parse"] = _timed(lambda: [parse_expression(text) for text in texts])
+
+    clear_plans()
+    calculation, timings["solve"] = _timed(compute, use_cache=False, simplify="none", **job)
+    if calculation_type in SIMPLIFIED_TYPES:
+        clear_simplified()
+        calculation, timings["simplify"] = _timed(simplify_calculation, calculation, DEFAULT_POLICY)
+
+    evaluators.clear()
+    expressions, args = _plotted_expressions(calculation)
+    functions, timings["lambdify"] = _timed(lambda: [evaluators.get_evaluator(expression, args)
+                                                      for expression in expressions])
+    if calculation_type in ("Partial Derivative", "Gradient / Hessian"):
+        _, timings["sample"] = _timed(lambda: [surface_mesh(f, (-5, 5), (-5, 5)) for f in functions])
+    else:
+        a, b = _sample_range(calculation)
+        _, timings["sample"] = _timed(lambda: [adaptive_sample(f, a, b, budget) for f in functions])
+
+    def render():
+        figure = Figure()
+        canvas = FigureCanvasAgg(figure)
+        plot_calculation(figure, calculation, budget)
+        canvas.draw()
+
+    _, timings["render"] = _timed(render)
+    return timings
+
+
+def run_benchmarks(corpus, repeat=3, calculation_types=None, budget=DEFAULT_BUDGET, progress=None):
+    """
+    Ejecuta todo el corpus y devuelve un informe serializable a JSON.
+
+    Args:
+        corpus (dict): Corpus devuelto por ``load_corpus``
+        repeat (int): Repeticiones de cada trabajo; se conserva el menor tiempo por etapa
+        calculation_types (list): Tipos a incluir (por defecto, todos)
+        budget (int): Número máximo de puntos por curva
+        progress (file): Archivo donde informar el avance, o None
+
+    Returns:
+        dict: Informe con el entorno, la versión del corpus y los tiempos por trabajo
+    """
+    results = {}
+    for job_id, job in corpus_jobs(corpus, calculation_types):
+        record = {"calculation_type": job["calculation_type"], "stages": {}, "error": None}
+        try:
+            for _ in range(repeat):
+                for stage, seconds in benchmark_job(job, budget).items():
+                    record["stages"][stage] = min(seconds, record["stages"].get(stage, float("inf")))
+        except Exception as error:
+            record["error"] = f"{type(error).__name__}: {error}"
+        record["total"] = sum(record["stages"].values())
+        results[job_id] = record
+        if progress is not None:
+            status = record["error"] or f"{record['total'] * 1000:.1f} ms"
+            print(f"{job_id}: {status}", file=progress, flush=True)
+
+    return {
+        "corpus_version": corpus.get("version"),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "repeat": repeat,
+        "budget": budget,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sympy": sp.__version__,
+            "numpy": np.__version__,
+            "matplotlib": matplotlib.__version__,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD, min_delta=DEFAULT_MIN_DELTA):
+    """
+    Compara dos informes y devuelve las etapas que se volvieron más lentas.
+
+    Una etapa es una regresión si su tiempo crece más de ``threshold`` (en
+    proporción) y más de ``min_delta`` segundos; el segundo umbral evita
+    señalar el ruido de las etapas de pocos microsegundos.
+
+    Args:
+        baseline (dict): Informe de referencia
+        current (dict): Informe nuevo
+        threshold (float): Aumento relativo tolerado
+        min_delta (float): Aumento absoluto tolerado, en segundos
+
+    Returns:
+        list: Tuplas ``(trabajo, etapa, antes, después)``; la etapa ``"error"``
+        indica un trabajo que antes funcionaba y ahora falla
+    """
+    regressions = []
+    for job_id, before in baseline["results"].items():
+        after = current["results"].get(job_id)
+        if after is None:
+            continue
+        if after["error"] and not before["error"]:
+            regressions.append((job_id, "error", None, after["error"]))
+            continue
+        for stage in STAGES:
+            old, new = before["stages"].get(stage), after["stages"].get(stage)
+            if old is None or new is None:
+                continue
+            if new > old * (1 + threshold) and new - old > min_delta:
+                regressions.append((job_id, stage, old, new))
+    return regressions
+
+
+def _write_json(report, path):
+    if path == "-":
+        json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write("\n")
+        return
+    with open(path, "w", encoding="utf-8") as output:
+        json.dump(report, output, indent=2, ensure_ascii=False)
+
+
+def _read_json(path):
+    with open(path, encoding="utf-8") as report_file:
+        return json.load(report_file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mide el rendimiento de la calculadora sobre un corpus de expresiones.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Ejecuta el corpus y guarda los tiempos en JSON")
+    run_parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Archivo JSON del corpus")
+    run_parser.add_argument("-o", "--output", default="-", help="Archivo JSON del informe ('-' para la salida estándar)")
+    run_parser.add_argument("-r", "--repeat", type=int, default=3, help="Repeticiones de cada trabajo")
+    run_parser.add_argument("-t", "--type", action="append", choices=CALCULATION_TYPES, dest="types",
+                            help="Tipo de cálculo a incluir (se puede repetir; por defecto, todos)")
+    run_parser.add_argument("--budget", type=int, default=DEFAULT_BUDGET, help="Puntos por curva al muestrear")
+
+    compare_parser = commands.add_parser("compare", help="Señala las regresiones respecto a un informe de referencia")
+    compare_parser.add_argument("baseline", help="Informe de referencia")
+    compare_parser.add_argument("current", help="Informe nuevo")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help="Aumento relativo tolerado (0.25 = 25%%)")
+    compare_parser.add_argument("--min-delta", type=float, default=DEFAULT_MIN_DELTA,
+                                help="Aumento absoluto tolerado, en segundos")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        report = run_benchmarks(load_corpus(args.corpus), args.repeat, args.types, args.budget, progress=sys.stderr)
+        _write_json(report, args.output)
+        return 0
+
+    baseline, current = _read_json(args.baseline), _read_json(args.current)
+    if baseline.get("corpus_version") != current.get("corpus_version"):
+        print(f"Aviso: versiones de corpus distintas ({baseline.get('corpus_version')} y "
+              f"{current.get('corpus_version')}); solo se comparan los trabajos comunes.", file=sys.stderr)
+    regressions = compare(baseline, current, args.threshold, args.min_delta)
+    for job_id, stage, old, new in regressions:
+        if stage == "error":
+            print(f"REGRESIÓN {job_id} [error]: {new}")
+        else:
+            print(f"REGRESIÓN {job_id} [{stage}]: {old * 1000:.2f} ms -> {new * 1000:.2f} ms "
+                  f"(+{(new / old - 1) * 100:.0f}%)")
+    print(f"{len(regressions)} regresiones en {len(current['results'])} trabajos.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
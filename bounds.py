@@ -0,0 +1,393 @@
+"""
+Límites variables
+-----------------
+Evaluación rápida de Area, Volume, Average, Surface Area y Centroid cuando
+solo cambian los límites de integración.
+
+Para cada integrando de ``integral_plan.PLAN_INTEGRANDS`` se construye una
+``CumulativeIntegral``: la integral acumulada sobre una malla fija de un
+dominio, integrada numéricamente una sola vez. Las celdas donde la
+integración no converge (polos y otras singularidades) dividen la malla en
+tramos que nunca se suman entre sí. Si se conoce una antiderivada F en forma
+cerrada (y coincide con la malla en las celdas regulares), un par de límites
+dentro de un mismo tramo se evalúa como ``F(b) - F(a)``; si no, con la malla
+y solo el tramo parcial entre el nodo más cercano y cada límite. Cambiar los
+límites cuesta entonces unas pocas evaluaciones vectorizadas en lugar de una
+integración simbólica completa.
+
+Los pares que tocan una celda singular se integran por separado; si esa
+integral no converge (por ejemplo, un polo de ``1/x**2`` entre los límites),
+el resultado es NaN.
+
+``BoundExplorer`` evalúa un tipo de cálculo para los deslizadores de la
+interfaz; ``integrate_bounds`` evalúa varios tipos para arreglos de miles de
+pares de límites a la vez.
+
+Dependencias:
+    - numpy: Para operaciones numéricas
+    - sympy: Para interpretar las funciones
+"""
+
+import threading
+import time
+
+import numpy as np
+import sympy as sp
+
+import quadrature
+from evaluators import get_evaluator, parse_cached
+from integral_plan import PLAN_INTEGRANDS, SYMBOLIC_DEADLINE, get_plan
+
+# Celdas de la malla de la integral acumulada numérica
+GRID_CELLS = 1024
+
+# Tolerancia relativa con la que una antiderivada debe coincidir con la malla numérica
+ANTIDERIVATIVE_TOLERANCE = 1e-6
+
+# Error relativo a partir del cual una celda (o la integral de un par de límites) no converge
+CONVERGENCE_TOLERANCE = 1e-6
+
+# Celdas con que se busca una singularidad a cada lado al extender un dominio (ver extend_domain)
+EXTENSION_CELLS = 128
+
+# Pares de límites evaluados juntos por integrate_bounds (acota la memoria de cada bloque)
+CHUNK_SIZE = 32768
+
+
+def combine(calculation_type, integrals, lower_bound, upper_bound):
+    """
+    Obtiene el resultado de un tipo de cálculo a partir de sus integrales definidas.
+
+    Es la versión numérica (y vectorizada) de las fórmulas de
+    ``calculator_core._evaluate``.
+
+    Args:
+        calculation_type (str): Clave de ``PLAN_INTEGRANDS``
+        integrals (list): Integrales de cada integrando, en el orden de ``PLAN_INTEGRANDS``
+        lower_bound (float | numpy.ndarray): Límites inferiores
+        upper_bound (float | numpy.ndarray): Límites superiores
+
+    Returns:
+        float | numpy.ndarray | tuple: Resultado; para Centroid, la tupla ``(x̄, ȳ)``
+    """
+    with np.errstate(all="ignore"):
+        if calculation_type == "Area":
+            return integrals[0]
+        if calculation_type == "Volume":
+            return np.pi * integrals[0]
+        if calculation_type == "Average":
+            return integrals[0] / (np.asarray(upper_bound) - np.asarray(lower_bound))
+        if calculation_type == "Surface Area":
+            return 2 * np.pi * integrals[0]
+        mass, moment_x, moment_y = integrals
+        return moment_x / mass, moment_y / (2 * mass)
+
+
+def _converged(values, errors):
+    """Indica qué integrales numéricas son finitas y tienen un error relativo aceptable."""
+    with np.errstate(all="ignore"):
+        return np.isfinite(values) & (errors <= CONVERGENCE_TOLERANCE * np.maximum(1.0, np.abs(values)))
+
+
+class CumulativeIntegral:
+    """
+    Integral acumulada de ``integrand`` sobre una malla de ``domain``, dividida en las celdas singulares.
+
+    Args:
+        integrand (sympy.Expr): Función a integrar
+        variable (sympy.Symbol): Variable de integración
+        domain (tuple): Intervalo finito ``(inicio, fin)`` donde se esperan los límites
+        antiderivative (sympy.Expr): Antiderivada conocida, o None
+        cells (int): Celdas de la malla numérica
+
+    Attributes:
+        method (str): ``"exact"`` si se usa la antiderivada, ``"numeric"`` si se usa la malla
+    """
+
+    def __init__(self, integrand, variable, domain, antiderivative=None, cells=GRID_CELLS):
+        self.f = get_evaluator(integrand, variable)
+        self.nodes = np.linspace(float(domain[0]), float(domain[1]), cells + 1)
+        values, errors = quadrature.integrate_intervals(self.f, self.nodes[:-1], self.nodes[1:])
+        self.singular = ~_converged(values, errors)
+        self.values = np.where(self.singular, 0.0, values)
+        # Las celdas singulares cuentan 0: la diferencia entre dos nodos de un mismo tramo sigue siendo exacta
+        self.table = np.concatenate([[0.0], np.cumsum(self.values)])
+        # Tramo de cada celda; dos celdas están en el mismo tramo si no hay una celda singular entre ellas
+        self.segment = np.concatenate([[0], np.cumsum(self.singular)])[:-1]
+        self.F = None
+        self.method = "numeric"
+        if antiderivative is not None and not antiderivative.has(sp.Integral):
+            self._use_antiderivative(antiderivative, variable)
+
+    def _use_antiderivative(self, antiderivative, variable):
+        """Adopta la antiderivada si coincide con la malla numérica en todas las celdas regulares."""
+        try:
+            F = get_evaluator(antiderivative, variable)
+            with np.errstate(all="ignore"):
+                increments = np.diff(np.asarray(F(self.nodes), dtype=float))
+        except Exception:
+            # Por ejemplo, funciones especiales sin equivalente en NumPy
+            return
+        regular = ~self.singular
+        scale = max(1.0, np.max(np.abs(self.table)))
+        with np.errstate(invalid="ignore"):
+            matches = np.abs(increments[regular] - self.values[regular]) <= ANTIDERIVATIVE_TOLERANCE * scale
+        if np.all(matches):
+            self.F = F
+            self.method = "exact"
+
+    def _cells(self, t):
+        """Celda de cada punto; fuera del dominio, la del extremo (la malla se extrapola)."""
+        return np.clip(np.searchsorted(self.nodes, t) - 1, 0, self.nodes.size - 2)
+
+    def _cumulative(self, t, cells):
+        """Integral desde el inicio del dominio hasta ``t`` sumando la malla y el tramo parcial."""
+        partial, _ = quadrature.integrate_intervals(self.f, self.nodes[cells], t)
+        return self.table[cells] + partial
+
+    def _local(self, lower_bound, upper_bound):
+        """
+        Integra cada par por separado (pares que tocan una celda singular).
+
+        Se usa la antiderivada si coincide con la integral numérica del par;
+        los pares cuya integral numérica no converge dan NaN.
+        """
+        values, errors = quadrature.integrate_intervals(self.f, lower_bound, upper_bound)
+        converged = _converged(values, errors)
+        if self.F is not None:
+            with np.errstate(all="ignore"):
+                exact = np.asarray(self.F(upper_bound), dtype=float) - np.asarray(self.F(lower_bound), dtype=float)
+                agrees = np.abs(exact - values) <= ANTIDERIVATIVE_TOLERANCE * np.maximum(1.0, np.abs(values))
+            values = np.where(agrees, exact, values)
+        return np.where(converged, values, np.nan)
+
+    def between(self, lower_bound, upper_bound):
+        """
+        Calcula la integral definida para cada par de límites.
+
+        Args:
+            lower_bound (float | numpy.ndarray): Límites inferiores
+            upper_bound (float | numpy.ndarray): Límites superiores
+
+        Returns:
+            numpy.ndarray: Integrales, con la forma de los límites; NaN para los
+            pares cuya integral no converge
+        """
+        lower_bound, upper_bound = np.broadcast_arrays(np.asarray(lower_bound, dtype=float),
+                                                       np.asarray(upper_bound, dtype=float))
+        shape = lower_bound.shape
+        lower_bound, upper_bound = lower_bound.ravel(), upper_bound.ravel()
+        lower_cells, upper_cells = self._cells(lower_bound), self._cells(upper_bound)
+        regular = (~self.singular[lower_cells] & ~self.singular[upper_cells]
+                   & (self.segment[lower_cells] == self.segment[upper_cells]))
+
+        result = np.empty(lower_bound.size)
+        a, b = lower_bound[regular], upper_bound[regular]
+        if self.F is not None:
+            with np.errstate(all="ignore"):
+                result[regular] = np.asarray(self.F(b), dtype=float) - np.asarray(self.F(a), dtype=float)
+        else:
+            result[regular] = (self._cumulative(b, upper_cells[regular])
+                               - self._cumulative(a, lower_cells[regular]))
+        if not regular.all():
+            result[~regular] = self._local(lower_bound[~regular], upper_bound[~regular])
+        return result.reshape(shape)
+
+
+def cumulative_integrals(function, variable, names, domain, antiderivatives=None):
+    """
+    Construye la integral acumulada de varios integrandos de ``PLAN_INTEGRANDS``.
+
+    Args:
+        function (str | sympy.Expr): Función
+        variable (sympy.Symbol): Variable de integración
+        names (iterable): Nombres de los integrandos (por ejemplo ``"x*f"``)
+        domain (tuple): Intervalo finito donde se evaluarán
+        antiderivatives (dict): Antiderivadas conocidas por nombre, o None
+
+    Returns:
+        dict: ``CumulativeIntegral`` por nombre de integrando
+    """
+    function = parse_cached(function)
+    antiderivatives = antiderivatives or {}
+    integrals = {}
+    for name in names:
+        integrand = sp.sympify(name, locals={"f": function, "x": variable})
+        integrals[name] = CumulativeIntegral(integrand, variable, domain, antiderivatives.get(name))
+    return integrals
+
+
+class BoundExplorer:
+    """
+    Evalúa un tipo de cálculo para límites arbitrarios dentro de un dominio.
+
+    Args:
+        function (str | sympy.Expr): Función
+        variable (sympy.Symbol): Variable de integración
+        calculation_type (str): Clave de ``PLAN_INTEGRANDS``
+        domain (tuple): Intervalo finito donde se moverán los límites
+        antiderivatives (dict): Antiderivadas conocidas por nombre de integrando
+            (ver ``calculator_core.compute``), o None
+    """
+
+    def __init__(self, function, variable, calculation_type, domain, antiderivatives=None):
+        self.calculation_type = calculation_type
+        self.domain = (float(domain[0]), float(domain[1]))
+        integrals = cumulative_integrals(function, variable, PLAN_INTEGRANDS[calculation_type], self.domain,
+                                         antiderivatives)
+        self.integrals = list(integrals.values())
+
+    @property
+    def method(self):
+        """``"exact"`` si todas las integrales usan su antiderivada, ``"numeric"`` si no."""
+        return "exact" if all(integral.method == "exact" for integral in self.integrals) else "numeric"
+
+    def evaluate(self, lower_bound, upper_bound):
+        """
+        Calcula el resultado para uno o muchos pares de límites.
+
+        Args:
+            lower_bound (float | numpy.ndarray): Límites inferiores
+            upper_bound (float | numpy.ndarray): Límites superiores
+
+        Returns:
+            float | numpy.ndarray | tuple: Resultado (ver ``combine``)
+        """
+        lower_bound = np.asarray(lower_bound, dtype=float)
+        upper_bound = np.asarray(upper_bound, dtype=float)
+        values = [integral.between(lower_bound, upper_bound) for integral in self.integrals]
+        return combine(self.calculation_type, values, lower_bound, upper_bound)
+
+
+def extend_domain(function, variable, lower_bound, upper_bound, margin, cells=EXTENSION_CELLS):
+    """
+    Extiende ``[lower_bound, upper_bound]`` hasta ``margin`` a cada lado sin cruzar singularidades.
+
+    La función se integra en ``cells`` celdas a cada lado; la extensión se
+    detiene antes de la primera celda donde la integración no converge.
+
+    Args:
+        function (str | sympy.Expr): Función
+        variable (sympy.Symbol): Variable de la función
+        lower_bound, upper_bound (float): Intervalo a extender, ``lower_bound <= upper_bound``
+        margin (float): Extensión máxima a cada lado
+        cells (int): Celdas examinadas a cada lado
+
+    Returns:
+        tuple: Dominio extendido ``(inicio, fin)``
+    """
+    f = get_evaluator(parse_cached(function), variable)
+    domain = []
+    for bound, direction in ((lower_bound, -1.0), (upper_bound, 1.0)):
+        nodes = bound + direction * np.linspace(0.0, margin, cells + 1)
+        values, errors = quadrature.integrate_intervals(f, nodes[:-1], nodes[1:])
+        singular = np.flatnonzero(~_converged(values, errors))
+        domain.append(nodes[singular[0]] if singular.size else nodes[-1])
+    return tuple(domain)
+
+
+def _antiderivatives(function, variable, calculation_types, deadline):
+    """
+    Calcula en paralelo las antiderivadas que necesitan los tipos de cálculo.
+
+    Cada una se calcula en un proceso de reserva que se termina si no
+    responde antes de ``deadline`` (ver ``IntegralPlan.antiderivative_within``);
+    las que no terminan a tiempo se omiten.
+
+    Returns:
+        dict: Antiderivadas en forma cerrada por nombre de integrando
+    """
+    plan = get_plan(function, variable)
+    names = {name for calculation_type in calculation_types for name in PLAN_INTEGRANDS[calculation_type]}
+    end = time.monotonic() + deadline
+
+    def integrate(name):
+        plan.antiderivative_within(plan.integrand(name), max(0.0, end - time.monotonic()))
+
+    # Los hilos solo esperan a los procesos, que terminan a más tardar en el plazo
+    threads = [threading.Thread(target=integrate, args=(name,)) for name in names]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    known = {}
+    for calculation_type in calculation_types:
+        known.update(plan.known_antiderivatives(calculation_type))
+    return known
+
+
+def integrate_bounds(function, variable, lower_bounds, upper_bounds,
+                     calculation_types=("Area", "Volume", "Average", "Centroid / Center of Mass"),
+                     chunk_size=CHUNK_SIZE, deadline=SYMBOLIC_DEADLINE):
+    """
+    Calcula varios tipos de cálculo para muchos pares de límites en una sola pasada.
+
+    La función se interpreta una vez, cada antiderivada se calcula una vez
+    (con ``deadline`` segundos como máximo) y cada integrando comparte su
+    integral acumulada entre todos los tipos que lo usan. Los pares se
+    procesan en bloques de ``chunk_size`` para acotar la memoria.
+
+    Ejemplo::
+
+        results = integrate_bounds("x*exp(-x)", "x", np.zeros(10000), np.linspace(0.1, 5, 10000))
+        results["Area"]                             # arreglo de 10000 áreas
+        x_bar, y_bar = results["Centroid / Center of Mass"]
+
+    Args:
+        function (str | sympy.Expr): Función
+        variable (str | sympy.Symbol): Variable de integración
+        lower_bounds (array_like): Límites inferiores (finitos)
+        upper_bounds (array_like): Límites superiores (finitos), de la misma forma
+        calculation_types (iterable): Claves de ``PLAN_INTEGRANDS`` a calcular
+        chunk_size (int): Pares evaluados por bloque
+        deadline (float): Segundos máximos de espera de las antiderivadas simbólicas
+
+    Returns:
+        dict: Resultado por tipo de cálculo, con la forma de los límites; para
+        Centroid, la tupla de arreglos ``(x̄, ȳ)``. Los pares cuya integral no
+        converge (por ejemplo, con un polo entre los límites) dan NaN
+
+    Raises:
+        ValueError: Si algún límite no es finito o los tipos no son válidos
+    """
+    variable = sp.Symbol(variable) if isinstance(variable, str) else variable
+    calculation_types = list(calculation_types)
+    unknown = [calculation_type for calculation_type in calculation_types if calculation_type not in PLAN_INTEGRANDS]
+    if unknown:
+        raise ValueError(f"Tipos de cálculo no admitidos: {', '.join(unknown)}")
+    lower_bounds, upper_bounds = np.broadcast_arrays(np.asarray(lower_bounds, dtype=float),
+                                                     np.asarray(upper_bounds, dtype=float))
+    if not (np.all(np.isfinite(lower_bounds)) and np.all(np.isfinite(upper_bounds))):
+        raise ValueError("Los límites deben ser finitos.")
+    shape = lower_bounds.shape
+    lower_bounds, upper_bounds = lower_bounds.ravel(), upper_bounds.ravel()
+    if lower_bounds.size == 0:
+        return {calculation_type: combine(calculation_type, [np.zeros(shape)] * len(PLAN_INTEGRANDS[calculation_type]),
+                                          np.zeros(shape), np.zeros(shape))
+                for calculation_type in calculation_types}
+
+    function = parse_cached(function)
+    domain = (min(lower_bounds.min(), upper_bounds.min()), max(lower_bounds.max(), upper_bounds.max()))
+    if domain[0] == domain[1]:
+        domain = (domain[0], domain[0] + 1.0)
+    names = list(dict.fromkeys(name for calculation_type in calculation_types
+                               for name in PLAN_INTEGRANDS[calculation_type]))
+    integrals = cumulative_integrals(function, variable, names, domain,
+                                     _antiderivatives(function, variable, calculation_types, deadline))
+
+    values = {name: np.empty(lower_bounds.size) for name in names}
+    for start in range(0, lower_bounds.size, chunk_size):
+        chunk = slice(start, start + chunk_size)
+        for name, integral in integrals.items():
+            values[name][chunk] = integral.between(lower_bounds[chunk], upper_bounds[chunk])
+
+    results = {}
+    for calculation_type in calculation_types:
+        result = combine(calculation_type, [values[name] for name in PLAN_INTEGRANDS[calculation_type]],
+                         lower_bounds, upper_bounds)
+        if isinstance(result, tuple):
+            results[calculation_type] = tuple(component.reshape(shape) for component in result)
+        else:
+            results[calculation_type] = result.reshape(shape)
+    return results
@@ -0,0 +1,15 @@
+"""
+Tipos de cálculo
+----------------
+Nombres de los tipos de cálculo soportados por la calculadora.
+
+Se mantienen en un módulo sin dependencias para que la interfaz gráfica pueda
+construir sus menús sin importar SymPy (ver ``calculator_core.py``).
+"""
+
+# Tipos de cálculo soportados, en el orden en que aparecen en la interfaz
+CALCULATION_TYPES = ["Integral", "Derivative", "Limit", "Area", "Volume", "Surface Area", "Average",
+                     "Centroid / Center of Mass", "Partial Derivative", "Gradient / Hessian", "Chain Rule"]
+
+# Tipos de cálculo que requieren límites inferior y superior
+BOUNDED_TYPES = ["Area", "Volume", "Average", "Surface Area", "Centroid / Center of Mass"]
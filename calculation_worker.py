@@ -0,0 +1,333 @@
+"""
+Proceso de cálculo
+------------------
+Ejecuta funciones en un proceso separado que puede terminarse en cualquier momento.
+
+Las operaciones de SymPy no pueden interrumpirse desde otro hilo, por lo que la
+única forma fiable de cancelar un cálculo largo es terminar el proceso que lo
+ejecuta. ``CalculationWorker`` mantiene un proceso persistente (para no pagar el
+costo de importar SymPy en cada cálculo) y lo vuelve a crear cuando se cancela.
+
+La interfaz no se bloquea: ``submit`` envía el trabajo y ``poll`` consulta el
+resultado sin esperar, de modo que puede llamarse periódicamente desde el ciclo
+de eventos de tkinter con ``window.after``.
+
+Un proceso no demonio (``daemon=False``) puede crear sus propios procesos,
+por ejemplo el grupo de ``termwise.py``; al cancelarlo también se terminan
+esos procesos hijos.
+
+``call_within`` ejecuta una función con un tiempo máximo en un proceso de
+reserva y lo termina si no responde a tiempo. Lo usan los intentos
+simbólicos con plazo (integrales definidas, ``simplify`` con presupuesto,
+antiderivadas de ``bounds.py``), que abandonados en un hilo seguirían
+ocupando el GIL y harían más lentos todos los cálculos siguientes.
+"""
+
+import atexit
+import importlib
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+# Segundos que se espera a que el proceso termine tras cancelarlo antes de forzarlo
+CANCEL_GRACE = 1.0
+
+# Procesos de reserva libres que call_within conserva para los trabajos siguientes
+MAX_IDLE_HELPERS = 2
+
+# Trabajos abandonados que call_within admite a la vez en hilos, donde no puede crear procesos
+MAX_ABANDONED_THREADS = 1
+
+
+def _terminate(signum, frame):
+    """Termina los procesos hijos (por ejemplo, un grupo de procesos) y luego el proceso de cálculo."""
+    for child in multiprocessing.active_children():
+        child.terminate()
+    os._exit(1)
+
+
+def _serve(connection, preload=()):
+    """
+    Ciclo principal del proceso de cálculo.
+
+    Recibe tuplas ``(job_id, function, args, kwargs)`` y responde con
+    ``(job_id, ok, payload)``, donde ``payload`` es el valor devuelto o el
+    mensaje de error. Termina al recibir None.
+
+    Args:
+        connection (multiprocessing.connection.Connection): Extremo del proceso
+        preload (tuple): Módulos a importar antes de esperar el primer trabajo
+    """
+    signal.signal(signal.SIGTERM, _terminate)
+    for name in preload:
+        importlib.import_module(name)
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            # El proceso principal terminó sin cerrar el proceso de cálculo
+            break
+        if message is None:
+            break
+        job_id, function, args, kwargs = message
+        try:
+            payload = function(*args, **kwargs)
+        except Exception as error:
+            connection.send((job_id, False, f"{type(error).__name__}: {error}"))
+        else:
+            connection.send((job_id, True, payload))
+
+
+class CalculationWorker:
+    """
+    Proceso persistente que ejecuta un trabajo a la vez y puede cancelarse.
+
+    Args:
+        start_method (str): Método de inicio de multiprocessing. Por defecto se
+            usa "spawn" para no duplicar el estado de tkinter en el proceso hijo.
+        preload (tuple): Módulos que el proceso importa al iniciar, mientras
+            espera el primer trabajo (y de nuevo tras cada cancelación)
+        daemon (bool): Si es False, el proceso puede crear procesos hijos; se
+            cierra al salir del intérprete si no se cerró antes
+    """
+
+    def __init__(self, start_method="spawn", preload=(), daemon=True):
+        self._context = multiprocessing.get_context(start_method)
+        self._preload = tuple(preload)
+        self._daemon = daemon
+        if not daemon:
+            # multiprocessing espera a los procesos no demonio al salir; se cierran antes
+            atexit.register(self.close)
+        self._process = None
+        self._connection = None
+        self._next_id = 0
+        self.current_job = None
+        self.started_at = None
+
+    def start(self):
+        """Inicia el proceso si no está en ejecución."""
+        if self._process is not None and self._process.is_alive():
+            return
+        parent_connection, child_connection = self._context.Pipe()
+        self._process = self._context.Process(target=_serve, args=(child_connection, self._preload),
+                                              daemon=self._daemon)
+        self._process.start()
+        child_connection.close()
+        self._connection = parent_connection
+
+    @property
+    def busy(self):
+        """Indica si hay un trabajo en ejecución."""
+        return self.current_job is not None
+
+    def elapsed(self):
+        """Devuelve los segundos transcurridos desde que se envió el trabajo actual."""
+        if self.started_at is None:
+            return 0.0
+        return time.monotonic() - self.started_at
+
+    def submit(self, function, /, *args, **kwargs):
+        """
+        Envía un trabajo al proceso. Si hay otro trabajo en curso, se cancela.
+
+        Args:
+            function (callable): Función de nivel de módulo (debe poder serializarse)
+            *args: Argumentos posicionales de la función
+            **kwargs: Argumentos con nombre de la función
+
+        Returns:
+            int: Identificador del trabajo
+        """
+        if self.busy:
+            self.cancel()
+        self.start()
+        self._next_id += 1
+        self.current_job = self._next_id
+        self.started_at = time.monotonic()
+        self._connection.send((self.current_job, function, args, kwargs))
+        return self.current_job
+
+    def poll(self):
+        """
+        Consulta el resultado del trabajo actual sin bloquear.
+
+        Returns:
+            tuple: ``(ok, payload)`` si el trabajo terminó, o None si sigue en curso
+        """
+        if not self.busy:
+            return None
+        try:
+            while self._connection.poll():
+                job_id, ok, payload = self._connection.recv()
+                if job_id == self.current_job:
+                    self.current_job = None
+                    self.started_at = None
+                    return ok, payload
+        except (EOFError, OSError):
+            pass
+        else:
+            if self._process.is_alive():
+                return None
+        # El proceso terminó de forma inesperada; se recreará en el próximo envío
+        self._discard()
+        return False, "El proceso de cálculo terminó de forma inesperada."
+
+    def wait(self, timeout=None):
+        """
+        Espera el resultado del trabajo actual.
+
+        Args:
+            timeout (float): Segundos máximos de espera, o None para esperar indefinidamente
+
+        Returns:
+            tuple: ``(ok, payload)``, o None si se agotó el tiempo (el trabajo sigue en curso)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.busy:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+            try:
+                self._connection.poll(remaining)
+            except (EOFError, OSError):
+                pass
+            outcome = self.poll()
+            if outcome is not None:
+                return outcome
+        return None
+
+    def cancel(self):
+        """Cancela el trabajo actual terminando el proceso."""
+        self.current_job = None
+        self.started_at = None
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join(CANCEL_GRACE)
+            if self._process.is_alive():
+                self._process.kill()
+                self._process.join()
+        self._discard()
+
+    def _discard(self):
+        """Libera el proceso y la conexión actuales."""
+        if self._connection is not None:
+            self._connection.close()
+        self._process = None
+        self._connection = None
+        self.current_job = None
+        self.started_at = None
+
+    def close(self):
+        """Detiene el proceso de forma ordenada (o lo termina si está ocupado)."""
+        if self._process is None:
+            return
+        if self.busy:
+            self.cancel()
+            return
+        try:
+            self._connection.send(None)
+        except OSError:
+            pass
+        self._process.join(timeout=1)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._discard()
+
+
+def can_use_processes():
+    """Indica si el proceso actual puede crear procesos hijos (los procesos demonio no pueden)."""
+    return not multiprocessing.current_process().daemon
+
+
+def _ready():
+    """Trabajo vacío; su respuesta indica que el proceso ya importó sus módulos."""
+    return True
+
+
+_helpers = []
+_helpers_lock = threading.Lock()
+_thread_pool = None
+_abandoned = []
+
+
+def _take_helper(module):
+    """Devuelve un proceso de reserva libre y con sus módulos ya importados, creándolo si no hay."""
+    with _helpers_lock:
+        worker = _helpers.pop() if _helpers else None
+    if worker is None:
+        worker = CalculationWorker(preload=(module,))
+        worker.submit(_ready)
+    if worker.busy:
+        # Importar SymPy lleva más que muchos plazos; ese tiempo no cuenta para el trabajo
+        worker.wait()
+    return worker
+
+
+def _release_helper(worker):
+    """Devuelve un proceso a la reserva, o lo cierra si ya hay suficientes libres."""
+    with _helpers_lock:
+        if len(_helpers) < MAX_IDLE_HELPERS:
+            _helpers.append(worker)
+            return
+    worker.close()
+
+
+def _call_in_thread(timeout, function, args, kwargs):
+    """
+    Alternativa de ``call_within`` en procesos demonio: un hilo que no puede terminarse.
+
+    Los hilos se reutilizan y, si ya hay ``MAX_ABANDONED_THREADS`` trabajos
+    abandonados en curso, no se empieza otro.
+    """
+    global _thread_pool
+    with _helpers_lock:
+        _abandoned[:] = [future for future in _abandoned if not future.done()]
+        if len(_abandoned) >= MAX_ABANDONED_THREADS:
+            return None
+        if _thread_pool is None:
+            _thread_pool = ThreadPoolExecutor(MAX_ABANDONED_THREADS + 1)
+        future = _thread_pool.submit(function, *args, **kwargs)
+    try:
+        return True, future.result(timeout)
+    except FutureTimeout:
+        with _helpers_lock:
+            _abandoned.append(future)
+        return None
+    except Exception as error:
+        return False, f"{type(error).__name__}: {error}"
+
+
+def call_within(timeout, function, /, *args, **kwargs):
+    """
+    Ejecuta una función en un proceso de reserva y lo termina si no responde a tiempo.
+
+    Los procesos se crean la primera vez (el tiempo de importar los módulos no
+    cuenta para ``timeout``) y se reutilizan; uno terminado se vuelve a crear
+    de inmediato, mientras el llamador continúa. Los procesos demonio no
+    pueden crear procesos hijos: en ellos la función se ejecuta en un hilo
+    (ver ``_call_in_thread``).
+
+    Args:
+        timeout (float): Segundos máximos de espera del resultado
+        function (callable): Función de nivel de módulo (debe poder serializarse)
+        *args: Argumentos posicionales de la función
+        **kwargs: Argumentos con nombre de la función
+
+    Returns:
+        tuple: ``(ok, payload)`` como ``CalculationWorker.wait``, o None si no
+        terminó a tiempo
+    """
+    if not can_use_processes():
+        return _call_in_thread(timeout, function, args, kwargs)
+    worker = _take_helper(function.__module__)
+    worker.submit(function, *args, **kwargs)
+    outcome = worker.wait(max(0.0, timeout))
+    if outcome is None:
+        worker.cancel()
+        worker.submit(_ready)
+    _release_helper(worker)
+    return outcome
@@ -0,0 +1,436 @@
+"""
+Núcleo de cálculo
+-----------------
+Implementación sin interfaz gráfica de todas las operaciones de la calculadora.
+
+Este módulo no depende de tkinter ni de matplotlib, por lo que puede usarse
+desde la interfaz gráfica, desde la línea de comandos (ver ``batch.py``) o
+desde procesos de trabajo en un servidor sin pantalla.
+
+Dependencias:
+    - sympy: Para cálculos simbólicos
+    - numpy: Para la integración numérica de respaldo (ver ``integral_plan.py``)
+"""
+
+import sympy as sp
+
+from calculation_types import BOUNDED_TYPES, CALCULATION_TYPES
+from evaluators import parse_cached
+from integral_plan import get_plan
+from profiling import collect, span
+from result_cache import ResultCache
+from simplification import DEFAULT_POLICY, simplify_expression
+from termwise import apply_termwise
+
+# Versión del formato de los resultados guardados en la caché
+CACHE_VERSION = 7
+
+# Tipos de cálculo cuyo resultado se simplifica (ver simplification.py)
+SIMPLIFIED_TYPES = ["Integral", "Derivative", "Partial Derivative", "Gradient / Hessian"]
+
+
+def parse_expression(text, field="Expression"):
+    """
+    Convierte el texto ingresado por el usuario en una expresión de SymPy.
+
+    Los textos ya interpretados se reutilizan (ver ``evaluators.parse_cached``).
+
+    Args:
+        text (str): Expresión en sintaxis de SymPy
+        field (str): Nombre del campo, para el mensaje de error
+
+    Returns:
+        sympy.Expr: Expresión simbólica
+
+    Raises:
+        ValueError: Si el texto está vacío o no puede interpretarse
+    """
+    if text is None or not str(text).strip():
+        raise ValueError(f"{field}: el campo está vacío.")
+    try:
+        return parse_cached(text)
+    except (sp.SympifyError, SyntaxError, TypeError) as error:
+        raise ValueError(f"{field}: no se pudo interpretar '{text}'.") from error
+
+
+def parse_symbol(name, field="Variable"):
+    """
+    Convierte el nombre de una variable en un símbolo de SymPy.
+
+    Args:
+        name (str): Nombre de la variable
+        field (str): Nombre del campo, para el mensaje de error
+
+    Returns:
+        sympy.Symbol: Símbolo
+
+    Raises:
+        ValueError: Si el nombre no es un identificador válido
+    """
+    name = (name or "").strip()
+    if not name.isidentifier():
+        raise ValueError(f"{field}: '{name}' no es un nombre de variable válido.")
+    return sp.Symbol(name)
+
+
+def configure_cache(maxsize=256, path=None):
+    """
+    Reemplaza la caché de resultados usada por ``compute``.
+
+    Args:
+        maxsize (int): Número máximo de entradas en memoria
+        path (str): Ruta de la base de datos SQLite persistente, o None
+
+    Returns:
+        ResultCache: La nueva caché
+    """
+    global result_cache
+    result_cache.close()
+    result_cache = ResultCache(maxsize, path)
+    return result_cache
+
+
+def _combined_method(methods):
+    """Devuelve el método de un resultado que combina varias integrales (ver ``integral_plan.definite_integral``)."""
+    if "divergent" in methods:
+        return "divergent"
+    if "numeric" in methods:
+        return "numeric"
+    return "exact"
+
+
+def _method_label(method, errors):
+    """Devuelve la etiqueta que indica si un resultado es exacto, numérico o divergente."""
+    if method == "divergent":
+        return "diverges"
+    if method == "exact":
+        return "exact"
+    return f"numeric, ±{max(error for error in errors if error is not None):.2g}"
+
+
+def _parse_inputs(calculation_type, function, variable, lower_bound, upper_bound,
+                  limit_point, variable_2, outer_function, inner_function, hessian=False):
+    """
+    Interpreta las entradas que usa el tipo de cálculo indicado.
+
+    Returns:
+        dict: Entradas convertidas a objetos de SymPy
+    """
+    if calculation_type == "Chain Rule":
+        # Validación de entradas
+        if not outer_function or not inner_function or not variable:
+            raise ValueError("Debe ingresar ambas funciones (externa e interna) y la variable.")
+        return {"variable": parse_symbol(variable),
+                "composition": parse_expression(outer_function.replace('u', f'({inner_function})'),
+                                                "Outer Function"),
+                "inner": parse_expression(inner_function, "Inner Function")}
+
+    if calculation_type == "Gradient / Hessian":
+        # Las variables son todos los símbolos libres de la función; el campo Variable no se usa
+        inputs = {"function": parse_expression(function, "Function"), "hessian": bool(hessian)}
+        gradient_variables(inputs["function"])
+        return inputs
+
+    inputs = {"variable": parse_symbol(variable), "function": parse_expression(function, "Function")}
+    if calculation_type == "Limit":
+        inputs["limit_point"] = parse_expression(limit_point, "Limit Point")
+    elif calculation_type == "Partial Derivative":
+        inputs["variable_2"] = parse_symbol(variable_2, "Variable 2")
+    elif calculation_type in BOUNDED_TYPES:
+        inputs["lower_bound"] = parse_expression(lower_bound, "Lower Bound")
+        inputs["upper_bound"] = parse_expression(upper_bound, "Upper Bound")
+    return inputs
+
+
+def validate_inputs(calculation_type, function="", variable="x", lower_bound=None, upper_bound=None,
+                    limit_point=None, variable_2=None, outer_function=None, inner_function=None, hessian=False,
+                    **options):
+    """
+    Interpreta las entradas de un cálculo sin ejecutarlo.
+
+    Acepta los mismos argumentos que ``compute`` (las opciones como
+    ``simplify`` se ignoran), de modo que la interfaz puede validar lo que el
+    usuario escribe antes de pulsar Calculate.
+
+    Returns:
+        dict: Entradas convertidas a objetos de SymPy
+
+    Raises:
+        ValueError: Si el tipo de cálculo no existe o alguna entrada no es válida,
+            con un mensaje que indica el campo
+    """
+    if calculation_type not in CALCULATION_TYPES:
+        raise ValueError(f"Tipo de cálculo desconocido: {calculation_type}")
+    return _parse_inputs(calculation_type, function, variable, lower_bound, upper_bound,
+                         limit_point, variable_2, outer_function, inner_function, hessian)
+
+
+def gradient_variables(function):
+    """
+    Devuelve las variables del gradiente: todos los símbolos libres, ordenados por nombre.
+
+    Args:
+        function (sympy.Expr): Función
+
+    Returns:
+        tuple: Símbolos
+
+    Raises:
+        ValueError: Si la función no tiene símbolos libres
+    """
+    variables = tuple(sorted(function.free_symbols, key=lambda symbol: symbol.name))
+    if not variables:
+        raise ValueError("Function: la función no depende de ninguna variable.")
+    return variables
+
+
+def _gradient_text(value):
+    """Texto a mostrar para el resultado de Gradient / Hessian."""
+    gradient, hessian = value
+    text = f"Gradient: {list(gradient)}"
+    if hessian is not None:
+        text += f"\nHessian: {hessian.tolist()}"
+    return text
+
+
+def _simplify_value(calculation_type, value, policy):
+    """Simplifica el resultado de un tipo de ``SIMPLIFIED_TYPES`` componente a componente."""
+    if calculation_type != "Gradient / Hessian":
+        return simplify_expression(value, policy)
+    # Las componentes repetidas (la Hessiana es simétrica) se simplifican una sola vez
+    return tuple(None if matrix is None else matrix.applyfunc(lambda entry: simplify_expression(entry, policy))
+                 for matrix in value)
+
+
+def _result_text(calculation_type, value, variable_2=None):
+    """Texto a mostrar para el resultado de un tipo de ``SIMPLIFIED_TYPES``."""
+    if calculation_type == "Gradient / Hessian":
+        return _gradient_text(value)
+    if calculation_type == "Partial Derivative":
+        return f"Partial Derivative with respect to {variable_2}: {value}"
+    return f"{calculation_type}: {value}"
+
+
+def _evaluate(calculation_type, inputs, simplify=DEFAULT_POLICY, termwise=False):
+    """
+    Ejecuta la operación simbólica sobre entradas ya interpretadas.
+
+    Args:
+        calculation_type (str): Uno de los valores de ``CALCULATION_TYPES``
+        inputs (dict): Entradas devueltas por ``_parse_inputs``
+        simplify (str): Política de simplificación (ver ``simplification.SIMPLIFY_POLICIES``)
+        termwise (bool): Si es True, Integral, Derivative y Partial Derivative
+            operan cada término de la suma por separado (ver ``termwise.py``)
+
+    Returns:
+        tuple: Valor del resultado, texto a mostrar y método: ``"exact"``, o
+        para los tipos con límites ``"numeric"`` si alguna integral se calculó
+        solo numéricamente y ``"divergent"`` si alguna no converge
+    """
+    # Gradient / Hessian no tiene una variable (usa todos los símbolos libres)
+    variable = inputs.get("variable")
+
+    if calculation_type == "Chain Rule":
+        with span("solve"):
+            # Derivada de la función interna
+            inner_derivative = sp.diff(inputs["inner"], variable)
+
+            # Derivada de la función externa
+            outer_derivative = sp.diff(inputs["composition"], variable)
+
+            # Aplicar la regla de la cadena
+            chain_rule_result = outer_derivative.subs(variable, inputs["inner"]) * inner_derivative
+        return chain_rule_result, f"Chain Rule Result: {chain_rule_result}", "exact"
+
+    function_sympy = inputs["function"]
+
+    if calculation_type == "Integral":
+        with span("solve"):
+            if termwise:
+                integral = apply_termwise("integrate", function_sympy, variable)
+            else:
+                integral = get_plan(function_sympy, variable).antiderivative(function_sympy)
+        simplified_result = simplify_expression(integral, simplify)
+        return simplified_result, _result_text(calculation_type, simplified_result), "exact"
+    if calculation_type == "Derivative":
+        with span("solve"):
+            if termwise:
+                derivative = apply_termwise("diff", function_sympy, variable)
+            else:
+                derivative = sp.diff(function_sympy, variable)
+        simplified_result = simplify_expression(derivative, simplify)
+        return simplified_result, _result_text(calculation_type, simplified_result), "exact"
+    if calculation_type == "Limit":
+        with span("solve"):
+            limit = sp.limit(function_sympy, variable, inputs["limit_point"])
+        return limit, f"Limit: {limit}", "exact"
+    if calculation_type == "Partial Derivative":
+        variable_2 = inputs["variable_2"]
+        with span("solve"):
+            if termwise:
+                partial_derivative = apply_termwise("diff", function_sympy, variable_2)
+            else:
+                partial_derivative = sp.diff(function_sympy, variable_2)
+        simplified_result = simplify_expression(partial_derivative, simplify)
+        return simplified_result, _result_text(calculation_type, simplified_result, variable_2), "exact"
+    if calculation_type == "Gradient / Hessian":
+        variables = gradient_variables(function_sympy)
+        with span("solve"):
+            if termwise:
+                gradient = [apply_termwise("diff", function_sympy, symbol) for symbol in variables]
+            else:
+                gradient = [sp.diff(function_sympy, symbol) for symbol in variables]
+            hessian = None
+            if inputs["hessian"]:
+                # La Hessiana es simétrica: se deriva solo el triángulo superior
+                entries = {}
+                for i, partial in enumerate(gradient):
+                    for j in range(i, len(variables)):
+                        entries[i, j] = entries[j, i] = sp.diff(partial, variables[j])
+                hessian = sp.ImmutableMatrix(len(variables), len(variables), lambda i, j: entries[i, j])
+        value = _simplify_value(calculation_type, (sp.ImmutableMatrix(gradient), hessian), simplify)
+        return value, _result_text(calculation_type, value), "exact"
+
+    lower_bound = inputs["lower_bound"]
+    upper_bound = inputs["upper_bound"]
+
+    # Cada integral distinta se calcula una vez y se comparte con los demás modos
+    with span("solve"):
+        integrals = get_plan(function_sympy, variable).integrals(calculation_type, lower_bound, upper_bound)
+    values = [value for value, _, _ in integrals]
+    method = _combined_method([method for _, method, _ in integrals])
+    label = _method_label(method, [error for _, _, error in integrals])
+
+    if calculation_type == "Area":
+        area = values[0]
+        return area, f"Area: {area} ({label})", method
+    if calculation_type == "Volume":
+        volume = sp.pi * values[0]
+        return volume, f"Volume: {volume} ({label})", method
+    if calculation_type == "Average":
+        average_value = (1 / (upper_bound - lower_bound)) * values[0]
+        return average_value, f"Average: {average_value} ({label})", method
+    if calculation_type == "Surface Area":
+        area_of_revolution = 2 * sp.pi * values[0]
+        return area_of_revolution, f"Area of Revolution: {area_of_revolution} ({label})", method
+
+    # Coordenadas del centroide (densidad por defecto = 1)
+    mass, moment_x, moment_y = values
+    x_centroid = moment_x / mass
+    y_centroid = moment_y / (2 * mass)
+    return (x_centroid, y_centroid), f"Centroid: (x̄ = {x_centroid}, ȳ = {y_centroid}) ({label})", method
+
+
+def _cache_key(calculation_type, inputs, simplify, termwise):
+    """Clave de ``result_cache``: el tipo de cálculo, las opciones y las entradas canonizadas."""
+    return (CACHE_VERSION, calculation_type, f"simplify={simplify}", f"termwise={termwise}") + tuple(
+        f"{name}={sp.srepr(value)}" for name, value in sorted(inputs.items()))
+
+
+def compute(calculation_type, function="", variable="x", lower_bound=None, upper_bound=None,
+            limit_point=None, variable_2=None, outer_function=None, inner_function=None, use_cache=True,
+            simplify=DEFAULT_POLICY, termwise=False, hessian=False):
+    """
+    Realiza un cálculo sin depender de la interfaz gráfica.
+
+    Los resultados se guardan en ``result_cache`` con una clave formada por el
+    tipo de cálculo y las entradas canonizadas, de modo que ``x + 1`` y
+    ``1 + x`` comparten la misma entrada. Los resultados numéricos por falta de
+    tiempo (``method == "numeric"``) no se guardan.
+
+    Args:
+        calculation_type (str): Uno de los valores de ``CALCULATION_TYPES``
+        function (str): Función matemática
+        variable (str): Nombre de la variable de la función
+        lower_bound (str): Límite inferior (Area, Volume, Average, Surface Area, Centroid)
+        upper_bound (str): Límite superior (Area, Volume, Average, Surface Area, Centroid)
+        limit_point (str): Punto donde se evalúa el límite (Limit)
+        variable_2 (str): Variable de derivación (Partial Derivative)
+        outer_function (str): Función externa en términos de ``u`` (Chain Rule)
+        inner_function (str): Función interna (Chain Rule)
+        use_cache (bool): Si es False, se ignora la caché de resultados
+        simplify (str): Política de simplificación de las integrales y
+            derivadas: "none", "cheap", "full" o "budget" (ver ``simplification.py``)
+        termwise (bool): Si es True, las integrales y derivadas de sumas se
+            calculan término a término, en paralelo si el proceso puede crear
+            procesos hijos (ver ``termwise.py``)
+        hessian (bool): Si es True, Gradient / Hessian también calcula la Hessiana
+
+    Returns:
+        dict: Resultado con las claves ``calculation_type``, ``value`` (expresión
+        de SymPy o tupla de expresiones), ``text`` (texto a mostrar), ``method``
+        (``"exact"``, ``"numeric"`` o ``"divergent"``, ver ``_evaluate``), ``timings``
+        (segundos por etapa, ver ``profiling.py``) y los parámetros
+        interpretados necesarios para graficar el resultado. Los tipos con
+        límites incluyen ``antiderivatives``: las antiderivadas en forma
+        cerrada disponibles por integrando (ver ``bounds.BoundExplorer``).
+        Gradient / Hessian devuelve en ``value`` la tupla ``(gradiente,
+        Hessiana)`` de matrices (la Hessiana es None si no se pidió) e incluye
+        ``variables``, los símbolos en el orden de sus componentes.
+
+    Raises:
+        ValueError: Si el tipo de cálculo no existe, faltan entradas o alguna
+            expresión no puede interpretarse.
+    """
+    if calculation_type not in CALCULATION_TYPES:
+        raise ValueError(f"Tipo de cálculo desconocido: {calculation_type}")
+
+    with collect() as timings:
+        with span("parse"):
+            inputs = _parse_inputs(calculation_type, function, variable, lower_bound, upper_bound,
+                                   limit_point, variable_2, outer_function, inner_function, hessian)
+
+        with span("cache"):
+            key = _cache_key(calculation_type, inputs, simplify, termwise)
+            cached = result_cache.get(key) if use_cache else None
+        if cached is None:
+            cached = _evaluate(calculation_type, inputs, simplify, termwise)
+            antiderivatives = None
+            if calculation_type in BOUNDED_TYPES:
+                plan = get_plan(inputs["function"], inputs["variable"])
+                antiderivatives = plan.known_antiderivatives(calculation_type)
+            cached += (antiderivatives,)
+            # Un resultado numérico por falta de tiempo no se guarda: la próxima vez se intenta la forma cerrada
+            if use_cache and cached[2] != "numeric":
+                with span("cache"):
+                    result_cache.put(key, cached)
+    value, text, method, antiderivatives = cached
+
+    calculation = {"calculation_type": calculation_type, "function": function, "value": value, "text": text,
+                   "method": method, "timings": timings}
+    calculation.update((name, value) for name, value in inputs.items()
+                       if name in ("variable", "limit_point", "variable_2", "lower_bound", "upper_bound"))
+    if calculation_type == "Chain Rule":
+        calculation.update(outer_function=outer_function, inner_function=inner_function)
+    if calculation_type == "Gradient / Hessian":
+        calculation["variables"] = gradient_variables(inputs["function"])
+    if antiderivatives is not None:
+        calculation["antiderivatives"] = antiderivatives
+    return calculation
+
+
+def simplify_calculation(calculation, policy=DEFAULT_POLICY):
+    """
+    Simplifica el resultado de un cálculo ya realizado.
+
+    Permite mostrar primero el resultado sin simplificar (``simplify="none"``)
+    y reemplazarlo cuando esta función termine, por ejemplo en otro proceso.
+
+    Args:
+        calculation (dict): Resultado de ``compute``
+        policy (str): Política de simplificación
+
+    Returns:
+        dict: Copia del cálculo con ``value``, ``text`` y ``timings``
+        actualizados; los tipos que no se simplifican se devuelven sin cambios
+    """
+    if calculation["calculation_type"] not in SIMPLIFIED_TYPES:
+        return calculation
+    with collect() as timings:
+        value = _simplify_value(calculation["calculation_type"], calculation["value"], policy)
+    return {**calculation, "value": value, "timings": timings,
+            "text": _result_text(calculation["calculation_type"], value, calculation.get("variable_2"))}
+
+
+# Caché compartida por todas las llamadas a compute (ver configure_cache)
+result_cache = ResultCache()
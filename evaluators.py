@@ -0,0 +1,151 @@
+"""
+Evaluadores compilados
+----------------------
+Caché compartida de funciones numéricas generadas con ``sp.lambdify``.
+
+Todas las funciones de graficación y la integración numérica obtienen sus
+evaluadores de aquí, de modo que volver a graficar la misma expresión no
+vuelve a interpretar el texto ni a generar código. Los evaluadores se
+compilan con eliminación de subexpresiones comunes (``cse=True``).
+
+Motores disponibles:
+    - "numpy": Evaluación vectorizada sobre arreglos (por defecto)
+    - "math": Evaluación escalar con el módulo ``math``
+    - "numba": Compilación JIT vectorizada, solo si numba está instalado
+"""
+
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+import sympy as sp
+
+from profiling import span
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Número de evaluadores conservados en la caché
+EVALUATOR_CACHE_SIZE = 128
+
+
+def available_backends():
+    """
+    Devuelve los motores de evaluación que pueden usarse en este entorno.
+
+    Returns:
+        list: Nombres de los motores
+    """
+    backends = ["numpy", "math"]
+    if numba is not None:
+        backends.append("numba")
+    return backends
+
+
+@lru_cache(maxsize=256)
+def _parse_text(text):
+    return sp.sympify(text)
+
+
+def parse_cached(expression):
+    """
+    Interpreta una expresión, reutilizando el resultado si el texto ya se interpretó.
+
+    Args:
+        expression (str | sympy.Expr): Texto o expresión ya interpretada
+
+    Returns:
+        sympy.Expr: Expresión simbólica
+    """
+    if isinstance(expression, str):
+        return _parse_text(expression)
+    return sp.sympify(expression)
+
+
+def _normalize_args(args):
+    """Convierte la variable o tupla de variables en una tupla de símbolos."""
+    if not isinstance(args, (tuple, list)):
+        args = (args,)
+    return tuple(sp.Symbol(arg) if isinstance(arg, str) else arg for arg in args)
+
+
+def _broadcasting(compiled):
+    """
+    Envuelve un evaluador de NumPy para que siempre devuelva un arreglo con la
+    forma de sus argumentos (las expresiones constantes devuelven un escalar).
+
+    Las tuplas de expresiones (``sp.Tuple``) se evalúan en una sola llamada,
+    compartiendo sus subexpresiones comunes, y devuelven un arreglo con un
+    eje inicial por componente.
+    """
+    def evaluate(*values):
+        result = compiled(*values)
+        shape = np.broadcast_shapes(*(np.shape(value) for value in values))
+        if isinstance(result, (tuple, list)):
+            return np.stack([np.broadcast_to(np.asarray(component), shape) for component in result])
+        result = np.asarray(result)
+        if result.shape != shape:
+            result = np.broadcast_to(result, shape).copy()
+        return result
+    return evaluate
+
+
+def _compile(expression, args, backend):
+    """Genera el evaluador de ``expression`` con el motor indicado."""
+    if backend == "numpy":
+        return _broadcasting(sp.lambdify(args, expression, modules=['numpy'], cse=True))
+    if backend == "math":
+        return sp.lambdify(args, expression, modules=['math'], cse=True)
+    if backend == "numba":
+        if numba is None:
+            raise ValueError("El motor 'numba' requiere instalar numba.")
+        return numba.vectorize(sp.lambdify(args, expression, modules=['math'], cse=True))
+    raise ValueError(f"Motor de evaluación desconocido: {backend}")
+
+
+_evaluators = OrderedDict()
+_lock = threading.Lock()
+stats = {"hits": 0, "misses": 0}
+
+
+def get_evaluator(expression, args, backend="numpy"):
+    """
+    Devuelve una función numérica de ``expression``, compilándola solo la primera vez.
+
+    Args:
+        expression (str | sympy.Expr): Expresión a evaluar
+        args (sympy.Symbol | str | tuple): Variable o tupla de variables de la función
+        backend (str): Motor de evaluación (ver ``available_backends``)
+
+    Returns:
+        callable: Función que recibe un valor por variable
+    """
+    expression = parse_cached(expression)
+    args = _normalize_args(args)
+    key = (expression, args, backend)
+    with _lock:
+        evaluator = _evaluators.get(key)
+        if evaluator is not None:
+            _evaluators.move_to_end(key)
+            stats["hits"] += 1
+            return evaluator
+        stats["misses"] += 1
+
+    with span("lambdify"):
+        evaluator = _compile(expression, args, backend)
+    with _lock:
+        _evaluators[key] = evaluator
+        while len(_evaluators) > EVALUATOR_CACHE_SIZE:
+            _evaluators.popitem(last=False)
+    return evaluator
+
+
+def clear():
+    """Vacía la caché de evaluadores y de expresiones interpretadas."""
+    with _lock:
+        _evaluators.clear()
+        stats["hits"] = stats["misses"] = 0
+    _parse_text.cache_clear()
@@ -0,0 +1,248 @@
+"""
+Exportación de tablas de valores
+--------------------------------
+Evalúa una función (y opcionalmente su integral o derivada) sobre una malla
+uniforme de hasta miles de millones de puntos y escribe la tabla en disco.
+
+La malla se recorre en bloques de tamaño fijo, de modo que la memoria usada
+no depende del número de puntos. Formatos de salida:
+
+    - ``.npy``: arreglo ``(puntos, columnas)`` de float64 escrito con
+      ``np.lib.format.open_memmap``; se puede abrir con
+      ``np.load(ruta, mmap_mode="r")`` sin cargarlo en memoria
+    - ``.csv``: texto con encabezado, una fila por punto
+
+Con ``workers`` mayor que 1 los bloques se evalúan en un grupo de procesos.
+En ``.npy`` cada proceso escribe su bloque directamente en el archivo; en
+``.csv`` los bloques se escriben en orden a medida que terminan. Nunca hay más
+de ``PENDING_PER_WORKER`` bloques en curso por proceso, así que un escritor
+lento frena la evaluación en lugar de acumular bloques en memoria.
+
+Uso:
+    python export.py "x*exp(-x)" --type Integral --start 0 --stop 10 --points 1000000000 -o tabla.npy --workers 8
+"""
+
+import argparse
+import collections
+import io
+import multiprocessing
+import sys
+
+import numpy as np
+import sympy as sp
+
+from calculator_core import compute
+from evaluators import get_evaluator, parse_cached
+
+# Tipos de cálculo cuyo resultado es una función de la misma variable
+EXPORT_TYPES = ["Integral", "Derivative"]
+
+# Puntos evaluados por bloque
+CHUNK_SIZE = 1_000_000
+
+# Formatos de salida admitidos
+EXPORT_FORMATS = ["npy", "csv"]
+
+# Bloques enviados al grupo de procesos sin recoger, por proceso
+PENDING_PER_WORKER = 2
+
+
+def grid(start, stop, points, first, last):
+    """
+    Devuelve los puntos ``first`` a ``last - 1`` de la malla uniforme de ``[start, stop]``.
+
+    Equivale a ``np.linspace(start, stop, points)[first:last]`` sin crear la malla completa.
+    """
+    if points == 1:
+        return np.full(last - first, float(start))
+    return start + (stop - start) * (np.arange(first, last, dtype=float) / (points - 1))
+
+
+def _column(evaluator, x):
+    """Evalúa una columna; los valores complejos o no finitos se guardan como NaN."""
+    with np.errstate(all="ignore"):
+        y = np.asarray(evaluator(x))
+        if np.iscomplexobj(y):
+            y = np.where(np.abs(y.imag) > 0, np.nan, y.real)
+        y = np.broadcast_to(y, x.shape).astype(float)
+    y[~np.isfinite(y)] = np.nan
+    return y
+
+
+def evaluate_chunk(expressions, variable, start, stop, points, first, last):
+    """
+    Evalúa un bloque de la tabla.
+
+    Args:
+        expressions (list): Expresiones de las columnas después de ``x``
+        variable (sympy.Symbol): Variable de las expresiones
+        start, stop (float): Extremos de la malla
+        points (int): Número total de puntos de la malla
+        first, last (int): Índices del bloque, ``last`` excluido
+
+    Returns:
+        numpy.ndarray: Bloque ``(last - first, 1 + len(expressions))``
+    """
+    x = grid(start, stop, points, first, last)
+    block = np.empty((x.size, 1 + len(expressions)))
+    block[:, 0] = x
+    for column, expression in enumerate(expressions, start=1):
+        block[:, column] = _column(get_evaluator(expression, variable), x)
+    return block
+
+
+def table_columns(function, variable="x", calculation_type=None):
+    """
+    Obtiene las columnas de la tabla: la función y, si se indica, su resultado.
+
+    Args:
+        function (str): Función matemática
+        variable (str): Nombre de la variable
+        calculation_type (str): Uno de ``EXPORT_TYPES``, o None para exportar solo la función
+
+    Returns:
+        tuple: ``(nombres, expresiones, variable)``; los nombres incluyen la columna de la variable
+
+    Raises:
+        ValueError: Si el tipo de cálculo no puede exportarse
+    """
+    symbol = sp.Symbol(variable)
+    names = [variable, "f"]
+    expressions = [parse_cached(function)]
+    if calculation_type is not None:
+        if calculation_type not in EXPORT_TYPES:
+            raise ValueError(f"Solo se pueden exportar los tipos: {', '.join(EXPORT_TYPES)}")
+        expressions.append(compute(calculation_type, function, variable)["value"])
+        names.append(calculation_type.lower())
+    return names, expressions, symbol
+
+
+def _write_npy_chunk(path, expressions, variable, start, stop, points, first, last):
+    """Evalúa un bloque en un proceso del grupo y lo escribe en el archivo ``.npy``."""
+    table = np.load(path, mmap_mode="r+")
+    table[first:last] = evaluate_chunk(expressions, variable, start, stop, points, first, last)
+    table.flush()
+    del table
+    return last - first
+
+
+def _csv_chunk(expressions, variable, start, stop, points, first, last):
+    """Evalúa un bloque en un proceso del grupo y lo devuelve como texto CSV."""
+    text = io.StringIO()
+    _write_csv_block(text, evaluate_chunk(expressions, variable, start, stop, points, first, last))
+    return text.getvalue()
+
+
+def _write_csv_block(output, block):
+    np.savetxt(output, block, delimiter=",", fmt="%.17g")
+
+
+def _ordered_results(pool, tasks, window):
+    """
+    Ejecuta las tareas ``(función, argumentos)`` en el grupo y devuelve sus resultados en orden.
+
+    A diferencia de ``Pool.imap``, no envía una tarea nueva mientras haya ``window``
+    sin recoger, de modo que los bloques terminados no se acumulan si quien los
+    consume es más lento que los procesos.
+    """
+    pending = collections.deque()
+    for function, args in tasks:
+        if len(pending) >= window:
+            yield pending.popleft().get()
+        pending.append(pool.apply_async(function, args))
+    while pending:
+        yield pending.popleft().get()
+
+
+def export_table(function, path, start, stop, points, variable="x", calculation_type=None,
+                 file_format=None, chunk_size=CHUNK_SIZE, workers=1):
+    """
+    Escribe la tabla de valores de la función (y su resultado) en ``path``.
+
+    Args:
+        function (str): Función matemática
+        path (str): Archivo de salida
+        start, stop (float): Extremos de la malla uniforme
+        points (int): Número de puntos, extremos incluidos
+        variable (str): Nombre de la variable
+        calculation_type (str): Uno de ``EXPORT_TYPES``, o None para exportar solo la función
+        file_format (str): "npy" o "csv"; por defecto se deduce de la extensión de ``path``
+        chunk_size (int): Puntos evaluados por bloque
+        workers (int): Procesos que evalúan bloques en paralelo (1 para no usar procesos)
+
+    Returns:
+        list: Nombres de las columnas escritas
+
+    Raises:
+        ValueError: Si los parámetros no son válidos
+    """
+    if file_format is None:
+        file_format = "csv" if path.lower().endswith(".csv") else "npy"
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Formato desconocido: {file_format}")
+    if points < 1 or chunk_size < 1:
+        raise ValueError("El número de puntos y el tamaño de bloque deben ser positivos.")
+    start, stop = float(start), float(stop)
+    if not (np.isfinite(start) and np.isfinite(stop)):
+        raise ValueError("Los extremos de la malla deben ser finitos.")
+
+    names, expressions, symbol = table_columns(function, variable, calculation_type)
+    chunks = ((first, min(first + chunk_size, points)) for first in range(0, points, chunk_size))
+
+    if file_format == "npy":
+        table = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=(points, len(names)))
+        if workers == 1:
+            for first, last in chunks:
+                table[first:last] = evaluate_chunk(expressions, symbol, start, stop, points, first, last)
+            table.flush()
+            del table
+            return names
+        # Los procesos abren el archivo por su cuenta; aquí solo se reserva el espacio
+        table.flush()
+        del table
+        tasks = ((_write_npy_chunk, (path, expressions, symbol, start, stop, points, first, last))
+                 for first, last in chunks)
+        with multiprocessing.Pool(workers) as pool:
+            for _ in _ordered_results(pool, tasks, PENDING_PER_WORKER * workers):
+                pass
+        return names
+
+    with open(path, "w", encoding="utf-8", newline="") as output:
+        output.write(",".join(names) + "\n")
+        if workers == 1:
+            for first, last in chunks:
+                _write_csv_block(output, evaluate_chunk(expressions, symbol, start, stop, points, first, last))
+            return names
+        tasks = ((_csv_chunk, (expressions, symbol, start, stop, points, first, last)) for first, last in chunks)
+        with multiprocessing.Pool(workers) as pool:
+            for text in _ordered_results(pool, tasks, PENDING_PER_WORKER * workers):
+                output.write(text)
+    return names
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta una tabla de valores de una función.")
+    parser.add_argument("function", help="Función matemática, por ejemplo 'sin(x)/x'")
+    parser.add_argument("-o", "--output", required=True, help="Archivo de salida (.npy o .csv)")
+    parser.add_argument("--variable", default="x", help="Variable de la función")
+    parser.add_argument("--type", choices=EXPORT_TYPES, default=None, dest="calculation_type",
+                        help="Agrega una columna con la integral o la derivada")
+    parser.add_argument("--start", type=float, required=True, help="Inicio de la malla")
+    parser.add_argument("--stop", type=float, required=True, help="Fin de la malla")
+    parser.add_argument("--points", type=int, required=True, help="Número de puntos, extremos incluidos")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default=None, dest="file_format",
+                        help="Formato de salida (por defecto, según la extensión)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Puntos evaluados por bloque")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Procesos que evalúan bloques en paralelo")
+    args = parser.parse_args(argv)
+
+    try:
+        names = export_table(args.function, args.output, args.start, args.stop, args.points, args.variable,
+                             args.calculation_type, args.file_format, args.chunk_size, args.workers)
+    except ValueError as error:
+        parser.error(str(error))
+    print(f"{args.points} filas ({', '.join(names)}) escritas en {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
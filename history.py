@@ -0,0 +1,348 @@
+"""
+Historial de cálculos
+---------------------
+Historial persistente e indexado de los cálculos realizados en la interfaz.
+
+Cada entrada se identifica por un hash de las entradas canonizadas (el tipo
+de cálculo, las opciones ``simplify`` y ``termwise`` y las expresiones en
+forma ``srepr``), de modo que ``x + 1`` y ``1 + x`` son la misma entrada. Se
+guardan la petición original, el resultado completo (el diccionario devuelto
+por ``compute``), si es exacto, los tiempos por etapa, una miniatura PNG del
+gráfico y cuántas veces se usó.
+
+Un resultado numérico por falta de tiempo no se recupera al pulsar Calculate
+(ver ``recall`` con ``exact_only``): se vuelve a intentar la forma cerrada.
+
+Además de la clave, se indexan el hash de la expresión, el tipo de cálculo
+y los límites, para buscar todos los cálculos de una misma función. Las
+entradas más usadas sirven para preparar su recuperación al iniciar (ver
+``most_frequent``).
+
+Dependencias:
+    - sqlite3: Para el almacenamiento (biblioteca estándar)
+    - sympy: Para canonizar las entradas
+"""
+
+import hashlib
+import io
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+import sympy as sp
+
+from calculation_types import BOUNDED_TYPES
+from calculator_core import validate_inputs
+from evaluators import parse_cached
+from simplification import DEFAULT_POLICY
+
+# Ancho en píxeles de las miniaturas de los gráficos
+THUMBNAIL_WIDTH = 240
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS calculations (
+    key TEXT PRIMARY KEY,
+    expression_hash TEXT NOT NULL,
+    calculation_type TEXT NOT NULL,
+    bounds TEXT,
+    function TEXT NOT NULL,
+    text TEXT NOT NULL,
+    request TEXT NOT NULL,
+    calculation BLOB NOT NULL,
+    simplified INTEGER NOT NULL DEFAULT 0,
+    exact INTEGER NOT NULL DEFAULT 1,
+    timings TEXT,
+    thumbnail BLOB,
+    uses INTEGER NOT NULL DEFAULT 1,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS calculations_expression ON calculations (expression_hash, calculation_type, bounds);
+CREATE INDEX IF NOT EXISTS calculations_uses ON calculations (uses DESC, last_used DESC);
+CREATE INDEX IF NOT EXISTS calculations_last_used ON calculations (last_used DESC);
+"""
+
+# Columnas devueltas por search (sin los datos binarios)
+_SUMMARY_COLUMNS = ["key", "calculation_type", "function", "bounds", "text", "uses", "last_used"]
+
+
+def _digest(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _index_fields(request):
+    """
+    Canoniza las entradas de una petición.
+
+    Returns:
+        tuple: ``(clave, hash de la expresión, límites)``; los límites son None
+        para los tipos sin límites
+
+    Raises:
+        ValueError: Si alguna entrada no es válida
+    """
+    calculation_type = request["calculation_type"]
+    inputs = validate_inputs(**request)
+    options = [f"simplify={request.get('simplify', DEFAULT_POLICY)}", f"termwise={bool(request.get('termwise'))}"]
+    key = _digest("\n".join([calculation_type] + options + [f"{name}={sp.srepr(value)}"
+                                                             for name, value in sorted(inputs.items())]))
+    expression = inputs.get("function", inputs.get("composition"))
+    bounds = None
+    if calculation_type in BOUNDED_TYPES:
+        bounds = f"{inputs['lower_bound']}, {inputs['upper_bound']}"
+    elif calculation_type == "Limit":
+        bounds = str(inputs["limit_point"])
+    return key, _digest(sp.srepr(expression)), bounds
+
+
+def _function_text(request):
+    """Texto de la función que se muestra y se busca en el historial."""
+    if request["calculation_type"] == "Chain Rule":
+        return f"{request.get('outer_function')}, u = {request.get('inner_function')}"
+    return request.get("function") or ""
+
+
+def history_key(request):
+    """
+    Devuelve la clave del historial de una petición.
+
+    Incluye las opciones ``simplify`` y ``termwise``, que cambian la forma del
+    resultado (como en la clave de ``calculator_core.compute``).
+
+    Args:
+        request (dict): Argumentos de ``calculator_core.compute``
+
+    Returns:
+        str: Hash de las entradas canonizadas
+
+    Raises:
+        ValueError: Si alguna entrada no es válida
+    """
+    return _index_fields(request)[0]
+
+
+def render_thumbnail(figure, width=THUMBNAIL_WIDTH):
+    """
+    Dibuja una miniatura PNG de la figura.
+
+    Args:
+        figure (matplotlib.figure.Figure): Figura a reducir
+        width (int): Ancho en píxeles
+
+    Returns:
+        bytes: Imagen PNG
+    """
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format="png", dpi=width / figure.get_figwidth())
+    return buffer.getvalue()
+
+
+class CalculationHistory:
+    """
+    Historial de cálculos en una base de datos SQLite.
+
+    Args:
+        path (str): Ruta de la base de datos; los directorios se crean si no existen
+    """
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(calculations)")}
+        if "exact" not in columns:
+            # Historial creado antes de guardar el método; no se sabe si sus resultados son exactos
+            self._connection.execute("ALTER TABLE calculations ADD COLUMN exact INTEGER NOT NULL DEFAULT 0")
+        self._connection.commit()
+
+    def record(self, request, calculation, timings=None, simplified=False):
+        """
+        Guarda un cálculo; si ya estaba en el historial, reemplaza su resultado y cuenta un uso más.
+
+        Args:
+            request (dict): Argumentos con los que se llamó a ``compute``
+            calculation (dict): Resultado de ``compute``
+            timings (dict): Segundos por etapa
+            simplified (bool): Si el resultado ya está simplificado
+
+        Returns:
+            str: Clave de la entrada
+
+        Raises:
+            ValueError: Si alguna entrada de la petición no es válida
+        """
+        key, expression_hash, bounds = _index_fields(request)
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO calculations (key, expression_hash, calculation_type, bounds, function, text, request, "
+                "calculation, simplified, exact, timings, created, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET text = excluded.text, request = excluded.request, "
+                "calculation = excluded.calculation, simplified = excluded.simplified, exact = excluded.exact, "
+                "timings = excluded.timings, uses = uses + 1, last_used = excluded.last_used",
+                (key, expression_hash, request["calculation_type"], bounds,
+                 _function_text(request), calculation["text"],
+                 json.dumps(request), pickle.dumps(calculation), int(simplified),
+                 int(calculation.get("method") != "numeric"),
+                 json.dumps(timings) if timings is not None else None, now, now))
+            self._connection.commit()
+        return key
+
+    def store_simplified(self, key, calculation):
+        """
+        Reemplaza el resultado de una entrada por su forma simplificada, sin contar un uso.
+
+        Args:
+            key (str): Clave de la entrada
+            calculation (dict): Resultado simplificado
+        """
+        with self._lock:
+            self._connection.execute("UPDATE calculations SET text = ?, calculation = ?, simplified = 1 WHERE key = ?",
+                                     (calculation["text"], pickle.dumps(calculation), key))
+            self._connection.commit()
+
+    def set_thumbnail(self, key, thumbnail):
+        """
+        Guarda la miniatura del gráfico de una entrada.
+
+        Args:
+            key (str): Clave de la entrada
+            thumbnail (bytes): Imagen PNG (ver ``render_thumbnail``)
+        """
+        with self._lock:
+            self._connection.execute("UPDATE calculations SET thumbnail = ? WHERE key = ?", (thumbnail, key))
+            self._connection.commit()
+
+    def recall(self, key, exact_only=False):
+        """
+        Recupera una entrada y cuenta un uso más.
+
+        Args:
+            key (str): Clave de la entrada
+            exact_only (bool): Si es True, se omiten las entradas cuyo resultado
+                es numérico por falta de tiempo
+
+        Returns:
+            dict: ``key``, ``request``, ``calculation``, ``simplified`` y
+            ``timings``, o None si la entrada no existe (o no es exacta, con
+            ``exact_only``) o su resultado ya no puede leerse (por ejemplo,
+            tras actualizar SymPy)
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT request, calculation, simplified, timings FROM calculations "
+                f"WHERE key = ?{' AND exact' if exact_only else ''}", (key,)).fetchone()
+            if row is None:
+                return None
+            self._connection.execute("UPDATE calculations SET uses = uses + 1, last_used = ? WHERE key = ?",
+                                     (time.time(), key))
+            self._connection.commit()
+        request, calculation, simplified, timings = row
+        try:
+            calculation = pickle.loads(calculation)
+        except Exception:
+            return None
+        return {"key": key, "request": json.loads(request), "calculation": calculation,
+                "simplified": bool(simplified), "timings": json.loads(timings) if timings else {}}
+
+    def contains(self, key, exact_only=False):
+        """Indica si la clave está en el historial (con ``exact_only``, solo si su resultado es exacto)."""
+        with self._lock:
+            return self._connection.execute(
+                f"SELECT 1 FROM calculations WHERE key = ?{' AND exact' if exact_only else ''}",
+                (key,)).fetchone() is not None
+
+    def thumbnail(self, key):
+        """
+        Devuelve la miniatura de una entrada.
+
+        Returns:
+            bytes: Imagen PNG, o None si la entrada no existe o no tiene miniatura
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT thumbnail FROM calculations WHERE key = ?", (key,)).fetchone()
+        return None if row is None else row[0]
+
+    def search(self, query="", limit=100):
+        """
+        Busca entradas por texto, de la más reciente a la más antigua.
+
+        El texto se busca en la función, el resultado y el tipo de cálculo. Si
+        además es una expresión válida, también se encuentran los cálculos de
+        expresiones equivalentes escritas de otra forma (``1 + x`` encuentra ``x + 1``).
+
+        Args:
+            query (str): Texto a buscar; vacío para listar todas las entradas
+            limit (int): Número máximo de entradas
+
+        Returns:
+            list: Diccionarios con ``key``, ``calculation_type``, ``function``,
+            ``bounds``, ``text``, ``uses`` y ``last_used``
+        """
+        query = query.strip()
+        conditions, parameters = [], []
+        if query:
+            pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            conditions = [f"{column} LIKE ? ESCAPE '\\'" for column in ("function", "text", "calculation_type")]
+            parameters = [pattern] * len(conditions)
+            try:
+                expression_hash = _digest(sp.srepr(parse_cached(query)))
+            except Exception:
+                pass
+            else:
+                conditions.append("expression_hash = ?")
+                parameters.append(expression_hash)
+        where = f"WHERE {' OR '.join(conditions)} " if conditions else ""
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT {', '.join(_SUMMARY_COLUMNS)} FROM calculations {where}ORDER BY last_used DESC LIMIT ?",
+                parameters + [limit]).fetchall()
+        return [dict(zip(_SUMMARY_COLUMNS, row)) for row in rows]
+
+    def most_frequent(self, limit):
+        """
+        Devuelve las entradas más usadas, para precargar las cachés al iniciar.
+
+        Args:
+            limit (int): Número máximo de entradas
+
+        Returns:
+            list: Pares ``(request, calculation)``; se omiten los resultados que ya no pueden leerse
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT request, calculation FROM calculations ORDER BY uses DESC, last_used DESC LIMIT ?",
+                (limit,)).fetchall()
+        entries = []
+        for request, calculation in rows:
+            try:
+                entries.append((json.loads(request), pickle.loads(calculation)))
+            except Exception:
+                continue
+        return entries
+
+    def delete(self, key):
+        """Elimina una entrada."""
+        with self._lock:
+            self._connection.execute("DELETE FROM calculations WHERE key = ?", (key,))
+            self._connection.commit()
+
+    def clear(self):
+        """Elimina todas las entradas."""
+        with self._lock:
+            self._connection.execute("DELETE FROM calculations")
+            self._connection.commit()
+
+    def close(self):
+        """Cierra la conexión con la base de datos."""
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,343 @@
+"""
+Plan de integrales
+------------------
+Registro compartido de las integrales que necesita cada tipo de cálculo.
+
+Los modos Area, Volume, Average, Surface Area y Centroid integran las mismas
+pocas funciones derivadas de ``f``: ``f``, ``f**2`` y ``x*f``. Un
+``IntegralPlan`` interpreta la función una sola vez, calcula la antiderivada
+de cada integrando una sola vez y la evalúa en los límites, de modo que
+cambiar de modo o de límites sobre la misma función reutiliza el trabajo ya
+hecho. ``get_plan`` conserva los planes de las funciones usadas recientemente.
+
+Dependencias:
+    - sympy: Para cálculos simbólicos
+    - numpy: Para la integración numérica de respaldo (ver ``quadrature.py``)
+"""
+
+import math
+import threading
+from collections import OrderedDict
+
+import sympy as sp
+
+import quadrature
+from calculation_worker import call_within
+from evaluators import get_evaluator
+
+# Segundos que se espera a la integración simbólica antes de mostrar el resultado numérico
+SYMBOLIC_DEADLINE = 5.0
+
+# Valores que indican que una integral no converge
+NON_FINITE = (sp.oo, -sp.oo, sp.zoo, sp.nan)
+
+# Número de planes conservados por get_plan
+PLAN_CACHE_SIZE = 32
+
+# Integrandos que necesita cada tipo de cálculo, en términos de la función f y la variable x
+PLAN_INTEGRANDS = {
+    "Area": ["f"],
+    "Volume": ["f**2"],
+    "Average": ["f"],
+    "Surface Area": ["f"],
+    "Centroid / Center of Mass": ["f", "x*f", "f**2"],
+}
+
+
+def numeric_integral(integrand, variable, lower_bound, upper_bound):
+    """
+    Calcula una integral definida con cuadratura de Gauss-Kronrod.
+
+    Args:
+        integrand (sympy.Expr): Función a integrar
+        variable (sympy.Symbol): Variable de integración
+        lower_bound (sympy.Expr): Límite inferior
+        upper_bound (sympy.Expr): Límite superior
+
+    Returns:
+        tuple: Valor y error estimado, o None si la integral depende de otros
+        símbolos y no puede evaluarse numéricamente
+    """
+    if integrand.free_symbols - {variable} or lower_bound.free_symbols or upper_bound.free_symbols:
+        return None
+    f = get_evaluator(integrand, variable)
+    value, error = quadrature.integrate(f, float(lower_bound), float(upper_bound))
+    return value, error
+
+
+def _agrees(exact, numeric):
+    """Indica si un valor exacto coincide con el resultado numérico dentro de su error."""
+    value, error = numeric
+    try:
+        exact = float(exact)
+    except TypeError:
+        return False
+    return abs(exact - value) <= 1e-6 * max(1.0, abs(value)) + 100 * error
+
+
+def evaluate_antiderivative(antiderivative, variable, lower_bound, upper_bound):
+    """
+    Evalúa ``F(upper_bound) - F(lower_bound)``, usando límites laterales donde ``F`` no está definida.
+
+    Args:
+        antiderivative (sympy.Expr): Antiderivada F
+        variable (sympy.Symbol): Variable de integración
+        lower_bound (sympy.Expr): Límite inferior
+        upper_bound (sympy.Expr): Límite superior
+
+    Returns:
+        sympy.Expr: Valor de la integral definida
+    """
+    def value_at(bound, direction):
+        value = antiderivative.subs(variable, bound)
+        if not value.is_finite:
+            value = sp.limit(antiderivative, variable, bound, direction)
+        return value
+
+    return value_at(upper_bound, "-") - value_at(lower_bound, "+")
+
+
+def _integrate_exactly(integrand, variable, lower_bound, upper_bound, antiderivative, find_antiderivative, numeric):
+    """
+    Intento simbólico de ``definite_integral``; se ejecuta en un proceso de reserva.
+
+    Returns:
+        tuple: Antiderivada usada (None si no se conocía ni se buscó) y valor de
+        la integral (puede contener ``Integral`` sin evaluar)
+    """
+    if antiderivative is None and find_antiderivative:
+        antiderivative = sp.integrate(integrand, variable)
+    if antiderivative is not None and not antiderivative.has(sp.Integral):
+        candidate = evaluate_antiderivative(antiderivative, variable, lower_bound, upper_bound)
+        if numeric is not None and _agrees(candidate, numeric):
+            return antiderivative, candidate
+    return antiderivative, sp.integrate(integrand, (variable, lower_bound, upper_bound))
+
+
+def definite_integral(integrand, variable, lower_bound, upper_bound, deadline=SYMBOLIC_DEADLINE,
+                      antiderivative=None, on_antiderivative=None):
+    """
+    Calcula una integral definida compitiendo entre SymPy y la cuadratura numérica.
+
+    Primero se calcula el valor numérico y luego se intenta la forma cerrada
+    con SymPy en un proceso de reserva (ver ``calculation_worker.call_within``).
+    Si SymPy la encuentra antes de ``deadline`` se usa el resultado exacto; en
+    caso contrario (tiempo agotado, error o una ``Integral`` sin evaluar) el
+    proceso se termina y se usa el valor numérico.
+
+    Con una antiderivada F (la indicada o, si se pasa ``on_antiderivative``,
+    la que SymPy calcula primero), se intenta ``F(b) - F(a)`` y el resultado
+    se contrasta con el valor numérico; si no coincide (por ejemplo, porque F
+    es discontinua en el intervalo) se integra con límites.
+
+    Args:
+        integrand (sympy.Expr): Función a integrar
+        variable (sympy.Symbol): Variable de integración
+        lower_bound (sympy.Expr): Límite inferior
+        upper_bound (sympy.Expr): Límite superior
+        deadline (float): Segundos máximos de espera del resultado simbólico
+        antiderivative (sympy.Expr): Antiderivada F ya conocida, o None
+        on_antiderivative (callable): Si se indica y F no se conoce, F se
+            calcula dentro del intento simbólico y se pasa a esta función
+
+    Returns:
+        tuple: Valor, método y error estimado (None salvo para ``"numeric"``).
+        El método es ``"exact"``, ``"numeric"`` o ``"divergent"`` si el valor
+        no es finito (``oo``, ``zoo`` o ``nan``)
+    """
+    find_antiderivative = antiderivative is None and on_antiderivative is not None
+    try:
+        numeric = numeric_integral(integrand, variable, lower_bound, upper_bound)
+    except Exception:
+        numeric = None
+
+    outcome = None
+    if numeric is None:
+        # Sin respaldo numérico no tiene sentido abandonar el resultado simbólico
+        try:
+            outcome = _integrate_exactly(integrand, variable, lower_bound, upper_bound, antiderivative,
+                                         find_antiderivative, None)
+        except Exception:
+            pass
+    else:
+        finished = call_within(deadline, _integrate_exactly, integrand, variable, lower_bound, upper_bound,
+                               antiderivative, find_antiderivative, numeric)
+        if finished is not None and finished[0]:
+            outcome = finished[1]
+
+    exact = None
+    if outcome is not None:
+        found, exact = outcome
+        if find_antiderivative and found is not None:
+            on_antiderivative(found)
+
+    if (exact is not None and not exact.has(sp.Integral)) or numeric is None:
+        if exact is None:
+            raise ValueError("No se pudo calcular la integral.")
+        if exact.has(*NON_FINITE):
+            return exact, "divergent", None
+        return exact, "exact", None
+    value, error = numeric
+    if not math.isfinite(value):
+        return sp.nan, "divergent", None
+    return sp.Float(value), "numeric", error
+
+
+class IntegralPlan:
+    """
+    Integrales memorizadas de una función respecto a una variable.
+
+    Args:
+        function (sympy.Expr): Función ya interpretada
+        variable (sympy.Symbol): Variable de integración
+    """
+
+    def __init__(self, function, variable):
+        self.function = function
+        self.variable = variable
+        self._antiderivatives = {}
+        self._definite = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def integrand(self, name):
+        """
+        Construye un integrando de ``PLAN_INTEGRANDS`` a partir de su nombre.
+
+        Args:
+            name (str): Expresión en términos de ``f`` y ``x``
+
+        Returns:
+            sympy.Expr: Integrando
+        """
+        return sp.sympify(name, locals={"f": self.function, "x": self.variable})
+
+    def antiderivative(self, integrand):
+        """
+        Devuelve la antiderivada de ``integrand``, calculándola solo la primera vez.
+
+        Si otro hilo ya la está calculando, espera ese resultado en lugar de
+        repetir el trabajo.
+
+        Args:
+            integrand (sympy.Expr): Función a integrar
+
+        Returns:
+            sympy.Expr: Antiderivada (puede contener ``Integral`` sin evaluar)
+        """
+        with self._lock:
+            lock = self._locks.setdefault(integrand, threading.Lock())
+        with lock:
+            if integrand not in self._antiderivatives:
+                self._antiderivatives[integrand] = sp.integrate(integrand, self.variable)
+            return self._antiderivatives[integrand]
+
+    def antiderivative_within(self, integrand, timeout):
+        """
+        Devuelve la antiderivada de ``integrand`` si se obtiene en ``timeout`` segundos.
+
+        El cálculo se hace en un proceso de reserva que se termina si no
+        responde a tiempo (ver ``calculation_worker.call_within``); solo se
+        memorizan los resultados obtenidos.
+
+        Args:
+            integrand (sympy.Expr): Función a integrar
+            timeout (float): Segundos máximos de espera
+
+        Returns:
+            sympy.Expr: Antiderivada, o None si no terminó a tiempo o falló
+        """
+        antiderivative = self._antiderivatives.get(integrand)
+        if antiderivative is not None:
+            return antiderivative
+        outcome = call_within(timeout, sp.integrate, integrand, self.variable)
+        if outcome is None or not outcome[0]:
+            return None
+        return self._antiderivatives.setdefault(integrand, outcome[1])
+
+    def known_antiderivatives(self, calculation_type):
+        """
+        Devuelve las antiderivadas en forma cerrada ya calculadas, sin esperar las pendientes.
+
+        Args:
+            calculation_type (str): Clave de ``PLAN_INTEGRANDS``
+
+        Returns:
+            dict: Antiderivada por nombre de integrando; los integrandos sin
+            antiderivada disponible se omiten
+        """
+        known = {}
+        for name in PLAN_INTEGRANDS[calculation_type]:
+            antiderivative = self._antiderivatives.get(self.integrand(name))
+            if antiderivative is not None and not antiderivative.has(sp.Integral):
+                known[name] = antiderivative
+        return known
+
+    def definite(self, integrand, lower_bound, upper_bound, deadline=SYMBOLIC_DEADLINE):
+        """
+        Calcula una integral definida reutilizando la antiderivada del integrando.
+
+        Los resultados exactos y divergentes se memorizan; los numéricos no,
+        para que la siguiente llamada vuelva a intentar la forma cerrada.
+
+        Returns:
+            tuple: Valor, método y error estimado (ver ``definite_integral``)
+        """
+        key = (integrand, lower_bound, upper_bound)
+        if key in self._definite:
+            return self._definite[key]
+        result = definite_integral(integrand, self.variable, lower_bound, upper_bound, deadline,
+                                   antiderivative=self._antiderivatives.get(integrand),
+                                   on_antiderivative=lambda found: self._antiderivatives.setdefault(integrand, found))
+        if result[1] != "numeric":
+            self._definite[key] = result
+        return result
+
+    def integrals(self, calculation_type, lower_bound, upper_bound, deadline=SYMBOLIC_DEADLINE):
+        """
+        Calcula las integrales definidas que necesita un tipo de cálculo.
+
+        Args:
+            calculation_type (str): Clave de ``PLAN_INTEGRANDS``
+            lower_bound (sympy.Expr): Límite inferior
+            upper_bound (sympy.Expr): Límite superior
+            deadline (float): Segundos máximos de espera de cada resultado simbólico
+
+        Returns:
+            list: Una tupla ``(valor, método, error)`` por integrando, en el
+            orden de ``PLAN_INTEGRANDS[calculation_type]``
+        """
+        return [self.definite(self.integrand(name), lower_bound, upper_bound, deadline)
+                for name in PLAN_INTEGRANDS[calculation_type]]
+
+
+_plans = OrderedDict()
+_plans_lock = threading.Lock()
+
+
+def get_plan(function, variable):
+    """
+    Devuelve el plan de ``function`` respecto a ``variable``, creándolo si no existe.
+
+    Args:
+        function (sympy.Expr): Función ya interpretada
+        variable (sympy.Symbol): Variable de integración
+
+    Returns:
+        IntegralPlan: Plan compartido por todos los tipos de cálculo
+    """
+    key = (function, variable)
+    with _plans_lock:
+        plan = _plans.get(key)
+        if plan is None:
+            plan = _plans[key] = IntegralPlan(function, variable)
+        _plans.move_to_end(key)
+        while len(_plans) > PLAN_CACHE_SIZE:
+            _plans.popitem(last=False)
+        return plan
+
+
+def clear_plans():
+    """Descarta todos los planes, con sus antiderivadas e integrales memorizadas."""
+    with _plans_lock:
+        _plans.clear()
@@ -0,0 +1,94 @@
+"""
+Mallas 3D
+---------
+Generación de mallas para las superficies de los gráficos 3D con niveles de detalle.
+
+Las funciones se evalúan solo en la resolución que realmente se dibuja, y las
+coordenadas se construyen con difusión (broadcasting) de NumPy en lugar de
+copias con ``np.outer`` o ``np.meshgrid``. El nivel "coarse" se usa mientras el
+usuario rota el gráfico y el nivel "fine" cuando la interacción termina.
+
+Dependencias:
+    - numpy: Para operaciones numéricas
+"""
+
+import numpy as np
+
+from profiling import timed
+
+# Puntos por eje de cada nivel de detalle
+MESH_LEVELS = {"coarse": 10, "fine": 24}
+
+
+def resolution(level):
+    """
+    Devuelve los puntos por eje de un nivel de detalle.
+
+    Args:
+        level (str | int): Nombre de ``MESH_LEVELS`` o número de puntos
+
+    Returns:
+        int: Puntos por eje
+    """
+    if isinstance(level, str):
+        return MESH_LEVELS[level]
+    return int(level)
+
+
+def _real(values):
+    """Convierte valores complejos o no finitos en NaN para que no se dibujen."""
+    values = np.asarray(values)
+    if np.iscomplexobj(values):
+        values = np.where(np.abs(values.imag) > 0, np.nan, values.real)
+    values = values.astype(float)
+    values[~np.isfinite(values)] = np.nan
+    return values
+
+
+@timed("sample")
+def surface_mesh(f, x_range, y_range, level="fine"):
+    """
+    Evalúa ``f(x, y)`` sobre una malla rectangular.
+
+    Args:
+        f (callable): Función vectorizada de dos variables
+        x_range (tuple): Intervalo ``(inicio, fin)`` del eje x
+        y_range (tuple): Intervalo ``(inicio, fin)`` del eje y
+        level (str | int): Nivel de detalle
+
+    Returns:
+        tuple: Arreglos ``X``, ``Y`` y ``Z`` de forma ``(n, n)``; ``X`` e ``Y``
+        son vistas de difusión de solo lectura. Si ``f`` devuelve varias
+        componentes (por ejemplo, un evaluador de ``sp.Tuple``), ``Z`` tiene
+        forma ``(componentes, n, n)``
+    """
+    n = resolution(level)
+    x = np.linspace(*x_range, n)[None, :]
+    y = np.linspace(*y_range, n)[:, None]
+    with np.errstate(all="ignore"):
+        Z = _real(f(x, y))
+    X, Y = np.broadcast_arrays(x, y)
+    return X, Y, np.broadcast_to(Z, np.broadcast_shapes(Z.shape, X.shape))
+
+
+@timed("sample")
+def revolution_mesh(f, lower_bound, upper_bound, level="fine"):
+    """
+    Construye la superficie que genera ``f`` al girar alrededor del eje x.
+
+    Args:
+        f (callable): Función vectorizada de una variable
+        lower_bound (float): Inicio del intervalo
+        upper_bound (float): Fin del intervalo
+        level (str | int): Nivel de detalle
+
+    Returns:
+        tuple: Arreglos ``x``, ``y`` y ``z`` de forma ``(n, n)``
+    """
+    n = resolution(level)
+    x_vals = np.linspace(float(lower_bound), float(upper_bound), n)
+    with np.errstate(all="ignore"):
+        radius = _real(f(x_vals))[None, :]
+    theta = np.linspace(0, 2 * np.pi, n)[:, None]
+    x = np.broadcast_to(x_vals, (n, n))
+    return x, radius * np.cos(theta), radius * np.sin(theta)
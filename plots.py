@@ -0,0 +1,640 @@
+"""
+Gráficos
+--------
+Funciones que dibujan los resultados de la calculadora sobre una figura existente.
+
+Este módulo no depende de tkinter: cada función recibe la
+``matplotlib.figure.Figure`` sobre la que debe dibujar, de modo que la
+interfaz puede reutilizar una sola figura durante toda la sesión (en lugar de
+crear una nueva figura con ``pyplot`` en cada cálculo) y otros programas
+pueden dibujar sobre figuras sin pantalla.
+
+Cuando una figura se vuelve a usar con la misma disposición de ejes, las
+curvas existentes se actualizan con ``set_data`` en lugar de recrear los ejes.
+
+Dependencias:
+    - numpy: Para operaciones numéricas
+    - matplotlib: Para visualización de gráficos
+"""
+
+import math
+
+import numpy as np
+import sympy as sp
+
+from evaluators import get_evaluator, parse_cached
+from mesh import revolution_mesh, surface_mesh
+from profiling import timed
+from sampling import adaptive_sample, view_limits
+
+# Presupuesto de puntos por curva cuando no se indica otro
+DEFAULT_BUDGET = 800
+
+# Puntos por eje de la malla compartida por los paneles de plot_gradient
+GRADIENT_MESH_POINTS = 100
+
+
+def _axes(fig, layout, figsize, rows=1, projection=None, columns=1):
+    """
+    Prepara los ejes de la figura para una disposición dada.
+
+    Si la figura ya tiene esa disposición, se conservan los ejes y las curvas
+    registradas con ``_line`` (para actualizarlas con ``set_data``) y se
+    eliminan los demás artistas. En caso contrario, la figura se vacía.
+
+    Args:
+        fig (matplotlib.figure.Figure): Figura a preparar
+        layout (str): Identificador de la disposición de ejes
+        figsize (tuple): Tamaño de la figura en pulgadas
+        rows (int): Número de filas de ejes
+        projection (str): Proyección de los ejes (por ejemplo, '3d')
+        columns (int): Número de columnas de ejes
+
+    Returns:
+        list: Ejes de la figura
+    """
+    state = getattr(fig, "calculator_state", None)
+    if state is None or state["layout"] != layout:
+        fig.clear()
+        fig.set_size_inches(*figsize)
+        axes = [fig.add_subplot(rows, columns, index + 1, projection=projection) for index in range(rows * columns)]
+        state = fig.calculator_state = {"layout": layout, "axes": axes, "lines": {}}
+    elif projection == '3d':
+        # Las superficies 3D no pueden actualizarse en su lugar; clear() conserva el ángulo de vista
+        for ax in state["axes"]:
+            ax.cla()
+        state["lines"].clear()
+    else:
+        kept = set(state["lines"].values())
+        for ax in state["axes"]:
+            for artist in list(ax.collections) + list(ax.patches) + list(ax.texts):
+                artist.remove()
+            for line in list(ax.lines):
+                if line not in kept:
+                    line.remove()
+            ax.set_autoscale_on(True)
+    state["touched"] = set()
+    return state["axes"]
+
+
+def _line(ax, key, x, y, *fmt, **kwargs):
+    """
+    Dibuja una curva o, si ya existe en una figura reutilizada, actualiza sus datos.
+
+    Args:
+        ax (matplotlib.axes.Axes): Ejes donde se dibuja
+        key (str): Nombre único de la curva dentro de la figura
+        x, y (array_like): Datos de la curva
+        *fmt, **kwargs: Argumentos de ``ax.plot`` (solo se usan al crear la curva,
+            excepto ``label``, que se actualiza siempre)
+    """
+    state = ax.figure.calculator_state
+    line = state["lines"].get(key)
+    if line is None:
+        line, = ax.plot(x, y, *fmt, **kwargs)
+        state["lines"][key] = line
+    else:
+        line.set_data(np.atleast_1d(x), np.atleast_1d(y))
+        if "label" in kwargs:
+            line.set_label(kwargs["label"])
+    state["touched"].add(key)
+    return line
+
+
+def _finish(fig):
+    """Elimina las curvas que no se actualizaron y reajusta la escala de los ejes."""
+    state = fig.calculator_state
+    for key in list(state["lines"]):
+        if key not in state["touched"]:
+            state["lines"].pop(key).remove()
+    for ax in state["axes"]:
+        if ax.name != '3d':
+            ax.relim()
+            ax.autoscale_view()
+
+
+def set_view_limits(ax, x_vals, y_vals):
+    """
+    Recorta el eje vertical cuando hay polos, para que no aplasten el resto de la curva.
+
+    Args:
+        ax (matplotlib.axes.Axes): Ejes a ajustar
+        x_vals (numpy.ndarray): Puntos muestreados
+        y_vals (numpy.ndarray): Valores muestreados
+    """
+    limits = view_limits(x_vals, y_vals)
+    if limits is not None:
+        ax.set_ylim(*limits)
+
+
+@timed("plot")
+def plot_function_and_result(fig, function, variable, result, plot_type, budget=DEFAULT_BUDGET):
+    """
+    Genera gráficos comparativos de la función original y su resultado.
+
+    Args:
+        fig (matplotlib.figure.Figure): Figura donde se dibuja
+        function (str): Función matemática original
+        variable (sympy.Symbol): Variable de la función
+        result (sympy.Expr): Resultado del cálculo
+        plot_type (str): Tipo de operación realizada
+        budget (int): Número máximo de puntos por curva
+    """
+    # Convertir expresiones simbólicas a funciones numéricas (compiladas una sola vez)
+    f = get_evaluator(function, variable)
+    g = get_evaluator(result, variable)
+
+    # Muestrear cada curva de forma adaptativa (más puntos donde cambia rápido)
+    x_vals, y_vals_function = adaptive_sample(f, -10, 10, budget)
+    x_vals_result, y_vals_result = adaptive_sample(g, -10, 10, budget)
+
+    # Crear subplots
+    ax1, ax2 = _axes(fig, "function_and_result", (8, 10), rows=2)
+    _line(ax1, "function", x_vals, y_vals_function, label=f'Function: {function}')
+    _line(ax2, "result", x_vals_result, y_vals_result, label=f'{plot_type}: {result}', color='r')
+    _finish(fig)
+
+    set_view_limits(ax1, x_vals, y_vals_function)
+    ax1.legend()
+    ax1.set_xlabel(str(variable))
+    ax1.set_ylabel('y')
+    ax1.set_title('Original Function')
+    ax1.grid(True)
+
+    set_view_limits(ax2, x_vals_result, y_vals_result)
+    ax2.legend()
+    ax2.set_xlabel(str(variable))
+    ax2.set_ylabel('y')
+    ax2.set_title(f'{plot_type} of Function')
+    ax2.grid(True)
+
+
+def _plane_variables(expressions, variable, preferred=None):
+    """
+    Elige las variables de los ejes de un gráfico de dos variables.
+
+    El primer eje es ``variable``; el segundo es ``preferred`` si es distinta,
+    si no la primera otra variable libre de las expresiones (por nombre), y
+    ``y`` si no hay ninguna.
+
+    Returns:
+        tuple: Dos símbolos
+    """
+    variable = sp.Symbol(variable) if isinstance(variable, str) else variable
+    if preferred is not None and preferred != variable:
+        return variable, preferred
+    others = set().union(*(parse_cached(expression).free_symbols for expression in expressions)) - {variable}
+    if others:
+        return variable, min(others, key=lambda symbol: symbol.name)
+    return variable, sp.Symbol('y')
+
+
+@timed("plot")
+def plot_partial(fig, function, variable, result, plot_type, level="fine", variable_2=None):
+    """
+    Genera gráficos comparativos de la función original y su resultado.
+
+    Args:
+        fig (matplotlib.figure.Figure): Figura donde se dibuja
+        function (str): Función matemática original
+        variable (sympy.Symbol): Variable de la función
+        result (sympy.Expr): Resultado del cálculo
+        plot_type (str): Tipo de operación realizada
+        level (str): Nivel de detalle de la malla (ver ``mesh.MESH_LEVELS``)
+        variable_2 (sympy.Symbol): Variable de derivación, usada como segundo eje
+            si es distinta de ``variable``
+    """
+    variable, second = _plane_variables([function, result], variable, variable_2)
+
+    # Convertir expresiones simbólicas a funciones numéricas (compiladas una sola vez)
+    f = get_evaluator(function, (variable, second))
+    g = get_evaluator(result, (variable, second))
+
+    # Evaluar solo la resolución que se dibuja
+    X, Y, Z_function = surface_mesh(f, (-10, 10), (-10, 10), level)
+    _, _, Z_result = surface_mesh(g, (-10, 10), (-10, 10), level)
+
+    # Crear subplots
+    ax1, ax2 = _axes(fig, "partial", (10, 10), rows=2, projection='3d')
+    ax1.plot_surface(X, Y, Z_function, alpha=0.7, rstride=1, cstride=1, label='Function')
+    ax1.set_title('Original Function')
+    ax1.set_xlabel(str(variable))
+    ax1.set_ylabel(str(second))
+    ax1.set_zlabel(f'f({variable}, {second})')
+    ax1.grid(True)
+
+    ax2.plot_surface(X, Y, Z_result, color='r', alpha=0.7, rstride=1, cstride=1)
+    ax2.set_title(f'{plot_type} of Function')
+    ax2.set_xlabel(str(variable))
+    ax2.set_ylabel(str(second))
+    ax2.set_zlabel(f'{plot_type}({variable}, {second})')
+    ax2.grid(True)
+    _finish(fig)
+
+
+@timed("plot")
+def plot_limit(fig, function, variable, limit_point, limit, budget=DEFAULT_BUDGET):
+    """
+    Genera un gráfico que muestra el límite de una función.
+
+    Args:
+        fig (matplotlib.figure.Figure): Figura donde se dibuja
+        function (str): Función matemática
+        variable (sympy.Symbol): Variable de la función
+        limit_point (float): Punto donde se evalúa el límite
+        limit (float): Valor del límite
+        budget (int): Número máximo de puntos de la curva
+    """
+    f = get_evaluator(function, variable)
+
+    x_vals, y_vals = adaptive_sample(f, float(limit_point) - 5, float(limit_point) + 5, budget)
+
+    ax, = _axes(fig, "limit", (8, 6))
+    _line(ax, "function", x_vals, y_vals, label=f'Function: {function}')
+    _line(ax, "limit", float(limit_point), float(limit), 'ro', label=f'Limit: {limit}')
+    _finish(fig)
+    set_view_limits(ax, x_vals, y_vals)
+    ax.legend()
+    ax.set_xlabel(str(variable))
+    ax.set_ylabel('y')
+    ax.set_title(f'Limit of Function as {variable} approaches {limit_point}')
+    ax.grid(True)
+
+
+@timed("plot")
+def plot_area(fig, function, variable, lower_bound, upper_bound, budget=DEFAULT_BUDGET):
+    """
+    Genera un gráfico que muestra el área bajo la curva.
+
+    Args:
+        fig (matplotlib.figure.Figure): Figura donde se dibuja
+        function (str): Función matemática
+        variable (sympy.Symbol): Variable de la función
+        lower_bound (float): Límite inferior de integración
+        upper_bound (float): Límite superior de integración
+        budget (int): Número máximo de puntos de la curva
+    """
+    f = get_evaluator(function, variable)
+
+    x_vals, y_vals = adaptive_sample(f, float(lower_bound), float(upper_bound), budget)
+
+    ax, = _axes(fig, "area", (8, 6))
+    _line(ax, "function", x_vals, y_vals, label=f'Function: {function}')
+    ax.fill_between(x_vals, y_vals, alpha=0.3)
+    _finish(fig)
+    ax.legend()
+    ax.set_xlabel(str(variable))
+    ax.set_ylabel('y')
+    ax.set_title(f'Area under the curve from {lower_bound} to {upper_bound}')
+    ax.grid(True)
+
+
+@timed("plot")
+def plot_volume(fig, function, variable, lower_bound, upper_bound, level="fine"):
+    """
+    Genera un gráfico 3D que muestra el volumen de revolución.
+
+    Args:
+        fig (matplotlib.figure.Figure): Figura donde se dibuja
+        function (str): Función matemática
+        variable (sympy.Symbol): Variable de la función
+        lower_bound (float): Límite inferior de integración
+        upper_bound (float): Límite superior de integración
+        level (str): Nivel de detalle de la malla (ver ``mesh.MESH_LEVELS``)
+    """
+    f = get_evaluator(function, variable)
+
+    # Crear malla para gráfico 3D
+    x, y, z = revolution_mesh(f, lower_bound, upper_bound, level)
+
+    ax, = _axes(fig, "revolution", (8, 6), projection='3d')
+    ax.plot_surface(x, y, z, alpha=0.7, rstride=1, cstride=1)
+    ax.set_xlabel(str(variable))
+    ax.set_ylabel('y (cosine projection)')
+    ax.set_zlabel('z (sine projection)')
+    ax.set_title(f'Volume of revolution from {lower_bound} to {upper_bound}')
+    _finish(fig)
+
+
+@timed("plot")
+def plot_average(fig, function, variable, lower_bound, upper_bound, average_value, budget=DEFAULT_BUDGET):
+    """
+    Genera un gráfico que muestra el valor promedio de la función.
+
+    Args:
+        fig (matplotlib.figure.Figure): Figura donde se dibuja
+        function (str): Función matemática
+        variable (sympy.Symbol): Variable de la función
+        lower_bound (float): Límite inferior
+        upper_bound (float): Límite superior
+        average_value (float): Valor promedio calculado
+        budget (int): Número máximo de puntos de la curva
+    """
+    f = get_evaluator(function, variable)
+
+    x_vals, y_vals = adaptive_sample(f, float(lower_bound), float(upper_bound), budget)
+
+    average_value_float = float(average_value)
+
+    ax, = _axes(fig, "average", (8, 6))
+    _line(ax, "function", x_vals, y_vals, label=f'Function: {function}')
+    ax.axhline(y=average_value_float, color='r', linestyle='--',
+               label=f'Average: {average_value_float}')
+    ax.fill_between(x_vals, y_vals, average_value_float,
+                    where=(y_vals > average_value_float), alpha=0.3)
+    ax.fill_between(x_vals, y_vals, average_value_float,
+                    where=(y_vals <= average_value_float), color='gray', alpha=0.3)
+    _finish(fig)
+    ax.legend()
+    ax.set_xlabel(str(variable))
+    ax.set_ylabel('y')
+    ax.set_title(f'Average Value of Function from {lower_bound} to {upper_bound}')
+    ax.grid(True)
+
+
+@timed("plot")
+def plot_surface_area(fig, function, variable, lower_bound, upper_bound, level="fine"):
+    """
+    Genera un gráfico que muestra el área de superficie de revolución.
+
+    Args:
+        fig (matplotlib.figure.Figure): Figura donde se dibuja
+        function (str): Función matemática
+        variable (sympy.Symbol): Variable de la función
+        lower_bound (float): Límite inferior de integración
+        upper_bound (float): Límite superior de integración
+        level (str): Nivel de detalle de la malla (ver ``mesh.MESH_LEVELS``)
+    """
+    f = get_evaluator(function, variable)
+
+    x, y, z = revolution_mesh(f, lower_bound, upper_bound, level)
+
+    ax, = _axes(fig, "revolution", (8, 6), projection='3d')
+    ax.plot_surface(x, y, z, alpha=0.7, rstride=1, cstride=1)
+    ax.set_xlabel(str(variable))
+    ax.set_ylabel('y (cosine projection)')
+    ax.set_zlabel('z (sine projection)')
+    ax.set_title(f'Surface Area of revolution from {lower_bound} to {upper_bound}')
+    _finish(fig)
+
+
+@timed("plot")
+def plot_centroid(fig, function, variable, lower_bound, upper_bound, x_centroid, y_centroid, budget=DEFAULT_BUDGET):
+    """
+    Genera un gráfico que muestra la región bajo la curva y su centroide.
+
+    Args:
+        fig (matplotlib.figure.Figure): Figura donde se dibuja
+        function (str): Función matemática
+        variable (sympy.Symbol): Variable de la función
+        lower_bound (float): Límite inferior
+        upper_bound (float): Límite superior
+        x_centroid (float): Coordenada x del centroide
+        y_centroid (float): Coordenada y del centroide
+        budget (int): Número máximo de puntos de la curva
+    """
+    f = get_evaluator(function, variable)
+
+    x_vals, y_vals = adaptive_sample(f, float(lower_bound), float(upper_bound), budget)
+
+    ax, = _axes(fig, "centroid", (8, 6))
+
+    # Graficar la función
+    _line(ax, "function", x_vals, y_vals, color='blue', label=f'Function: {function}', linewidth=2)
+
+    # Rellenar el área bajo la curva
+    ax.fill_between(x_vals, y_vals, color='lightblue', alpha=0.3, label='Area under curve')
+
+    # Graficar el centroide con un marcador distintivo
+    _line(ax, "centroid", float(x_centroid), float(y_centroid), 'ro', markersize=10,
+          label=f'Centroid: ({x_centroid:.2f}, {y_centroid:.2f})')
+
+    # Agregar líneas punteadas para el centroide
+    ax.axvline(x=float(x_centroid), color='red', linestyle='--', alpha=0.7)
+    ax.axhline(y=float(y_centroid), color='red', linestyle='--', alpha=0.7)
+    _finish(fig)
+
+    # Mejorar la presentación de los ejes
+    ax.set_xlim(float(lower_bound) - 1, float(upper_bound) + 1)
+    ax.set_ylim(np.nanmin(y_vals) - 1, np.nanmax(y_vals) + 1)
+    ax.set_aspect('equal', adjustable='box')
+
+    # Etiquetas y título
+    ax.set_xlabel(str(variable), fontsize=12)
+    ax.set_ylabel('y', fontsize=12)
+    ax.set_title('Centroid of the Region under the Curve', fontsize=14)
+
+    # Activar cuadrícula
+    ax.grid(True, linestyle='--', alpha=0.5)
+
+    # Leyenda
+    ax.legend(fontsize=10, loc='best')
+
+
+@timed("plot")
+def plot_chain_rule(fig, outer_function, inner_function, chain_rule_result, variable, budget=DEFAULT_BUDGET):
+    """
+    Grafica la función original y su derivada.
+    """
+    # Convertir funciones simbólicas a funciones numéricas
+    outer_func_numeric = get_evaluator(outer_function.replace('u', f'({inner_function})'), variable)
+    chain_rule_numeric = get_evaluator(chain_rule_result, variable)
+
+    # Muestrear cada curva de forma adaptativa
+    x_vals_outer, y_vals_outer = adaptive_sample(outer_func_numeric, -10, 10, budget)
+    x_vals_chain, y_vals_chain = adaptive_sample(chain_rule_numeric, -10, 10, budget)
+
+    # Crear gráficos
+    ax, = _axes(fig, "chain_rule", (8, 6))
+    _line(ax, "outer", x_vals_outer, y_vals_outer,
+          label=f'Outer Function: {outer_function.replace("u", f"({inner_function})")}', color='blue')
+    _line(ax, "chain", x_vals_chain, y_vals_chain, label='Chain Rule Result', color='red', linestyle='--')
+    ax.axhline(0, color='black', lw=0.5, ls='--')
+    ax.axvline(0, color='black', lw=0.5, ls='--')
+    _finish(fig)
+    set_view_limits(ax, np.concatenate([x_vals_outer, x_vals_chain]), np.concatenate([y_vals_outer, y_vals_chain]))
+    ax.set_title('Function and its Derivative using Chain Rule')
+    ax.set_xlabel(str(variable))
+    ax.set_ylabel('y')
+    ax.legend()
+    ax.grid(True)
+
+
+# Tipos de cálculo que plot_bounds actualiza sin recrear la figura
+REGION_TYPES = ["Area", "Average", "Centroid / Center of Mass"]
+
+
+@timed("plot")
+def plot_bounds(fig, function, variable, calculation_type, domain, lower_bound, upper_bound, value,
+                budget=DEFAULT_BUDGET):
+    """
+    Dibuja la región de Area, Average o Centroid para límites que cambian con frecuencia.
+
+    La curva se muestrea una sola vez sobre todo ``domain`` y se conserva entre
+    llamadas; en cada llamada solo se reemplaza la región sombreada y los
+    marcadores, de modo que mover los límites no recrea la figura.
+
+    Args:
+        fig (matplotlib.figure.Figure): Figura donde se dibuja
+        function (str): Función matemática
+        variable (sympy.Symbol): Variable de la función
+        calculation_type (str): Uno de ``REGION_TYPES``
+        domain (tuple): Intervalo en el que se mueven los límites
+        lower_bound (float): Límite inferior
+        upper_bound (float): Límite superior
+        value (float | tuple): Resultado para esos límites (tupla ``(x̄, ȳ)`` para Centroid)
+        budget (int): Número máximo de puntos de la curva
+    """
+    f = get_evaluator(function, variable)
+    ax, = _axes(fig, f"bounds:{calculation_type}", (8, 6))
+    state = fig.calculator_state
+    samples_key = (function, variable, tuple(domain), budget)
+    if state.get("samples_key") != samples_key:
+        state["samples"] = adaptive_sample(f, *domain, budget)
+        state["samples_key"] = samples_key
+    x_vals, y_vals = state["samples"]
+
+    # Región entre los límites, con los extremos evaluados exactamente
+    low, high = sorted((float(lower_bound), float(upper_bound)))
+    inside = (x_vals > low) & (x_vals < high)
+    with np.errstate(all="ignore"):
+        edges = np.asarray(f(np.array([low, high])), dtype=float)
+    x_region = np.concatenate([[low], x_vals[inside], [high]])
+    y_region = np.concatenate([[edges[0]], y_vals[inside], [edges[1]]])
+
+    _line(ax, "function", x_vals, y_vals, label=f'Function: {function}')
+    if calculation_type == "Average":
+        average_value = float(value)
+        _line(ax, "average", [low, high], [average_value, average_value], 'r--', label='Average')
+        ax.fill_between(x_region, y_region, average_value, where=(y_region > average_value), color='C0', alpha=0.3)
+        ax.fill_between(x_region, y_region, average_value, where=(y_region <= average_value), color='gray', alpha=0.3)
+    else:
+        # Color fijo: cada región nueva avanzaría el ciclo de colores de los ejes
+        ax.fill_between(x_region, y_region, color='C0', alpha=0.3)
+    if calculation_type == "Centroid / Center of Mass":
+        x_centroid, y_centroid = (float(coordinate) for coordinate in value)
+        _line(ax, "centroid", x_centroid, y_centroid, 'ro', markersize=10, label='Centroid')
+        ax.axvline(x=x_centroid, color='red', linestyle='--', alpha=0.7)
+        ax.axhline(y=y_centroid, color='red', linestyle='--', alpha=0.7)
+    _finish(fig)
+    set_view_limits(ax, x_vals, y_vals)
+    ax.legend()
+    ax.set_xlabel(str(variable))
+    ax.set_ylabel('y')
+    ax.set_title(f'{calculation_type} from {low:.4g} to {high:.4g}')
+    ax.grid(True)
+
+
+def gradient_panels(function, variables, gradient, hessian=None):
+    """
+    Reúne las expresiones que se dibujan en Gradient / Hessian.
+
+    Args:
+        function (str | sympy.Expr): Función
+        variables (tuple): Símbolos, en el orden de las componentes
+        gradient (sympy.Matrix): Gradiente
+        hessian (sympy.Matrix): Hessiana, o None
+
+    Returns:
+        tuple: Títulos y ``sp.Tuple`` con la función, las derivadas parciales y
+        (si hay Hessiana) su triángulo superior, para compilarlas en un solo evaluador
+    """
+    titles = ["f"] + [f"∂f/∂{symbol}" for symbol in variables]
+    expressions = [parse_cached(function)] + list(gradient)
+    if hessian is not None:
+        for i, first in enumerate(variables):
+            for j in range(i, len(variables)):
+                second = variables[j]
+                titles.append(f"∂²f/∂{first}²" if i == j else f"∂²f/∂{first}∂{second}")
+                expressions.append(hessian[i, j])
+    return titles, sp.Tuple(*expressions)
+
+
+@timed("plot")
+def plot_gradient(fig, function, variables, gradient, hessian=None, mesh_points=GRADIENT_MESH_POINTS):
+    """
+    Dibuja la función y sus derivadas parciales como una cuadrícula de mapas de contorno.
+
+    Todas las componentes se compilan en un solo evaluador (con eliminación de
+    subexpresiones comunes) y se evalúan en una sola pasada sobre la misma
+    malla. Los ejes son las dos primeras variables; las demás se fijan en 0.
+
+    Args:
+        fig (matplotlib.figure.Figure): Figura donde se dibuja
+        function (str): Función matemática
+        variables (tuple): Símbolos, en el orden de las componentes
+        gradient (sympy.Matrix): Gradiente
+        hessian (sympy.Matrix): Hessiana, o None
+        mesh_points (int): Puntos por eje de la malla
+    """
+    titles, expressions = gradient_panels(function, variables, gradient, hessian)
+    first, second = _plane_variables([function], variables[0], variables[1] if len(variables) > 1 else None)
+    evaluator = get_evaluator(expressions, variables)
+
+    def on_plane(x, y):
+        values = [x if symbol == first else y if symbol == second else 0.0 for symbol in variables]
+        # Con una sola variable, la malla se extiende a lo largo del segundo eje
+        return evaluator(*np.broadcast_arrays(*values, x, y)[:len(variables)])
+
+    X, Y, Z = surface_mesh(on_plane, (-10, 10), (-10, 10), mesh_points)
+
+    columns = math.ceil(math.sqrt(len(titles)))
+    rows = math.ceil(len(titles) / columns)
+    axes = _axes(fig, f"gradient:{rows}x{columns}", (4 * columns, 3.5 * rows), rows=rows, columns=columns)
+    fig.subplots_adjust(hspace=0.5, wspace=0.35)
+    for index, ax in enumerate(axes):
+        if index >= len(titles):
+            ax.set_visible(False)
+            continue
+        if np.all(np.isnan(Z[index])):
+            ax.text(0.5, 0.5, "undefined", ha='center', va='center', transform=ax.transAxes)
+        else:
+            ax.contourf(X, Y, Z[index], levels=20, cmap='viridis')
+            ax.contour(X, Y, Z[index], levels=10, colors='k', linewidths=0.3)
+        ax.set_title(titles[index])
+        ax.set_xlabel(str(first))
+        ax.set_ylabel(str(second))
+    _finish(fig)
+    fixed = [str(symbol) for symbol in variables if symbol not in (first, second)]
+    fig.suptitle(f"Gradient of {function}" + (f" ({', '.join(fixed)} = 0)" if fixed else ""))
+
+
+def plot_calculation(fig, calculation, budget=DEFAULT_BUDGET, level="fine"):
+    """
+    Grafica el resultado de un cálculo producido por ``calculator_core.compute``.
+
+    Args:
+        fig (matplotlib.figure.Figure): Figura donde se dibuja
+        calculation (dict): Resultado del cálculo
+        budget (int): Número máximo de puntos por curva en los gráficos 2D
+        level (str): Nivel de detalle de las mallas de los gráficos 3D
+    """
+    calculation_type = calculation["calculation_type"]
+    function = calculation["function"]
+    variable = calculation.get("variable")
+    value = calculation["value"]
+
+    if calculation_type in ["Integral", "Derivative"]:
+        plot_function_and_result(fig, function, variable, value, calculation_type, budget)
+    elif calculation_type == "Limit":
+        plot_limit(fig, function, variable, calculation["limit_point"], value, budget)
+    elif calculation_type == "Area":
+        plot_area(fig, function, variable, calculation["lower_bound"], calculation["upper_bound"], budget)
+    elif calculation_type == "Volume":
+        plot_volume(fig, function, variable, calculation["lower_bound"], calculation["upper_bound"], level)
+    elif calculation_type == "Average":
+        plot_average(fig, function, variable, calculation["lower_bound"], calculation["upper_bound"], value, budget)
+    elif calculation_type == "Surface Area":
+        plot_surface_area(fig, function, variable, calculation["lower_bound"], calculation["upper_bound"], level)
+    elif calculation_type == "Centroid / Center of Mass":
+        x_centroid, y_centroid = value
+        plot_centroid(fig, function, variable, calculation["lower_bound"], calculation["upper_bound"],
+                      x_centroid, y_centroid, budget)
+    elif calculation_type == "Partial Derivative":
+        plot_partial(fig, function, variable, value, "Partial Derivative", level, calculation["variable_2"])
+    elif calculation_type == "Gradient / Hessian":
+        gradient, hessian = value
+        plot_gradient(fig, function, calculation["variables"], gradient, hessian)
+    elif calculation_type == "Chain Rule":
+        # Graficar la función externa y su derivada
+        plot_chain_rule(fig, calculation["outer_function"], calculation["inner_function"], value, variable, budget)
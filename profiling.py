@@ -0,0 +1,189 @@
+"""
+Instrumentación
+---------------
+Temporizadores por etapa, registro estructurado y captura opcional de perfiles.
+
+Las etapas de un cálculo (parse, solve, simplify, lambdify, sample, plot,
+draw) se marcan con ``span`` o con el decorador ``timed``. Los tiempos solo se
+acumulan dentro de un bloque ``collect``; fuera de él los temporizadores no
+hacen nada. Cada etapa registra su tiempo propio, sin el de las etapas
+anidadas, de modo que la suma de todas es el tiempo total medido.
+
+``call_profiled`` ejecuta una función bajo cProfile y tracemalloc y guarda el
+perfil si tarda más de un umbral; ``append_log`` escribe un registro por
+cálculo en un archivo JSON lines.
+
+Dependencias:
+    Solo la biblioteca estándar
+"""
+
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+# Orden en que se muestran las etapas conocidas; las demás van al final
+STAGE_ORDER = ["parse", "cache", "solve", "simplify", "lambdify", "sample", "plot", "draw", "transfer"]
+
+_state = threading.local()
+
+
+def _collectors():
+    if not hasattr(_state, "collectors"):
+        _state.collectors = []
+        _state.frames = []
+    return _state.collectors
+
+
+@contextmanager
+def collect():
+    """
+    Acumula los tiempos de las etapas ejecutadas dentro del bloque en este hilo.
+
+    Los bloques pueden anidarse; al salir, los tiempos del bloque interior
+    también se suman al exterior.
+
+    Yields:
+        dict: Segundos por etapa, que se completa al salir del bloque
+    """
+    collectors = _collectors()
+    timings = {}
+    collectors.append(timings)
+    try:
+        yield timings
+    finally:
+        collectors.pop()
+        if collectors:
+            for name, seconds in timings.items():
+                collectors[-1][name] = collectors[-1].get(name, 0.0) + seconds
+
+
+@contextmanager
+def span(name):
+    """
+    Mide el bloque como la etapa ``name``.
+
+    Args:
+        name (str): Nombre de la etapa
+    """
+    collectors = _collectors()
+    if not collectors:
+        yield
+        return
+    frames = _state.frames
+    frames.append(0.0)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        nested = frames.pop()
+        if frames:
+            frames[-1] += elapsed
+        timings = collectors[-1]
+        timings[name] = timings.get(name, 0.0) + elapsed - nested
+
+
+def timed(name):
+    """
+    Decorador que mide cada llamada a la función como la etapa ``name``.
+
+    Args:
+        name (str): Nombre de la etapa
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def format_timings(timings):
+    """
+    Resume los tiempos por etapa en una línea de texto.
+
+    Args:
+        timings (dict): Segundos por etapa
+
+    Returns:
+        str: Por ejemplo ``"parse 1.2 ms · solve 230 ms · draw 41 ms"``
+    """
+    def order(name):
+        return STAGE_ORDER.index(name) if name in STAGE_ORDER else len(STAGE_ORDER)
+
+    parts = []
+    for name in sorted(timings, key=order):
+        milliseconds = timings[name] * 1000
+        parts.append(f"{name} {milliseconds:.3g} ms" if milliseconds < 1000 else f"{name} {milliseconds / 1000:.2f} s")
+    return " · ".join(parts)
+
+
+def append_log(path, record):
+    """
+    Agrega un registro al archivo JSON lines ``path``.
+
+    Se agrega la fecha y el proceso; los valores que no son serializables
+    (por ejemplo, expresiones de SymPy) se guardan como texto.
+
+    Args:
+        path (str): Archivo de registro; los directorios se crean si no existen
+        record (dict): Datos del cálculo
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    record = {"time": datetime.now(timezone.utc).isoformat(timespec="milliseconds"), "pid": os.getpid(), **record}
+    with open(path, "a", encoding="utf-8") as log_file:
+        log_file.write(json.dumps(record, default=str, ensure_ascii=False) + "\n")
+
+
+def call_profiled(profile_dir, threshold, function, /, *args, **kwargs):
+    """
+    Ejecuta ``function`` bajo cProfile y tracemalloc y guarda el perfil si es lento.
+
+    Si la llamada tarda ``threshold`` segundos o más, se guardan en
+    ``profile_dir`` el perfil de cProfile (``.prof``, legible con ``pstats`` o
+    ``snakeviz``) y la instantánea de memoria (``.tracemalloc``, legible con
+    ``tracemalloc.Snapshot.load``). Si el resultado es un diccionario, la ruta
+    del perfil se agrega en la clave ``"profile"``.
+
+    Args:
+        profile_dir (str): Directorio donde guardar los perfiles
+        threshold (float): Segundos a partir de los cuales se guarda el perfil
+        function (callable): Función a ejecutar
+        *args, **kwargs: Argumentos de la función
+
+    Returns:
+        El valor devuelto por ``function``
+    """
+    profiler = cProfile.Profile()
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        result = function(*args, **kwargs)
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - start
+        snapshot = tracemalloc.take_snapshot() if elapsed >= threshold else None
+        if not tracing:
+            tracemalloc.stop()
+        path = None
+        if snapshot is not None:
+            os.makedirs(profile_dir, exist_ok=True)
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            path = os.path.join(profile_dir, f"{stamp}-{os.getpid()}-{elapsed:.1f}s")
+            profiler.dump_stats(path + ".prof")
+            snapshot.dump(path + ".tracemalloc")
+    if path is not None and isinstance(result, dict):
+        result["profile"] = path + ".prof"
+    return result
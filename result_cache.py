@@ -0,0 +1,135 @@
+"""
+Caché de resultados
+-------------------
+Caché de dos niveles para resultados simbólicos.
+
+El primer nivel es una caché LRU en memoria de tamaño acotado. El segundo
+nivel, opcional, es una base de datos SQLite que conserva los resultados entre
+ejecuciones. Las claves son tuplas de cadenas (por ejemplo, la representación
+``srepr`` de la expresión canonizada, la variable, la operación y los límites)
+y los valores cualquier objeto serializable con ``pickle``.
+
+Dependencias:
+    - sqlite3: Para el nivel persistente (biblioteca estándar)
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+from collections import OrderedDict
+
+
+class ResultCache:
+    """
+    Caché LRU en memoria con un nivel persistente opcional en SQLite.
+
+    Args:
+        maxsize (int): Número máximo de entradas en memoria
+        path (str): Ruta de la base de datos SQLite, o None para usar solo memoria
+    """
+
+    def __init__(self, maxsize=256, path=None):
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self._connection = None
+        self._connection_pid = None
+
+    def _database(self):
+        """Devuelve la conexión a SQLite, reabriéndola si el proceso cambió (fork)."""
+        if self.path is None:
+            return None
+        if self._connection is None or self._connection_pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB)")
+            self._connection.commit()
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def _remember(self, key, value):
+        """Guarda una entrada en memoria y descarta la menos usada si se excede el tamaño."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key, default=None):
+        """
+        Busca una entrada, primero en memoria y luego en el nivel persistente.
+
+        Args:
+            key (tuple): Clave de la entrada
+            default: Valor devuelto si la entrada no existe
+
+        Returns:
+            El valor almacenado o ``default``
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+            database = self._database()
+            if database is not None:
+                row = database.execute("SELECT value FROM results WHERE key = ?", (repr(key),)).fetchone()
+                if row is not None:
+                    value = pickle.loads(row[0])
+                    self._remember(key, value)
+                    self.disk_hits += 1
+                    return value
+
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """
+        Guarda una entrada en memoria y, si está configurado, en el nivel persistente.
+
+        Args:
+            key (tuple): Clave de la entrada
+            value: Valor a almacenar
+        """
+        with self._lock:
+            self._remember(key, value)
+            database = self._database()
+            if database is not None:
+                database.execute("INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)",
+                                 (repr(key), pickle.dumps(value)))
+                database.commit()
+
+    def stats(self):
+        """
+        Devuelve los contadores de la caché.
+
+        Returns:
+            dict: ``hits``, ``disk_hits``, ``misses``, ``evictions`` y ``size``
+        """
+        with self._lock:
+            return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                    "evictions": self.evictions, "size": len(self._entries)}
+
+    def clear(self):
+        """Vacía ambos niveles de la caché y reinicia los contadores."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.disk_hits = self.misses = self.evictions = 0
+            database = self._database()
+            if database is not None:
+                database.execute("DELETE FROM results")
+                database.commit()
+
+    def close(self):
+        """Cierra la conexión con el nivel persistente."""
+        with self._lock:
+            if self._connection is not None and self._connection_pid == os.getpid():
+                self._connection.close()
+            self._connection = None
@@ -0,0 +1,152 @@
+"""
+Muestreo adaptativo
+-------------------
+Selección de puntos para graficar funciones de una variable.
+
+En lugar de una malla fija, se parte de una malla gruesa y se agregan puntos
+solo donde la curva se dobla o crece rápidamente (medido en unidades de la
+escala vertical visible). Los segmentos que siguen teniendo un salto grande
+después de refinarse al máximo se tratan como discontinuidades (polos como en
+``1/x`` o ``tan(x)``) y se separan con un NaN para que matplotlib no dibuje
+una línea vertical falsa.
+
+Dependencias:
+    - numpy: Para operaciones numéricas
+"""
+
+import numpy as np
+
+from profiling import timed
+
+# Fracción de la escala vertical que se tolera como desviación de una recta
+CURVATURE_TOLERANCE = 5e-3
+
+# Fracción de la escala vertical a partir de la cual un salto se considera discontinuidad
+JUMP_THRESHOLD = 0.25
+
+
+def _evaluate(f, x):
+    """Evalúa ``f`` y reemplaza los valores no finitos o complejos por NaN."""
+    with np.errstate(all="ignore"):
+        y = np.asarray(f(x))
+        if np.iscomplexobj(y):
+            y = np.where(np.abs(y.imag) > 0, np.nan, y.real)
+        y = np.broadcast_to(y, x.shape).astype(float)
+    y[~np.isfinite(y)] = np.nan
+    return y
+
+
+def _percentiles(x, y, low, high):
+    """
+    Calcula percentiles de ``y`` ponderados por el espaciado de ``x``.
+
+    El refinamiento concentra puntos cerca de los polos; ponderar por el
+    espaciado evita que esos puntos dominen la escala estimada.
+    """
+    finite = np.isfinite(y)
+    if finite.sum() < 2:
+        return None
+    weights = np.gradient(x)[finite]
+    values = y[finite]
+    order = np.argsort(values)
+    cumulative = np.cumsum(weights[order])
+    return np.interp([low / 100, high / 100], cumulative / cumulative[-1], values[order])
+
+
+def _scale(x, y):
+    """Estima la escala vertical visible ignorando los valores extremos de los polos."""
+    limits = _percentiles(x, y, 2, 98)
+    if limits is None:
+        return 1.0
+    low, high = limits
+    return max(high - low, 1e-12 * max(1.0, abs(high)), 1e-12)
+
+
+@timed("sample")
+def adaptive_sample(f, a, b, budget=800, initial_points=65, max_depth=12):
+    """
+    Muestrea ``f`` en ``[a, b]`` refinando donde la curvatura o la pendiente es alta.
+
+    Args:
+        f (callable): Función vectorizada de NumPy
+        a (float): Inicio del intervalo
+        b (float): Fin del intervalo
+        budget (int): Número máximo de evaluaciones de ``f``
+        initial_points (int): Puntos de la malla inicial uniforme
+        max_depth (int): Número máximo de rondas de refinamiento
+
+    Returns:
+        tuple: Arreglos ``x`` e ``y``; ``y`` contiene NaN en las discontinuidades
+        y en los puntos fuera del dominio
+    """
+    a, b = float(a), float(b)
+    x = np.linspace(a, b, min(initial_points, budget))
+    y = _evaluate(f, x)
+    remaining = budget - x.size
+    min_width = (b - a) / (x.size - 1) / 2**max_depth
+
+    for _ in range(max_depth):
+        if remaining <= 0:
+            break
+        scale = _scale(x, y)
+
+        # Desviación de cada punto interior respecto a la recta entre sus vecinos
+        bend = np.zeros(x.size)
+        t = (x[1:-1] - x[:-2]) / (x[2:] - x[:-2])
+        bend[1:-1] = np.abs(y[:-2] + t * (y[2:] - y[:-2]) - y[1:-1]) / scale
+        segment_score = np.maximum(bend[:-1], bend[1:])
+        jump = np.abs(np.diff(y)) / scale
+        # Los saltos tienen prioridad sobre la curvatura cuando el presupuesto no alcanza
+        segment_score = np.where(jump > JUMP_THRESHOLD, np.maximum(segment_score, 1e3 * jump), segment_score)
+        # Refinar también los bordes del dominio (un extremo finito y el otro no)
+        segment_score[np.isnan(y[:-1]) != np.isnan(y[1:])] = np.inf
+        segment_score = np.nan_to_num(segment_score, nan=0.0)
+        segment_score[np.diff(x) <= min_width] = 0.0
+
+        candidates = np.flatnonzero(segment_score > CURVATURE_TOLERANCE)
+        if candidates.size == 0:
+            break
+        if candidates.size > remaining:
+            candidates = candidates[np.argsort(segment_score[candidates])[::-1][:remaining]]
+            candidates.sort()
+
+        new_x = (x[candidates] + x[candidates + 1]) / 2
+        new_y = _evaluate(f, new_x)
+        remaining -= new_x.size
+        x = np.insert(x, candidates + 1, new_x)
+        y = np.insert(y, candidates + 1, new_y)
+
+    # Separar los saltos que no se resolvieron al refinar: son discontinuidades
+    # (o saltos con cambio de signo entre valores fuera de la escala visible, como en los polos)
+    scale = _scale(x, y)
+    jump = np.abs(np.diff(y))
+    neighbors = np.maximum(np.concatenate([[0.0], jump[:-1]]), np.concatenate([jump[1:], [0.0]]))
+    unresolved = (np.diff(x) <= 4 * min_width) & (jump > 2 * np.nan_to_num(neighbors))
+    pole = (y[:-1] * y[1:] < 0) & (np.minimum(np.abs(y[:-1]), np.abs(y[1:])) > scale)
+    jumps = np.flatnonzero((jump / scale > JUMP_THRESHOLD) & (unresolved | pole))
+    if jumps.size:
+        x = np.insert(x, jumps + 1, (x[jumps] + x[jumps + 1]) / 2)
+        y = np.insert(y, jumps + 1, np.nan)
+    return x, y
+
+
+def view_limits(x, y, margin=0.1):
+    """
+    Calcula límites verticales que muestran la curva sin que los polos aplasten la vista.
+
+    Args:
+        x (numpy.ndarray): Puntos muestreados
+        y (numpy.ndarray): Valores muestreados
+        margin (float): Margen relativo agregado arriba y abajo
+
+    Returns:
+        tuple: Límites ``(inferior, superior)``, o None si no hace falta recortar
+    """
+    limits = _percentiles(x, y, 1, 99)
+    if limits is None:
+        return None
+    low, high = limits
+    span = max(high - low, 1e-12)
+    if np.nanmin(y) >= low - span and np.nanmax(y) <= high + span:
+        return None
+    return low - margin * span, high + margin * span
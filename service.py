@@ -0,0 +1,408 @@
+"""
+Servicio HTTP
+-------------
+Expone los cálculos de ``calculator_core`` como un servicio HTTP/JSON local.
+
+Cada cálculo se ejecuta en un ``CalculationWorker`` de un grupo de tamaño
+fijo, con un tiempo máximo por solicitud (al agotarse, el proceso se termina
+y se recrea). Las solicitudes idénticas que llegan mientras otra igual está
+en curso esperan ese mismo cálculo en lugar de ocupar otro proceso. Si ya
+hay demasiados cálculos distintos pendientes, el servicio responde 503 en
+lugar de encolar sin límite.
+
+Los procesos de cálculo no son demonio, para que los intentos simbólicos con
+plazo se ejecuten en procesos que pueden terminarse (ver
+``calculation_worker.call_within``) y no en hilos abandonados.
+
+Rutas:
+    - ``GET /types``: tipos de cálculo disponibles
+    - ``POST /calculate``: cuerpo JSON con los argumentos de ``compute``
+      (y opcionalmente ``timeout`` en segundos); responde JSON
+    - ``POST /plot``: igual que ``/calculate``, pero responde el gráfico en PNG
+      (dibujado fuera de pantalla con Agg); acepta ``width``, ``height`` y ``dpi``
+    - ``GET /metrics``: ocupación del grupo, profundidad de la cola y contadores
+    - ``GET /health``: responde ``{"status": "ok"}``
+
+Uso:
+    python service.py --port 8765 --workers 4 --max-pending 16 --timeout 30
+
+    curl -X POST localhost:8765/calculate -d '{"calculation_type": "Area", "function": "x**2", "lower_bound": "0", "upper_bound": "1"}'
+"""
+
+import argparse
+import io
+import json
+import math
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from calculation_types import CALCULATION_TYPES
+from calculation_worker import CalculationWorker
+
+# Segundos máximos de un cálculo cuando la solicitud no indica otro
+DEFAULT_TIMEOUT = 30.0
+
+# Segundos mínimos que puede pedir una solicitud; menos solo terminaría procesos sin calcular nada
+MIN_TIMEOUT = 0.1
+
+# Tamaño por defecto de los gráficos PNG, en pulgadas y puntos por pulgada
+DEFAULT_PLOT_SIZE = (8.0, 6.0)
+DEFAULT_DPI = 100
+
+# Límites de los gráficos PNG: pulgadas por lado, puntos por pulgada y píxeles en total
+MAX_PLOT_INCHES = 50.0
+MAX_DPI = 1000
+MAX_PLOT_PIXELS = 4096 * 4096
+
+# Argumentos de compute aceptados en el cuerpo de las solicitudes
+COMPUTE_FIELDS = ["calculation_type", "function", "variable", "lower_bound", "upper_bound", "limit_point",
+                  "variable_2", "outer_function", "inner_function", "simplify", "termwise", "hessian"]
+
+
+def run_request(job, plot=None):
+    """
+    Ejecuta un cálculo en el proceso de cálculo y lo convierte en un registro serializable.
+
+    Args:
+        job (dict): Argumentos de ``calculator_core.compute``
+        plot (tuple): ``(ancho, alto, dpi)`` para dibujar el resultado en PNG, o None
+
+    Returns:
+        dict: Registro con ``calculation_type``, ``result``, ``text`` y
+        ``timings``; si se pidió el gráfico, también ``png`` (bytes)
+    """
+    from calculator_core import compute
+
+    calculation = compute(**job)
+    record = {"calculation_type": calculation["calculation_type"], "result": str(calculation["value"]),
+              "text": calculation["text"], "timings": calculation["timings"]}
+    if plot is not None:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        from plots import plot_calculation
+
+        width, height, dpi = plot
+        figure = Figure(figsize=(width, height), dpi=dpi)
+        canvas = FigureCanvasAgg(figure)
+        plot_calculation(figure, calculation)
+        image = io.BytesIO()
+        canvas.print_png(image)
+        record["png"] = image.getvalue()
+    return record
+
+
+class ServiceBusy(Exception):
+    """Hay demasiados cálculos pendientes para aceptar otro."""
+
+
+class CalculationTimeout(Exception):
+    """El cálculo no terminó dentro del tiempo máximo."""
+
+
+class CalculationFailed(Exception):
+    """El cálculo terminó con un error (por ejemplo, una expresión inválida)."""
+
+
+class CalculationService:
+    """
+    Grupo de procesos de cálculo con cola acotada y agrupación de solicitudes idénticas.
+
+    Args:
+        workers (int): Número de procesos de cálculo
+        max_pending (int): Cálculos distintos admitidos a la vez (en ejecución
+            más en espera); por encima de este número se lanza ``ServiceBusy``
+        timeout (float): Segundos máximos por cálculo cuando no se indica otro
+        max_timeout (float): Límite superior de los tiempos pedidos por las solicitudes
+    """
+
+    def __init__(self, workers=2, max_pending=None, timeout=DEFAULT_TIMEOUT, max_timeout=None):
+        self.timeout = timeout
+        self.max_timeout = max_timeout if max_timeout is not None else 10 * timeout
+        self.max_pending = max_pending if max_pending is not None else 4 * workers
+        self._workers = [CalculationWorker(preload=("calculator_core",), daemon=False) for _ in range(workers)]
+        self._idle = queue.Queue()
+        for worker in self._workers:
+            self._idle.put(worker)
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self._started = time.monotonic()
+        self.counters = {"requests": 0, "coalesced": 0, "rejected": 0, "completed": 0, "failed": 0,
+                         "timeouts": 0}
+        self._busy = 0
+        self._max_queue_depth = 0
+        self._latency = {"count": 0, "sum": 0.0, "max": 0.0}
+
+    def start(self):
+        """Inicia todos los procesos de cálculo."""
+        for worker in self._workers:
+            worker.start()
+
+    def close(self):
+        """Detiene todos los procesos de cálculo."""
+        for worker in self._workers:
+            worker.close()
+
+    def submit(self, job, plot=None, timeout=None):
+        """
+        Ejecuta un cálculo, o espera el de una solicitud idéntica que ya esté en curso.
+
+        Args:
+            job (dict): Argumentos de ``calculator_core.compute``
+            plot (tuple): ``(ancho, alto, dpi)`` para dibujar el resultado, o None
+            timeout (float): Segundos máximos, incluida la espera de un proceso libre o
+                de una solicitud idéntica en curso
+
+        Returns:
+            dict: Registro devuelto por ``run_request``
+
+        Raises:
+            ServiceBusy: Si hay ``max_pending`` cálculos distintos pendientes
+            CalculationTimeout: Si el cálculo no terminó a tiempo
+            CalculationFailed: Si el cálculo terminó con un error
+        """
+        timeout = min(self.timeout if timeout is None else float(timeout), self.max_timeout)
+        key = json.dumps([job, plot], sort_keys=True)
+        leader = False
+        with self._lock:
+            self.counters["requests"] += 1
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.counters["coalesced"] += 1
+            elif len(self._in_flight) >= self.max_pending:
+                self.counters["rejected"] += 1
+                raise ServiceBusy(f"{len(self._in_flight)} cálculos pendientes")
+            else:
+                future = Future()
+                self._in_flight[key] = future
+                leader = True
+            waiting = len(self._in_flight) - self._busy
+            self._max_queue_depth = max(self._max_queue_depth, waiting)
+        if not leader:
+            # Se espera con el tiempo máximo propio, no con el de la solicitud que calcula
+            try:
+                return future.result(timeout)
+            except FutureTimeout:
+                self._count("timeouts")
+                raise CalculationTimeout(f"El cálculo superó el tiempo máximo de {timeout:g} s") from None
+
+        start = time.monotonic()
+        try:
+            future.set_result(self._run(job, plot, timeout))
+        except Exception as error:
+            future.set_exception(error)
+        finally:
+            elapsed = time.monotonic() - start
+            with self._lock:
+                del self._in_flight[key]
+                self._latency["count"] += 1
+                self._latency["sum"] += elapsed
+                self._latency["max"] = max(self._latency["max"], elapsed)
+        return future.result()
+
+    def _run(self, job, plot, timeout):
+        """Ejecuta el cálculo en el primer proceso libre."""
+        deadline = time.monotonic() + timeout
+        try:
+            worker = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            self._count("timeouts")
+            raise CalculationTimeout(f"No hubo un proceso libre en {timeout:g} s") from None
+        with self._lock:
+            self._busy += 1
+        try:
+            worker.submit(run_request, job, plot)
+            outcome = worker.wait(max(0.0, deadline - time.monotonic()))
+            if outcome is None:
+                # Terminar el proceso es la única forma de detener SymPy; se recrea en el próximo envío
+                worker.cancel()
+                self._count("timeouts")
+                raise CalculationTimeout(f"El cálculo superó el tiempo máximo de {timeout:g} s")
+        finally:
+            with self._lock:
+                self._busy -= 1
+            self._idle.put(worker)
+        ok, payload = outcome
+        if not ok:
+            self._count("failed")
+            raise CalculationFailed(payload)
+        self._count("completed")
+        return payload
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def metrics(self):
+        """
+        Devuelve el estado del grupo y los contadores acumulados.
+
+        Returns:
+            dict: ``workers``, ``busy``, ``pending`` (cálculos distintos en
+            curso o en espera), ``queue_depth`` (en espera de un proceso),
+            ``max_queue_depth``, ``max_pending``, los contadores de solicitudes
+            y la latencia de los cálculos (``count``, ``sum`` y ``max`` en segundos)
+        """
+        with self._lock:
+            pending = len(self._in_flight)
+            return {"workers": len(self._workers), "busy": self._busy, "pending": pending,
+                    "queue_depth": max(0, pending - self._busy), "max_queue_depth": self._max_queue_depth,
+                    "max_pending": self.max_pending, "uptime": time.monotonic() - self._started,
+                    **self.counters, "latency": dict(self._latency)}
+
+
+def _number(request, name, default, minimum=0.0, inclusive=True, maximum=math.inf):
+    """
+    Lee una opción numérica de la solicitud.
+
+    Raises:
+        ValueError: Si no es un número finito mayor que ``minimum`` (o igual,
+            con ``inclusive``) y menor o igual que ``maximum``
+    """
+    value = request.get(name, default)
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value) \
+            or value < minimum or (value == minimum and not inclusive):
+        comparison = ">=" if inclusive else ">"
+        raise ValueError(f"{name} debe ser un número finito {comparison} {minimum:g}.")
+    if value > maximum:
+        raise ValueError(f"{name} debe ser <= {maximum:g}.")
+    return value
+
+
+def _job_from_body(body):
+    """
+    Separa los argumentos de ``compute`` de las opciones de la solicitud.
+
+    Raises:
+        ValueError: Si el cuerpo no es un objeto JSON válido, alguna opción
+            (``timeout``, ``width``, ``height``, ``dpi``) no es un número válido
+            o el gráfico supera ``MAX_PLOT_PIXELS``
+    """
+    request = json.loads(body or b"{}")
+    if not isinstance(request, dict):
+        raise ValueError("El cuerpo debe ser un objeto JSON.")
+    unknown = set(request) - set(COMPUTE_FIELDS) - {"timeout", "width", "height", "dpi"}
+    if unknown:
+        raise ValueError(f"Campos desconocidos: {', '.join(sorted(unknown))}")
+    if request.get("calculation_type") not in CALCULATION_TYPES:
+        raise ValueError(f"Tipo de cálculo desconocido: {request.get('calculation_type')}")
+    job = {name: request[name] for name in COMPUTE_FIELDS if name in request}
+    plot = (float(_number(request, "width", DEFAULT_PLOT_SIZE[0], inclusive=False, maximum=MAX_PLOT_INCHES)),
+            float(_number(request, "height", DEFAULT_PLOT_SIZE[1], inclusive=False, maximum=MAX_PLOT_INCHES)),
+            int(_number(request, "dpi", DEFAULT_DPI, minimum=1, maximum=MAX_DPI)))
+    width, height, dpi = plot
+    if width * dpi * height * dpi > MAX_PLOT_PIXELS:
+        raise ValueError(f"El gráfico tendría {width * dpi:.0f} x {height * dpi:.0f} píxeles; "
+                         f"el máximo es {MAX_PLOT_PIXELS} en total.")
+    timeout = _number(request, "timeout", None, minimum=MIN_TIMEOUT)
+    return job, plot, None if timeout is None else float(timeout)
+
+
+class CalculatorHandler(BaseHTTPRequestHandler):
+    """Atiende las rutas del servicio; ``server.service`` es el ``CalculationService``."""
+
+    server_version = "Calculator/1.0"
+
+    def _send(self, status, body, content_type="application/json", headers=()):
+        if content_type == "application/json":
+            body = json.dumps(body, default=str, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/types":
+            self._send(HTTPStatus.OK, CALCULATION_TYPES)
+        elif self.path == "/metrics":
+            self._send(HTTPStatus.OK, self.server.service.metrics())
+        elif self.path == "/health":
+            self._send(HTTPStatus.OK, {"status": "ok"})
+        else:
+            self._send(HTTPStatus.NOT_FOUND, {"error": f"Ruta desconocida: {self.path}"})
+
+    def do_POST(self):
+        if self.path not in ("/calculate", "/plot"):
+            self._send(HTTPStatus.NOT_FOUND, {"error": f"Ruta desconocida: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            job, plot, timeout = _job_from_body(self.rfile.read(length))
+        except ValueError as error:
+            self._send(HTTPStatus.BAD_REQUEST, {"error": str(error)})
+            return
+
+        plotting = self.path == "/plot"
+        try:
+            record = self.server.service.submit(job, plot if plotting else None, timeout)
+        except ServiceBusy as error:
+            self._send(HTTPStatus.SERVICE_UNAVAILABLE, {"error": f"Servicio ocupado: {error}"},
+                       headers=[("Retry-After", "1")])
+        except CalculationTimeout as error:
+            self._send(HTTPStatus.GATEWAY_TIMEOUT, {"error": str(error)})
+        except CalculationFailed as error:
+            self._send(HTTPStatus.UNPROCESSABLE_ENTITY, {"error": str(error)})
+        else:
+            if plotting:
+                self._send(HTTPStatus.OK, record["png"], content_type="image/png")
+            else:
+                self._send(HTTPStatus.OK, record)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+def serve(host="127.0.0.1", port=8765, workers=2, max_pending=None, timeout=DEFAULT_TIMEOUT, quiet=False):
+    """
+    Atiende solicitudes hasta recibir Ctrl+C.
+
+    Args:
+        host (str): Dirección donde escuchar
+        port (int): Puerto donde escuchar
+        workers (int): Número de procesos de cálculo
+        max_pending (int): Cálculos distintos admitidos a la vez (ver ``CalculationService``)
+        timeout (float): Segundos máximos por cálculo cuando la solicitud no indica otro
+        quiet (bool): Si es True, no se registra cada solicitud en la salida de errores
+    """
+    service = CalculationService(workers, max_pending, timeout)
+    service.start()
+    server = ThreadingHTTPServer((host, port), CalculatorHandler)
+    server.daemon_threads = True
+    server.service = service
+    server.quiet = quiet
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Expone los cálculos como un servicio HTTP/JSON local.")
+    parser.add_argument("--host", default="127.0.0.1", help="Dirección donde escuchar")
+    parser.add_argument("--port", type=int, default=8765, help="Puerto donde escuchar")
+    parser.add_argument("-w", "--workers", type=int, default=2, help="Número de procesos de cálculo")
+    parser.add_argument("--max-pending", type=int, default=None,
+                        help="Cálculos distintos admitidos a la vez (por defecto, 4 por proceso)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help="Segundos máximos por cálculo cuando la solicitud no indica otro")
+    parser.add_argument("--quiet", action="store_true", help="No registrar cada solicitud")
+    args = parser.parse_args(argv)
+    serve(args.host, args.port, args.workers, args.max_pending, args.timeout, args.quiet)
+
+
+if __name__ == "__main__":
+    main()
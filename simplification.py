@@ -0,0 +1,115 @@
+"""
+Simplificación
+--------------
+Políticas de simplificación de los resultados simbólicos.
+
+``sp.simplify`` prueba muchas estrategias y en antiderivadas grandes puede
+tardar mucho más que la integración. Las políticas disponibles son:
+
+    - "none": el resultado se devuelve tal como lo produce SymPy
+    - "cheap": solo ``together``, ``cancel`` y ``trigsimp``; se conserva la forma más corta
+    - "full": ``sp.simplify`` sin límites
+    - "budget": ``sp.simplify`` si la expresión no es demasiado grande y termina
+      antes de ``SIMPLIFY_DEADLINE`` segundos; en caso contrario, "cheap"
+
+Los resultados se memorizan por expresión y política, de modo que un proceso
+dedicado a simplificar en segundo plano no repite el trabajo.
+
+Dependencias:
+    - sympy: Para cálculos simbólicos
+"""
+
+from functools import lru_cache
+
+import sympy as sp
+from sympy.functions.elementary.hyperbolic import HyperbolicFunction
+from sympy.functions.elementary.trigonometric import TrigonometricFunction
+
+from calculation_worker import call_within
+from profiling import span
+
+# Políticas aceptadas por simplify_expression
+SIMPLIFY_POLICIES = ["none", "cheap", "full", "budget"]
+
+# Política usada cuando no se indica otra
+DEFAULT_POLICY = "budget"
+
+# Segundos máximos de sp.simplify con la política "budget"
+SIMPLIFY_DEADLINE = 2.0
+
+# Número máximo de operaciones de una expresión para intentar sp.simplify con la política "budget"
+MAX_SIMPLIFY_OPS = 400
+
+
+def cheap_simplify(expression):
+    """
+    Aplica solo transformaciones rápidas y devuelve la forma con menos operaciones.
+
+    Args:
+        expression (sympy.Expr): Expresión a simplificar
+
+    Returns:
+        sympy.Expr: Expresión equivalente
+    """
+    candidates = [expression, sp.together(expression)]
+    if not expression.has(sp.Piecewise):
+        candidates.append(sp.cancel(expression))
+    if expression.has(TrigonometricFunction, HyperbolicFunction):
+        candidates.append(sp.trigsimp(expression))
+    return min(candidates, key=sp.count_ops)
+
+
+def _simplify_within(expression, deadline):
+    """
+    Ejecuta ``sp.simplify`` en un proceso de reserva y lo termina si no responde a tiempo.
+
+    Returns:
+        sympy.Expr: Resultado de ``sp.simplify``, o None si no terminó o falló
+    """
+    outcome = call_within(deadline, sp.simplify, expression)
+    if outcome is None or not outcome[0]:
+        return None
+    return outcome[1]
+
+
+@lru_cache(maxsize=256)
+def _simplify(expression, policy, deadline):
+    if policy == "none":
+        return expression
+    if policy == "cheap":
+        return cheap_simplify(expression)
+    if policy == "full":
+        return sp.simplify(expression)
+    if sp.count_ops(expression) <= MAX_SIMPLIFY_OPS:
+        simplified = _simplify_within(expression, deadline)
+        if simplified is not None:
+            return simplified
+    return cheap_simplify(expression)
+
+
+def simplify_expression(expression, policy=DEFAULT_POLICY, deadline=SIMPLIFY_DEADLINE):
+    """
+    Simplifica una expresión según la política indicada.
+
+    Args:
+        expression (sympy.Expr): Expresión a simplificar
+        policy (str): Uno de los valores de ``SIMPLIFY_POLICIES``
+        deadline (float): Segundos máximos de ``sp.simplify`` con la política "budget"
+
+    Returns:
+        sympy.Expr: Expresión equivalente
+
+    Raises:
+        ValueError: Si la política no existe
+    """
+    if policy not in SIMPLIFY_POLICIES:
+        raise ValueError(f"Política de simplificación desconocida: {policy}")
+    if policy == "none":
+        return expression
+    with span("simplify"):
+        return _simplify(expression, policy, deadline)
+
+
+def clear_simplified():
+    """Descarta las simplificaciones memorizadas."""
+    _simplify.cache_clear()
@@ -15,12 +15,63 @@ Dependencias:
     - matplotlib: Para visualización de gráficos
 """
 
+import time
+
+# Inicio del programa, para medir el tiempo de arranque (ver --startup-timing)
+PROGRAM_START = time.perf_counter()
+
+import argparse
+import base64
+import importlib
+import math
+import os
+import sqlite3
+import sys
+import threading
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import ttk
-import sympy as sp
-import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+# Solo módulos livianos: SymPy, NumPy y matplotlib se importan en segundo plano (ver warm_up)
+from calculation_types import CALCULATION_TYPES, BOUNDED_TYPES
+from calculation_worker import CalculationWorker
+from profiling import append_log, call_profiled, collect, format_timings, span
+
+# Intervalos del ciclo de eventos para consultar el proceso de cálculo y animar el progreso
+POLL_INTERVAL_MS = 50
+PROGRESS_INTERVAL_MS = 20
+
+# Intervalo para consultar la búsqueda en el historial al pulsar Calculate (suele tardar milisegundos)
+LOOKUP_INTERVAL_MS = 5
+
+# Límites del presupuesto de puntos por curva (ver plot_budget)
+MIN_PLOT_POINTS = 200
+MAX_PLOT_POINTS = 4000
+
+# Espera tras soltar un gráfico 3D antes de dibujar la malla fina
+REFINE_DELAY_MS = 300
+
+# Registro de tiempos por cálculo y umbral por defecto de la captura de perfiles
+DEFAULT_LOG_PATH = os.path.join(os.path.expanduser("~"), ".calculator", "timings.jsonl")
+DEFAULT_PROFILE_THRESHOLD = 2.0
+
+# Política con la que se simplifican en segundo plano los resultados (ver simplification.py)
+BACKGROUND_POLICY = "budget"
+
+# Espera tras la última tecla antes de validar las entradas (ver on_input_changed)
+PARSE_DELAY_MS = 400
+
+# Segundos máximos de un cálculo especulativo; solo entonces se termina el proceso de cálculo
+SPECULATION_LIMIT = 10.0
+
+# Historial de cálculos (ver history.py), entradas precargadas al iniciar y entradas listadas en la búsqueda
+DEFAULT_HISTORY_PATH = os.path.join(os.path.expanduser("~"), ".calculator", "history.sqlite")
+WARM_START_ENTRIES = 20
+HISTORY_SEARCH_LIMIT = 200
+
+# Módulos pesados que se importan en segundo plano tras mostrar la ventana, en este orden
+WARM_UP_MODULES = ["numpy", "sympy", "matplotlib", "matplotlib.figure",
+                   "matplotlib.backends.backend_tkagg", "calculator_core", "plots"]
 
 def calculate():
     """
@@ -28,430 +79,991 @@ def calculate():
     
     Procesa la función matemática ingresada según el tipo de cálculo seleccionado
     (integral, derivada, límite, área, volumen o promedio) y muestra tanto el
-    resultado numérico como su representación gráfica.
+    resultado numérico como su representación gráfica. El cálculo en sí se
+    delega a ``calculator_core.compute`` en un proceso separado para que la
+    ventana siga respondiendo; el resultado se recoge con ``check_calculation``.
+    Con ``--profile-dir`` el cálculo se ejecuta bajo ``profiling.call_profiled``.
+    Con ``--simplify background`` (por defecto) el resultado llega sin
+    simplificar y se simplifica después en otro proceso (ver ``start_simplification``).
+    Si el cálculo especulativo de las mismas entradas sigue en curso (ver
+    ``speculate``), se adopta en lugar de empezar de nuevo; si ya terminó, su
+    resultado está en la caché del proceso de cálculo. Si sigue en curso uno
+    de otras entradas, el cálculo espera a que termine (ver
+    ``check_speculation``): terminar el proceso descartaría sus módulos ya
+    importados y sus cachés. Si las entradas ya están
+    en el historial (ver ``history.py``) con un resultado exacto, el resultado
+    se recupera de ahí sin calcular de nuevo; la búsqueda interpreta las
+    entradas, así que se hace en un hilo secundario (ver ``lookup_history``).
     """
-    calculation_type = calculation_var.get()
-    function = input_function.get()
-    variable = sp.symbols(input_variable.get())
-
-    if calculation_type == "Integral":
-        integral = sp.integrate(function, variable)
-        simplified_result = sp.simplify(integral)
-        result.set(f"Integral: {simplified_result}")
-        plot_function_and_result(function, variable, simplified_result, "Integral")
-    elif calculation_type == "Derivative":
-        derivative = sp.diff(function, variable)
-        simplified_result = sp.simplify(derivative)
-        result.set(f"Derivative: {simplified_result}")
-        plot_function_and_result(function, variable, simplified_result, "Derivative")
-    elif calculation_type == "Limit":
-        limit_point = sp.sympify(input_limit_point.get())
-        limit = sp.limit(function, variable, limit_point)
-        result.set(f"Limit: {limit}")
-        plot_limit(function, variable, limit_point, limit)
-    elif calculation_type == "Area":
-        lower_bound = sp.sympify(input_lower_bound.get())
-        upper_bound = sp.sympify(input_upper_bound.get())
-        area = sp.integrate(function, (variable, lower_bound, upper_bound))
-        result.set(f"Area: {area}")
-        plot_area(function, variable, lower_bound, upper_bound)
-    elif calculation_type == "Volume":
-        lower_bound = sp.sympify(input_lower_bound.get())
-        upper_bound = sp.sympify(input_upper_bound.get())
-        function_sympy = sp.sympify(function)
-        volume = sp.pi * sp.integrate(function_sympy**2, (variable, lower_bound, upper_bound))
-        result.set(f"Volume: {volume}")
-        plot_volume(function, variable, lower_bound, upper_bound)
-    elif calculation_type == "Average":
-        lower_bound = sp.sympify(input_lower_bound.get())
-        upper_bound = sp.sympify(input_upper_bound.get())
-        average_value = (1 / (upper_bound - lower_bound)) * sp.integrate(function, (variable, lower_bound, upper_bound))
-        result.set(f"Average: {average_value}")
-        plot_average(function, variable, lower_bound, upper_bound, average_value)
-    elif calculation_type == "Surface Area":
-        lower_bound = sp.sympify(input_lower_bound.get())
-        upper_bound = sp.sympify(input_upper_bound.get())
-        function_sympy = sp.sympify(function)
-        area_of_revolution = 2 * sp.pi * sp.integrate(function_sympy, (variable, lower_bound, upper_bound))
-        result.set(f"Area of Revolution: {area_of_revolution}")
-        plot_surface_area(function, variable, lower_bound, upper_bound)
-    elif calculation_type == "Centroid / Center of Mass":
-        lower_bound = sp.sympify(input_lower_bound.get())
-        upper_bound = sp.sympify(input_upper_bound.get())
-        density = 1  # Densidad por defecto = 1
-
-        # Coordenadas del centroide
-        x_centroid = sp.integrate(variable * density * sp.sympify(function), (variable, lower_bound, upper_bound)) / sp.integrate(density * sp.sympify(function), (variable, lower_bound, upper_bound))
-        y_centroid = sp.integrate(density * sp.sympify(function)**2, (variable, lower_bound, upper_bound)) / (2 * sp.integrate(density * sp.sympify(function), (variable, lower_bound, upper_bound)))
-
-        result.set(f"Centroid: (x̄ = {x_centroid}, ȳ = {y_centroid})")
-        plot_centroid(function, variable, lower_bound, upper_bound, x_centroid, y_centroid)
-        
-    elif calculation_type == "Partial Derivative":
-        variable_2 = sp.symbols(input_variable_2.get())
-        partial_derivative = sp.diff(function, variable_2)
-        simplified_result = sp.simplify(partial_derivative)
-        result.set(f"Partial Derivative with respect to {input_variable_2.get()}: {simplified_result}")
-        plot_partial(function, variable, simplified_result, "Partial Derivative")
+    global current_request, history_lookup
+
+    try:
+        time_limit = float(input_time_limit.get())
+    except ValueError:
+        result.set("Error: El límite de tiempo debe ser un número de segundos.")
+        return
+
+    request = current_inputs()
+    if simplify_worker.busy:
+        # La simplificación del resultado anterior ya no se mostrará
+        simplify_worker.cancel()
+
+    # El cálculo pedido anterior ya no se mostrará, ni se guardaría con las entradas correctas
+    stop_calculation()
+    current_request = {"inputs": request, "started": time.perf_counter(), "history_key": None}
+    result.set("Calculating...")
+    progress_bar.start(PROGRESS_INTERVAL_MS)
+    cancel_button.state(["!disabled"])
+    if history is None or options.profile_dir:
+        # Con --profile-dir hay que ejecutar el cálculo
+        start_calculation(request, time_limit)
+        return
+    history_lookup = parser_pool.submit(lookup_history, request)
+    window.after(LOOKUP_INTERVAL_MS, check_history_lookup, history_lookup, request, time_limit)
+
+
+def check_history_lookup(future, request, time_limit):
+    """
+    Muestra el resultado encontrado en el historial o, si no hay, empieza el cálculo.
 
+    Args:
+        future (concurrent.futures.Future): Búsqueda enviada por ``calculate``
+        request (dict): Argumentos del cálculo
+        time_limit (float): Segundos máximos permitidos para el cálculo
+    """
+    global history_lookup
+    if future is not history_lookup:
+        # Cancelada o reemplazada por otra pulsación de Calculate
+        return
+    if not future.done():
+        window.after(LOOKUP_INTERVAL_MS, check_history_lookup, future, request, time_limit)
+        return
+    history_lookup = None
+    entry, timings = future.result()
+    if entry is None:
+        start_calculation(request, time_limit)
+        return
+    finish_calculation()
+    current_request["history_key"] = entry["key"]
+    show_recalled(entry, timings)
+
+
+def start_calculation(request, time_limit):
+    """
+    Empieza el cálculo pedido, adoptando o esperando al cálculo especulativo en curso.
 
-    elif calculation_type == "Chain Rule":
-        outer_function = input_outer_function.get()
-        inner_function = input_inner_function.get()
-        variable_name = input_variable.get()
+    Args:
+        request (dict): Argumentos del cálculo
+        time_limit (float): Segundos máximos permitidos para el cálculo
+    """
+    global speculation, pending_speculation, queued_calculation
+    pending_speculation = None
+    if speculation is not None and worker.current_job == speculation["job_id"]:
+        if speculation["request"] == request:
+            speculation = None
+            window.after(POLL_INTERVAL_MS, check_calculation, worker.current_job, time_limit)
+        else:
+            queued_calculation = (request, time_limit)
+        return
+    speculation = None
+    submit_calculation(request, time_limit)
+
+
+def submit_calculation(request, time_limit):
+    """
+    Envía el cálculo pedido al proceso de cálculo y empieza a consultarlo.
 
-        # Validación de entradas
-        if not outer_function or not inner_function or not variable_name:
-            result.set("Error: Debe ingresar ambas funciones (externa e interna) y la variable.")
-            return
+    Args:
+        request (dict): Argumentos de ``calculator_core.compute``
+        time_limit (float): Segundos máximos permitidos para el cálculo
+    """
+    from calculator_core import compute
 
-        # Definir la variable simbólica
-        x = sp.symbols(variable_name)
+    if options.profile_dir:
+        job_id = worker.submit(call_profiled, options.profile_dir, options.profile_threshold, compute, **request)
+    else:
+        job_id = worker.submit(compute, **request)
+    window.after(POLL_INTERVAL_MS, check_calculation, job_id, time_limit)
 
-        # Derivada de la función interna
-        inner_derivative = sp.diff(inner_function, x)
-        
-        # Derivada de la función externa
-        outer_function_sympy = sp.sympify(outer_function.replace('u', f'({inner_function})'))
-        outer_derivative = sp.diff(outer_function_sympy, x)
-        
-        # Aplicar la regla de la cadena
-        chain_rule_result = outer_derivative.subs(x, inner_function) * inner_derivative
 
-        # Mostrar resultado en la interfaz
-        result.set(f"Chain Rule Result: {chain_rule_result}")
+def current_inputs():
+    """
+    Reúne las entradas de la interfaz como argumentos de ``calculator_core.compute``.
 
-        # Graficar la función externa y su derivada
-        plot_chain_rule(outer_function, inner_function, chain_rule_result, x)
+    Returns:
+        dict: Argumentos del cálculo
+    """
+    return {"calculation_type": calculation_var.get(), "function": input_function.get(),
+            "variable": input_variable.get(), "lower_bound": input_lower_bound.get(),
+            "upper_bound": input_upper_bound.get(), "limit_point": input_limit_point.get(),
+            "variable_2": input_variable_2.get(), "outer_function": input_outer_function.get(),
+            "inner_function": input_inner_function.get(), "hessian": input_hessian.get(),
+            "simplify": "none" if options.simplify == "background" else options.simplify,
+            "termwise": options.termwise}
 
 
-def plot_function_and_result(function, variable, result, plot_type):
+def on_input_changed(*args):
     """
-    Genera gráficos comparativos de la función original y su resultado.
+    Programa la validación de las entradas cuando el usuario deja de escribir.
 
     Args:
-        function (str): Función matemática original
-        variable (sympy.Symbol): Variable de la función
-        result (sympy.Expr): Resultado del cálculo
-        plot_type (str): Tipo de operación realizada
+        *args: Argumentos variables (no utilizados pero requeridos por el trace)
     """
-    function_sympy = sp.sympify(function)
-    result_sympy = sp.sympify(result)
+    global parse_job
+    if filling_inputs:
+        # La propia interfaz escribe los campos (ver update_bounds)
+        return
+    if parse_job is not None:
+        window.after_cancel(parse_job)
+    parse_job = window.after(PARSE_DELAY_MS, start_validation)
 
-    # Convertir expresiones simbólicas a funciones numéricas
-    f = sp.lambdify(variable, function_sympy, modules=['numpy'])
-    g = sp.lambdify(variable, result_sympy, modules=['numpy'])
 
-    # Generar valores para el eje x
-    x_vals = np.linspace(-10, 10, 400)
-    y_vals_function = f(x_vals)
-    y_vals_result = g(x_vals)
+def prepare_inputs(request):
+    """
+    Interpreta las entradas y compila el evaluador de la función (en un hilo secundario).
 
-    # Crear subplots
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(8, 10))
-    ax1.plot(x_vals, y_vals_function, label=f'Function: {function}')
-    ax1.legend()
-    ax1.set_xlabel(str(variable))
-    ax1.set_ylabel('y')
-    ax1.set_title('Original Function')
-    ax1.grid(True)
+    No toca ningún widget; ``check_validation`` recoge el resultado desde el ciclo de eventos.
 
-    ax2.plot(x_vals, y_vals_result, label=f'{plot_type}: {result}', color='r')
-    ax2.legend()
-    ax2.set_xlabel(str(variable))
-    ax2.set_ylabel('y')
-    ax2.set_title(f'{plot_type} of Function')
-    ax2.grid(True)
+    Args:
+        request (dict): Argumentos del cálculo
 
-    update_graph(fig)
-    
-def plot_partial(function, variable, result, plot_type):
-        """
-        Genera gráficos comparativos de la función original y su resultado.
+    Returns:
+        str: Clave de las entradas en el historial (ver ``history.history_key``)
 
-        Args:
-            function (str): Función matemática original
-            variable (sympy.Symbol): Variable de la función
-            result (sympy.Expr): Resultado del cálculo
-            plot_type (str): Tipo de operación realizada
-        """
-        function_sympy = sp.sympify(function)
-        result_sympy = sp.sympify(result)
+    Raises:
+        ValueError: Si alguna entrada no es válida
+    """
+    from calculator_core import validate_inputs
+    from evaluators import get_evaluator
+    from history import history_key
+
+    inputs = validate_inputs(**request)
+    function = inputs.get("function")
+    if function is not None and "variable" in inputs and function.free_symbols <= {inputs["variable"]}:
+        try:
+            # Los gráficos toman el evaluador de la caché compartida
+            get_evaluator(function, inputs["variable"])
+        except Exception:
+            pass
+    return history_key(request)
+
+
+def start_validation():
+    """Valida las entradas actuales en segundo plano."""
+    global parse_job
+    parse_job = None
+    if figure is None:
+        # Todavía se están importando SymPy y NumPy (ver check_warm_up)
+        on_input_changed()
+        return
+    request = current_inputs()
+    future = parser_pool.submit(prepare_inputs, request)
+    window.after(POLL_INTERVAL_MS, check_validation, future, request)
+
+
+def check_validation(future, request):
+    """
+    Muestra el resultado de la validación y, si las entradas son válidas, empieza el cálculo especulativo.
 
-        # Convertir expresiones simbólicas a funciones numéricas
-        f = sp.lambdify((variable, 'y'), function_sympy, modules=['numpy'])
-        g = sp.lambdify((variable, 'y'), result_sympy, modules=['numpy'])
+    Args:
+        future (concurrent.futures.Future): Validación enviada por ``start_validation``
+        request (dict): Entradas validadas
+    """
+    if not future.done():
+        window.after(POLL_INTERVAL_MS, check_validation, future, request)
+        return
+    if request != current_inputs():
+        # Las entradas cambiaron mientras se validaban; on_input_changed ya programó otra validación
+        return
+    error = future.exception()
+    if error is not None:
+        validation.set(str(error))
+        return
+    validation.set("")
+    if history is not None and history.contains(future.result(), exact_only=True):
+        # Calculate lo recuperará del historial
+        return
+    speculate(request)
+
+
+def speculate(request):
+    """
+    Empieza el cálculo de las entradas válidas antes de que el usuario pulse Calculate.
 
-        # Generar valores para el eje x e y
-        x_vals = np.linspace(-10, 10, 400)
-        y_vals = np.linspace(-10, 10, 400)
-        X, Y = np.meshgrid(x_vals, y_vals)
+    Solo usa el proceso de cálculo si está libre; si lo ocupa otro cálculo
+    especulativo, las entradas nuevas esperan a que termine. Nunca interrumpe
+    un cálculo pedido por el usuario.
 
-        Z_function = f(X, Y)
-        Z_result = g(X, Y)
+    Args:
+        request (dict): Argumentos del cálculo
+    """
+    global speculation, pending_speculation
+    from calculator_core import compute
+
+    if not options.speculate or options.profile_dir:
+        return
+    if speculation is not None and worker.current_job == speculation["job_id"]:
+        if speculation["request"] != request:
+            pending_speculation = request
+        return
+    if worker.busy:
+        return
+    pending_speculation = None
+    job_id = worker.submit(compute, **request)
+    speculation = {"request": request, "job_id": job_id}
+    window.after(POLL_INTERVAL_MS, check_speculation, job_id)
+
+
+def check_speculation(job_id):
+    """
+    Consulta el cálculo especulativo; su resultado queda en la caché del proceso de cálculo.
 
-        # Crear subplots
-        fig = plt.figure(figsize=(10, 10))
-        ax1 = fig.add_subplot(211, projection='3d')
-        ax1.plot_surface(X, Y, Z_function, alpha=0.7, rstride=100, cstride=100, label='Function')
-        ax1.set_title('Original Function')
-        ax1.set_xlabel(str(variable))
-        ax1.set_ylabel('y')
-        ax1.set_zlabel('f(x, y)')
-        ax1.grid(True)
+    Un cálculo especulativo obsoleto no se interrumpe: al terminar, el proceso
+    pasa al cálculo pedido con Calculate que lo esperaba o, si no hay, a las
+    últimas entradas válidas. Solo se termina si supera ``SPECULATION_LIMIT``
+    segundos (o el límite de tiempo de la ventana, si es menor).
 
+    Args:
+        job_id (int): Identificador del trabajo enviado por ``speculate``
+    """
+    global speculation, queued_calculation
+    if speculation is None or speculation["job_id"] != job_id or worker.current_job != job_id:
+        # Adoptado por calculate o reemplazado por otro cálculo
+        return
+    try:
+        time_limit = min(float(input_time_limit.get()), SPECULATION_LIMIT)
+    except ValueError:
+        time_limit = SPECULATION_LIMIT
+    outcome = worker.poll()
+    if outcome is None:
+        if worker.elapsed() > time_limit:
+            worker.cancel()
+        else:
+            window.after(POLL_INTERVAL_MS, check_speculation, job_id)
+            return
+    speculation = None
+    if queued_calculation is not None:
+        request, time_limit = queued_calculation
+        queued_calculation = None
+        submit_calculation(request, time_limit)
+    elif pending_speculation is not None:
+        speculate(pending_speculation)
 
-        ax2 = fig.add_subplot(212, projection='3d')
-        ax2.plot_surface(X, Y, Z_result, color='r', alpha=0.7, rstride=100, cstride=100)
-        ax2.set_title(f'{plot_type} of Function')
-        ax2.set_xlabel(str(variable))
-        ax2.set_ylabel('y')
-        ax2.set_zlabel(f'{plot_type}(x, y)')
-        ax2.grid(True)
 
-        update_graph(fig)
+def check_calculation(job_id, time_limit):
+    """
+    Consulta periódicamente el proceso de cálculo desde el ciclo de eventos.
 
-def plot_limit(function, variable, limit_point, limit):
+    Args:
+        job_id (int): Identificador del trabajo enviado por ``calculate``
+        time_limit (float): Segundos máximos permitidos para el cálculo
+    """
+    if worker.current_job != job_id:
+        # El trabajo fue cancelado o reemplazado por otro cálculo
+        return
+
+    outcome = worker.poll()
+    if outcome is None:
+        if worker.elapsed() > time_limit:
+            cancel_calculation(f"Error: El cálculo superó el límite de {time_limit:g} segundos.")
+        else:
+            window.after(POLL_INTERVAL_MS, check_calculation, job_id, time_limit)
+        return
+
+    finish_calculation()
+    ok, payload = outcome
+    if not ok:
+        result.set(f"Error: {payload}")
+        report_timings({}, error=payload)
+        return
+    result.set(payload["text"])
+
+    # Los tiempos del proceso de cálculo llegan con el resultado; el resto es envío y espera
+    timings = dict(payload.get("timings", {}))
+    timings["transfer"] = max(0.0, time.perf_counter() - current_request["started"] - sum(timings.values()))
+    with collect() as display_timings:
+        show_calculation(payload)
+    for name, seconds in display_timings.items():
+        timings[name] = timings.get(name, 0.0) + seconds
+    report_timings(timings, profile=payload.get("profile"))
+    setup_bound_sliders(payload)
+    record_history(payload, timings)
+    if options.simplify == "background":
+        start_simplification(payload)
+
+
+def start_simplification(calculation):
     """
-    Genera un gráfico que muestra el límite de una función.
+    Simplifica en segundo plano un resultado que se mostró sin simplificar.
 
     Args:
-        function (str): Función matemática
-        variable (sympy.Symbol): Variable de la función
-        limit_point (float): Punto donde se evalúa el límite
-        limit (float): Valor del límite
+        calculation (dict): Resultado mostrado, producido con ``simplify="none"``
     """
-    function_sympy = sp.sympify(function)
-    f = sp.lambdify(variable, function_sympy, modules=['numpy'])
+    from calculator_core import SIMPLIFIED_TYPES, simplify_calculation
+
+    if calculation["calculation_type"] not in SIMPLIFIED_TYPES:
+        return
+    job_id = simplify_worker.submit(simplify_calculation, calculation, BACKGROUND_POLICY)
+    window.after(POLL_INTERVAL_MS, check_simplification, job_id, calculation)
+
 
-    x_vals = np.linspace(float(limit_point) - 5, float(limit_point) + 5, 400)
-    y_vals = f(x_vals)
+def check_simplification(job_id, calculation):
+    """
+    Reemplaza el resultado mostrado por su forma simplificada cuando está lista.
 
-    fig, ax = plt.subplots(figsize=(8, 6))
-    ax.plot(x_vals, y_vals, label=f'Function: {function}')
-    ax.plot(limit_point, limit, 'ro', label=f'Limit: {limit}')
-    ax.legend()
-    ax.set_xlabel(str(variable))
-    ax.set_ylabel('y')
-    ax.set_title(f'Limit of Function as {variable} approaches {limit_point}')
-    ax.grid(True)
+    Args:
+        job_id (int): Identificador del trabajo enviado por ``start_simplification``
+        calculation (dict): Resultado sin simplificar que se está mostrando
+    """
+    if simplify_worker.current_job != job_id:
+        return
+    outcome = simplify_worker.poll()
+    if outcome is None:
+        window.after(POLL_INTERVAL_MS, check_simplification, job_id, calculation)
+        return
+    ok, simplified = outcome
+    if not ok or last_calculation is not calculation:
+        # Si falla se conserva el resultado sin simplificar
+        return
+    result.set(simplified["text"])
+    status.set(f"{status.get()} · {format_timings(simplified['timings'])} (background)")
+    show_calculation(simplified, mesh_level)
+    key = current_request.get("history_key")
+    if history is not None and key is not None:
+        try:
+            history.store_simplified(key, simplified)
+        except sqlite3.Error:
+            return
+        window.after_idle(save_thumbnail, key, simplified)
 
-    update_graph(fig)
 
-def plot_area(function, variable, lower_bound, upper_bound):
+def lookup_history(request):
     """
-    Genera un gráfico que muestra el área bajo la curva.
+    Busca las entradas en el historial (en un hilo secundario).
+
+    Los resultados numéricos por falta de tiempo se omiten, para que el
+    cálculo vuelva a intentar la forma cerrada.
 
     Args:
-        function (str): Función matemática
-        variable (sympy.Symbol): Variable de la función
-        lower_bound (float): Límite inferior de integración
-        upper_bound (float): Límite superior de integración
+        request (dict): Argumentos del cálculo
+
+    Returns:
+        tuple: Entrada de ``CalculationHistory.recall`` (None si no está o las
+        entradas no son válidas) y segundos por etapa de la búsqueda
     """
-    function_sympy = sp.sympify(function)
-    f = sp.lambdify(variable, function_sympy, modules=['numpy'])
+    from history import history_key
 
-    x_vals = np.linspace(float(lower_bound), float(upper_bound), 400)
-    y_vals = f(x_vals)
+    with collect() as timings:
+        with span("history"):
+            try:
+                entry = history.recall(history_key(request), exact_only=True)
+            except (ValueError, sqlite3.Error):
+                entry = None
+    return entry, timings
 
-    fig, ax = plt.subplots(figsize=(8, 6))
-    ax.plot(x_vals, y_vals, label=f'Function: {function}')
-    ax.fill_between(x_vals, y_vals, alpha=0.3)
-    ax.legend()
-    ax.set_xlabel(str(variable))
-    ax.set_ylabel('y')
-    ax.set_title(f'Area under the curve from {lower_bound} to {upper_bound}')
-    ax.grid(True)
 
-    update_graph(fig)
+def show_recalled(entry, timings):
+    """
+    Muestra un resultado recuperado del historial.
 
-def plot_volume(function, variable, lower_bound, upper_bound):
+    Args:
+        entry (dict): Entrada de ``CalculationHistory.recall``
+        timings (dict): Segundos por etapa de la búsqueda
     """
-    Genera un gráfico 3D que muestra el volumen de revolución.
+    calculation = entry["calculation"]
+    result.set(calculation["text"])
+    with collect() as display_timings:
+        show_calculation(calculation)
+    report_timings({**timings, **display_timings})
+    status.set(f"{status.get()} · from history")
+    setup_bound_sliders(calculation)
+    if options.simplify == "background" and not entry["simplified"]:
+        start_simplification(calculation)
+
+
+def record_history(calculation, timings):
+    """
+    Guarda el cálculo mostrado en el historial; la miniatura se dibuja cuando la ventana queda libre.
 
     Args:
-        function (str): Función matemática
-        variable (sympy.Symbol): Variable de la función
-        lower_bound (float): Límite inferior de integración
-        upper_bound (float): Límite superior de integración
+        calculation (dict): Resultado mostrado
+        timings (dict): Segundos por etapa
+    """
+    if history is None:
+        return
+    try:
+        # Con --simplify background el resultado se reemplaza al terminar la simplificación
+        current_request["history_key"] = history.record(current_request["inputs"], calculation, timings,
+                                                        simplified=options.simplify != "background")
+    except (ValueError, sqlite3.Error):
+        # El historial es auxiliar: un disco lleno o sin permisos no debe impedir el cálculo
+        return
+    window.after_idle(save_thumbnail, current_request["history_key"], calculation)
+
+
+def save_thumbnail(key, calculation):
     """
-    function_sympy = sp.sympify(function)
-    f = sp.lambdify(variable, function_sympy, modules=['numpy'])
+    Guarda la miniatura del gráfico de una entrada del historial, si el gráfico sigue a la vista.
 
-    x_vals = np.linspace(float(lower_bound), float(upper_bound), 100)
-    y_vals = f(x_vals)
+    Args:
+        key (str): Clave de la entrada
+        calculation (dict): Resultado graficado
+    """
+    from history import render_thumbnail
 
-    # Crear malla para gráfico 3D
-    theta = np.linspace(0, 2 * np.pi, 100)
-    x, t = np.meshgrid(x_vals, theta)
+    if history is None or last_calculation is not calculation:
+        return
+    try:
+        history.set_thumbnail(key, render_thumbnail(figure))
+    except sqlite3.Error:
+        pass
 
-    y = np.outer(np.ones(np.size(theta)), y_vals) * np.cos(t)
-    z = np.outer(np.ones(np.size(theta)), y_vals) * np.sin(t)
-    
-    fig = plt.figure(figsize=(8, 6))
-    ax = fig.add_subplot(111, projection='3d')
 
-    ax.plot_surface(x, y, z, alpha=0.7)
-    ax.set_xlabel(str(variable))
-    ax.set_ylabel('y (cosine projection)')
-    ax.set_zlabel('z (sine projection)')
-    ax.set_title(f'Volume of revolution from {lower_bound} to {upper_bound}')
+def start_history():
+    """
+    Abre el historial y prepara en segundo plano la recuperación de sus entradas más usadas.
+
+    Esas entradas se recuperan sin pasar por el proceso de cálculo, así que lo
+    que se precarga es lo que necesita mostrarlas (ver ``warm_entries``).
+    """
+    global history
+    from history import CalculationHistory
+
+    if not options.history:
+        return
+    try:
+        history = CalculationHistory(options.history)
+        entries = history.most_frequent(options.warm_start) if options.warm_start > 0 else []
+    except (OSError, sqlite3.Error):
+        history = None
+        return
+    history_button.state(["!disabled"])
+    if not entries:
+        return
+    parser_pool.submit(warm_entries, entries)
+
+
+def warm_entries(entries):
+    """
+    Prepara la recuperación de entradas del historial (en un hilo secundario).
 
-    update_graph(fig)
+    Interpreta las entradas (la clave del historial se calcula con ellas) y
+    compila los evaluadores que usan sus gráficos y sus deslizadores de
+    límites: la función, el resultado y las antiderivadas guardadas.
 
-def plot_average(function, variable, lower_bound, upper_bound, average_value):
+    Args:
+        entries (list): Pares ``(request, calculation)`` de ``CalculationHistory.most_frequent``
     """
-    Genera un gráfico que muestra el valor promedio de la función.
+    from evaluators import get_evaluator
+
+    for request, calculation in entries:
+        try:
+            prepare_inputs(request)
+        except ValueError:
+            continue
+        variable = calculation.get("variable")
+        expressions = [calculation["value"], *(calculation.get("antiderivatives") or {}).values()]
+        for expression in expressions:
+            if variable is None or not hasattr(expression, "free_symbols") or \
+                    not expression.free_symbols <= {variable}:
+                continue
+            try:
+                get_evaluator(expression, variable)
+            except Exception:
+                pass
+
+
+def open_history():
+    """Muestra la ventana de búsqueda del historial, o la trae al frente si ya está abierta."""
+    global history_window, history_tree, history_preview
+    if history_window is not None and history_window.winfo_exists():
+        history_window.lift()
+        refresh_history()
+        return
+
+    history_window = tk.Toplevel(window)
+    history_window.title("History")
+    ttk.Label(history_window, text="Search:").grid(column=0, row=0, padx=10, pady=10, sticky="w")
+    search_entry = ttk.Entry(history_window, textvariable=history_query, width=40)
+    search_entry.grid(column=1, row=0, padx=10, pady=10, sticky="we")
+
+    history_tree = ttk.Treeview(history_window, columns=("type", "function", "bounds", "result", "uses"),
+                                show="headings", height=15, selectmode="browse")
+    for column, heading, width in (("type", "Type", 150), ("function", "Function", 180),
+                                   ("bounds", "Bounds / Point", 110), ("result", "Result", 280), ("uses", "Uses", 50)):
+        history_tree.heading(column, text=heading)
+        history_tree.column(column, width=width, stretch=column == "result")
+    history_tree.grid(column=0, row=1, columnspan=2, padx=10, pady=10, sticky="nsew")
+    history_tree.bind("<<TreeviewSelect>>", preview_history)
+    history_tree.bind("<Double-1>", recall_history)
+    history_tree.bind("<Return>", recall_history)
+
+    # Miniatura del gráfico de la entrada seleccionada
+    history_preview = ttk.Label(history_window)
+    history_preview.grid(column=2, row=1, padx=10, pady=10, sticky="n")
+
+    buttons = ttk.Frame(history_window)
+    buttons.grid(column=0, row=2, columnspan=3, padx=10, pady=10)
+    ttk.Button(buttons, text="Recall", command=recall_history).grid(column=0, row=0, padx=10)
+    ttk.Button(buttons, text="Delete", command=delete_history).grid(column=1, row=0, padx=10)
+
+    history_window.grid_columnconfigure(1, weight=1)
+    history_window.grid_rowconfigure(1, weight=1)
+    search_entry.focus_set()
+    refresh_history()
+
+
+def refresh_history(*args):
+    """
+    Busca en segundo plano las entradas del historial que coinciden con la búsqueda.
+
+    La búsqueda interpreta el texto como expresión, lo que puede tardar; se
+    hace en ``parser_pool`` como la validación de los campos.
 
     Args:
-        function (str): Función matemática
-        variable (sympy.Symbol): Variable de la función
-        lower_bound (float): Límite inferior
-        upper_bound (float): Límite superior
-        average_value (float): Valor promedio calculado
+        *args: Argumentos variables (no utilizados pero requeridos por el trace)
     """
-    function_sympy = sp.sympify(function)
-    f = sp.lambdify(variable, function_sympy, modules=['numpy'])
+    if history is None or history_tree is None or not history_tree.winfo_exists():
+        return
+    query = history_query.get()
+    future = parser_pool.submit(history.search, query, HISTORY_SEARCH_LIMIT)
+    window.after(POLL_INTERVAL_MS, show_history_results, future, query)
 
-    x_vals = np.linspace(float(lower_bound), float(upper_bound), 400)
-    y_vals = f(x_vals)
 
-    average_value_float = float(average_value)
+def show_history_results(future, query):
+    """
+    Lista las entradas encontradas por ``refresh_history``.
 
-    fig, ax = plt.subplots(figsize=(8, 6))
-    ax.plot(x_vals, y_vals, label=f'Function: {function}')
-    ax.axhline(y=average_value_float, color='r', linestyle='--', 
-               label=f'Average: {average_value_float}')
-    ax.fill_between(x_vals, y_vals, average_value_float, 
-                   where=(y_vals > average_value_float), alpha=0.3)
-    ax.fill_between(x_vals, y_vals, average_value_float, 
-                   where=(y_vals <= average_value_float), color='gray', alpha=0.3)
-    ax.legend()
-    ax.set_xlabel(str(variable))
-    ax.set_ylabel('y')
-    ax.set_title(f'Average Value of Function from {lower_bound} to {upper_bound}')
-    ax.grid(True)
+    Args:
+        future (concurrent.futures.Future): Búsqueda en curso
+        query (str): Texto buscado
+    """
+    if not future.done():
+        window.after(POLL_INTERVAL_MS, show_history_results, future, query)
+        return
+    if query != history_query.get() or not history_tree.winfo_exists():
+        # La búsqueda cambió mientras tanto; otra llamada a refresh_history mostrará su resultado
+        return
+    try:
+        entries = future.result()
+    except sqlite3.Error:
+        return
+    selection = history_tree.selection()
+    history_tree.delete(*history_tree.get_children())
+    for entry in entries:
+        history_tree.insert("", "end", iid=entry["key"],
+                            values=(entry["calculation_type"], entry["function"], entry["bounds"] or "",
+                                    entry["text"].replace("\n", "  "), entry["uses"]))
+    if selection and history_tree.exists(selection[0]):
+        history_tree.selection_set(selection[0])
+        history_tree.see(selection[0])
+
+
+def preview_history(event=None):
+    """
+    Muestra la miniatura del gráfico de la entrada seleccionada.
 
-    update_graph(fig)
-    
-def plot_surface_area(function, variable, lower_bound, upper_bound):
+    Args:
+        event (tkinter.Event): Evento de selección (no se usa)
     """
-    Genera un gráfico que muestra el área de superficie de revolución.
+    global history_image
+    selection = history_tree.selection()
+    thumbnail = history.thumbnail(selection[0]) if selection else None
+    # Se conserva una referencia a la imagen; tkinter no la mantiene por sí mismo
+    history_image = tk.PhotoImage(data=base64.b64encode(thumbnail).decode("ascii")) if thumbnail else None
+    history_preview.configure(image=history_image or "")
+
+
+def recall_history(event=None):
+    """
+    Recupera la entrada seleccionada: copia sus entradas en la ventana principal y muestra su resultado.
 
     Args:
-        function (str): Función matemática
-        variable (sympy.Symbol): Variable de la función
-        lower_bound (float): Límite inferior de integración
-        upper_bound (float): Límite superior de integración
+        event (tkinter.Event): Evento de doble clic o Enter (no se usa)
+    """
+    global current_request
+    selection = history_tree.selection()
+    if not selection:
+        return
+    started = time.perf_counter()
+    with collect() as timings:
+        with span("history"):
+            entry = history.recall(selection[0])
+    if entry is None:
+        # Se borró o su resultado ya no puede leerse
+        refresh_history()
+        return
+
+    stop_calculation()
+    if simplify_worker.busy:
+        simplify_worker.cancel()
+    set_inputs(entry["request"])
+    current_request = {"inputs": current_inputs(), "started": started, "history_key": entry["key"]}
+    show_recalled(entry, timings)
+    refresh_history()
+
+
+def stop_calculation():
+    """Cancela el cálculo pedido (no el especulativo) antes de empezar otro o de mostrar el historial."""
+    global queued_calculation, history_lookup
+    # Su resultado ya no se mostrará, ni se guardaría con las entradas correctas
+    queued_calculation = None
+    history_lookup = None
+    if worker.busy and speculation is None:
+        worker.cancel()
+    finish_calculation()
+
+
+def delete_history():
+    """Elimina la entrada seleccionada del historial."""
+    selection = history_tree.selection()
+    if selection:
+        history.delete(selection[0])
+        refresh_history()
+        preview_history()
+
+
+def set_inputs(request):
     """
-    function_sympy = sp.sympify(function)
-    f = sp.lambdify(variable, function_sympy, modules=['numpy'])
+    Copia los argumentos de un cálculo en los campos de la interfaz.
 
-    x_vals = np.linspace(float(lower_bound), float(upper_bound), 100)
-    y_vals = f(x_vals)
+    Args:
+        request (dict): Argumentos del cálculo
+    """
+    calculation_var.set(request["calculation_type"])
+    for control, name in ((input_function, "function"), (input_variable, "variable"),
+                          (input_lower_bound, "lower_bound"), (input_upper_bound, "upper_bound"),
+                          (input_limit_point, "limit_point"), (input_variable_2, "variable_2"),
+                          (input_outer_function, "outer_function"), (input_inner_function, "inner_function")):
+        control.set(request.get(name) or "")
+    input_hessian.set(bool(request.get("hessian")))
 
-    theta = np.linspace(0, 2 * np.pi, 100)
-    x, t = np.meshgrid(x_vals, theta)
 
-    y = np.outer(np.ones(np.size(theta)), y_vals) * np.cos(t)
-    z = np.outer(np.ones(np.size(theta)), y_vals) * np.sin(t)
-    
-    fig = plt.figure(figsize=(8, 6))
-    ax = fig.add_subplot(111, projection='3d')
+def report_timings(timings, error=None, profile=None):
+    """
+    Muestra los tiempos por etapa en la barra de estado y los agrega al registro.
 
-    ax.plot_surface(x, y, z, alpha=0.7)
-    ax.set_xlabel(str(variable))
-    ax.set_ylabel('y (cosine projection)')
-    ax.set_zlabel('z (sine projection)')
-    ax.set_title(f'Surface Area of revolution from {lower_bound} to {upper_bound}')
+    Args:
+        timings (dict): Segundos por etapa
+        error (str): Mensaje de error si el cálculo falló o se canceló
+        profile (str): Ruta del perfil guardado, si se capturó uno
+    """
+    total = time.perf_counter() - current_request["started"]
+    summary = format_timings(timings)
+    status.set(f"{summary} · total {total * 1000:.0f} ms" if summary else f"total {total * 1000:.0f} ms")
+    if options.log:
+        try:
+            append_log(options.log, {"inputs": current_request["inputs"], "total": total, "timings": timings,
+                                     "error": error, "profile": profile})
+        except OSError:
+            # El registro es auxiliar: un disco lleno o sin permisos no debe impedir el cálculo
+            pass
+
+
+def cancel_calculation(message="Cancelled"):
+    """
+    Cancela el cálculo en curso terminando el proceso de cálculo.
 
-    update_graph(fig)
-    
-def plot_centroid(function, variable, lower_bound, upper_bound, x_centroid, y_centroid):
-    function_sympy = sp.sympify(function)
-    f = sp.lambdify(variable, function_sympy, modules=['numpy'])
+    Un cálculo que aún espera a un cálculo especulativo solo se descarta; el
+    especulativo sigue en curso.
 
-    x_vals = np.linspace(float(lower_bound), float(upper_bound), 400)
-    y_vals = f(x_vals)
+    Args:
+        message (str): Texto a mostrar en el resultado
+    """
+    global queued_calculation, history_lookup
+    if queued_calculation is not None or history_lookup is not None:
+        queued_calculation = None
+        history_lookup = None
+        result.set(message)
+        report_timings({}, error=message)
+    elif worker.busy and speculation is None:
+        worker.cancel()
+        result.set(message)
+        report_timings({}, error=message)
+    finish_calculation()
+
+
+def finish_calculation():
+    """Detiene el indicador de progreso y desactiva el botón de cancelar."""
+    progress_bar.stop()
+    cancel_button.state(["disabled"])
+
+
+def close_window():
+    """Detiene el proceso de cálculo y cierra la ventana."""
+    parser_pool.shutdown(wait=False)
+    if history is not None:
+        history.close()
+    worker.close()
+    simplify_worker.close()
+    window.destroy()
+
+
+def show_calculation(calculation, level="fine"):
+    """
+    Grafica el resultado de un cálculo producido por ``calculator_core.compute``.
 
-    fig, ax = plt.subplots(figsize=(8, 6))
+    Args:
+        calculation (dict): Resultado del cálculo
+        level (str): Nivel de detalle de las mallas 3D ("coarse" o "fine")
+    """
+    global last_calculation, mesh_level
+    from plots import plot_calculation
 
-    # Graficar la función
-    ax.plot(x_vals, y_vals, color='blue', label=f'Function: {function}', linewidth=2)
-    
-    # Rellenar el área bajo la curva
-    ax.fill_between(x_vals, y_vals, color='lightblue', alpha=0.3, label='Area under curve')
+    last_calculation = calculation
+    mesh_level = level
+    plot_calculation(figure, calculation, plot_budget(), level)
+    update_graph(figure)
 
-    # Graficar el centroide con un marcador distintivo
-    ax.plot(float(x_centroid), float(y_centroid), 'ro', markersize=10, label=f'Centroid: ({x_centroid:.2f}, {y_centroid:.2f})')
-    
-    # Agregar líneas punteadas para el centroide
-    ax.axvline(x=float(x_centroid), color='red', linestyle='--', alpha=0.7)
-    ax.axhline(y=float(y_centroid), color='red', linestyle='--', alpha=0.7)
-    
-    # Mejorar la presentación de los ejes
-    ax.set_xlim(float(lower_bound) - 1, float(upper_bound) + 1)
-    ax.set_ylim(min(y_vals) - 1, max(y_vals) + 1)
-    ax.set_aspect('equal', adjustable='box')
-
-    # Etiquetas y título
-    ax.set_xlabel(str(variable), fontsize=12)
-    ax.set_ylabel('y', fontsize=12)
-    ax.set_title('Centroid of the Region under the Curve', fontsize=14)
-    
-    # Activar cuadrícula
-    ax.grid(True, linestyle='--', alpha=0.5)
 
-    # Leyenda
-    ax.legend(fontsize=10, loc='best')
+def setup_bound_sliders(calculation):
+    """
+    Muestra los deslizadores de límites para los tipos de cálculo con límites finitos.
 
-    # Mostrar gráfica mejorada
-    update_graph(fig)
-    
-def plot_chain_rule(outer_function, inner_function, chain_rule_result, variable):
+    Los deslizadores cubren los límites calculados más un margen del ancho del
+    intervalo a cada lado, sin cruzar singularidades de la función (ver
+    ``bounds.extend_domain``). El ``BoundExplorer`` que los evalúa se crea al
+    mover un deslizador por primera vez.
+
+    Args:
+        calculation (dict): Resultado mostrado
+    """
+    global bounds_calculation, bounds_explorer, bounds_domain
+    from bounds import extend_domain
+
+    bounds_explorer = None
+    bounds_calculation = None
+    try:
+        lower, upper = float(calculation["lower_bound"]), float(calculation["upper_bound"])
+    except (KeyError, TypeError):
+        bounds_frame.grid_remove()
+        return
+    if not (math.isfinite(lower) and math.isfinite(upper)):
+        bounds_frame.grid_remove()
+        return
+
+    margin = max(abs(upper - lower), 1.0)
+    bounds_domain = extend_domain(calculation["function"], calculation["variable"], min(lower, upper),
+                                  max(lower, upper), margin)
+    bounds_calculation = calculation
+    for scale in (lower_scale, upper_scale):
+        scale.configure(from_=bounds_domain[0], to=bounds_domain[1])
+    lower_slider_value.set(lower)
+    upper_slider_value.set(upper)
+    bounds_frame.grid()
+
+
+def on_bound_slider(value):
+    """
+    Programa la actualización del resultado al mover un deslizador.
+
+    Los movimientos que llegan antes de que se procese el anterior se agrupan
+    en una sola actualización.
+
+    Args:
+        value (str): Posición del deslizador (no se usa; se leen ambos deslizadores)
+    """
+    global bounds_update_job
+    if bounds_calculation is not None and bounds_update_job is None:
+        bounds_update_job = window.after_idle(update_bounds)
+
+
+def on_bound_scroll(event):
+    """
+    Ajusta un límite con la rueda del ratón, un 1% del rango del deslizador por paso.
+
+    Args:
+        event (tkinter.Event): Evento de la rueda (``<MouseWheel>`` o botones 4/5 en X11)
+    """
+    if bounds_calculation is None:
+        return
+    variable = lower_slider_value if event.widget is lower_scale else upper_slider_value
+    direction = 1 if getattr(event, "delta", 0) > 0 or getattr(event, "num", None) == 4 else -1
+    step = (bounds_domain[1] - bounds_domain[0]) / 100
+    variable.set(min(max(variable.get() + direction * step, bounds_domain[0]), bounds_domain[1]))
+    on_bound_slider(variable.get())
+
+
+def update_bounds():
+    """
+    Reevalúa el cálculo mostrado con los límites de los deslizadores, sin integrar de nuevo.
+
+    Area, Average y Centroid mueven solo la región sombreada; Volume y Surface
+    Area se redibujan con la malla gruesa hasta que los límites dejan de moverse.
     """
-    Grafica la función original y su derivada.
+    global bounds_update_job, bounds_explorer
+    import sympy as sp
+    from bounds import BoundExplorer
+    from plots import REGION_TYPES, plot_bounds
+
+    bounds_update_job = None
+    calculation = bounds_calculation
+    calculation_type = calculation["calculation_type"]
+    lower, upper = lower_slider_value.get(), upper_slider_value.get()
+
+    with collect() as timings:
+        with span("solve"):
+            if bounds_explorer is None:
+                bounds_explorer = BoundExplorer(calculation["function"], calculation["variable"], calculation_type,
+                                                bounds_domain, calculation.get("antiderivatives"))
+            value = bounds_explorer.evaluate(lower, upper)
+
+        fill_bound_fields(lower, upper)
+        if calculation_type == "Centroid / Center of Mass":
+            result.set(f"Centroid: (x̄ ≈ {value[0]:.10g}, ȳ ≈ {value[1]:.10g}) ({bounds_explorer.method})")
+        else:
+            result.set(f"{calculation_type}: ≈ {float(value):.10g} ({bounds_explorer.method})")
+
+        if calculation_type in REGION_TYPES:
+            plot_bounds(figure, calculation["function"], calculation["variable"], calculation_type, bounds_domain,
+                        lower, upper, value, plot_budget())
+            update_graph(figure)
+        else:
+            moved = {**calculation, "lower_bound": sp.Float(lower), "upper_bound": sp.Float(upper)}
+            show_calculation(moved, "coarse")
+            # La malla fina se dibuja cuando los límites dejan de moverse
+            end_interaction(None)
+    status.set(format_timings(timings))
+
+
+def fill_bound_fields(lower, upper):
     """
-    # Convertir funciones simbólicas a funciones numéricas
-    inner_func_numeric = sp.lambdify(variable, sp.sympify(inner_function), modules=['numpy'])
-    outer_func_numeric = sp.lambdify(variable, sp.sympify(outer_function.replace('u', f'({inner_function})')), modules=['numpy'])
-    chain_rule_numeric = sp.lambdify(variable, chain_rule_result, modules=['numpy'])
+    Copia los límites de los deslizadores en los campos sin validar ni calcular de nuevo.
 
-    # Valores para el eje x
-    x_vals = np.linspace(-10, 10, 400)
-    y_vals_inner = inner_func_numeric(x_vals)
-    y_vals_outer = outer_func_numeric(x_vals)
-    y_vals_chain = chain_rule_numeric(x_vals)
+    Los deslizadores ya muestran el resultado; un cálculo especulativo de
+    cada posición repetiría la integración simbólica que evitan.
+
+    Args:
+        lower, upper (float): Límites
+    """
+    global filling_inputs
+    filling_inputs = True
+    try:
+        input_lower_bound.set(f"{lower:.6g}")
+        input_upper_bound.set(f"{upper:.6g}")
+    finally:
+        filling_inputs = False
+
+
+def start_interaction(event):
+    """
+    Cambia a la malla gruesa al empezar a rotar un gráfico 3D.
+
+    Args:
+        event (matplotlib.backend_bases.MouseEvent): Evento de clic
+    """
+    if event.inaxes is None or event.inaxes.name != '3d' or last_calculation is None:
+        return
+    if refine_job is not None:
+        window.after_cancel(refine_job)
+    if mesh_level != "coarse":
+        show_calculation(last_calculation, "coarse")
+
+
+def end_interaction(event):
+    """
+    Programa el refinamiento de la malla cuando el usuario suelta el gráfico.
+
+    Args:
+        event (matplotlib.backend_bases.MouseEvent): Evento de soltar el botón
+            (None cuando se llama desde ``update_bounds``)
+    """
+    global refine_job
+    if mesh_level != "coarse":
+        return
+    if refine_job is not None:
+        window.after_cancel(refine_job)
+    refine_job = window.after(REFINE_DELAY_MS, refine_mesh)
 
-    # Crear gráficos
-    fig, ax = plt.subplots(figsize=(8, 6))
-    ax.plot(x_vals, y_vals_outer, label=f'Outer Function: {outer_function.replace("u", f"({inner_function})")}', color='blue')
-    ax.plot(x_vals, y_vals_chain, label='Chain Rule Result', color='red', linestyle='--')
-    ax.axhline(0, color='black', lw=0.5, ls='--')
-    ax.axvline(0, color='black', lw=0.5, ls='--')
-    ax.set_title('Function and its Derivative using Chain Rule')
-    ax.set_xlabel(str(variable))
-    ax.set_ylabel('y')
-    ax.legend()
-    ax.grid(True)
 
-    # Actualizar el gráfico en la interfaz
-    update_graph(fig)
+def refine_mesh():
+    """Vuelve a dibujar el último gráfico 3D con la malla fina."""
+    global refine_job
+    refine_job = None
+    if last_calculation is not None:
+        show_calculation(last_calculation, "fine")
+
+
+def plot_budget():
+    """
+    Calcula cuántas evaluaciones usar por curva según el ancho del área de gráficos.
+
+    Returns:
+        int: Presupuesto de puntos para ``adaptive_sample``
+    """
+    width = graph_frame.winfo_width()
+    return max(MIN_PLOT_POINTS, min(MAX_PLOT_POINTS, 2 * width))
 
 
 def update_graph(fig):
     """
     Actualiza el widget de gráfico en la interfaz.
 
+    La figura y su lienzo se crean una sola vez y se reutilizan en cada
+    cálculo, por lo que la memoria se mantiene estable en sesiones largas.
+
     Args:
         fig (matplotlib.figure.Figure): Figura a mostrar
     """
-    for widget in graph_frame.winfo_children():
-        widget.destroy()
+    global canvas
+    if canvas is None:
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        canvas = FigureCanvasTkAgg(fig, master=graph_frame)
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        canvas.mpl_connect("button_press_event", start_interaction)
+        canvas.mpl_connect("button_release_event", end_interaction)
+
+    # Ajustar el lienzo al tamaño elegido por la función de graficación
+    width, height = fig.get_size_inches() * fig.dpi
+    canvas.get_tk_widget().configure(width=int(width), height=int(height))
+    with span("draw"):
+        canvas.draw()
+
+def warm_up(modules, import_times):
+    """
+    Importa los módulos pesados en un hilo secundario mientras la ventana ya responde.
+
+    No toca ningún widget (tkinter no es seguro entre hilos); ``check_warm_up``
+    consulta desde el ciclo de eventos cuándo terminó.
+
+    Args:
+        modules (list): Nombres de los módulos, en orden
+        import_times (dict): Se completa con los segundos de importación de cada
+            módulo (sin contar las dependencias ya importadas por los anteriores)
+    """
+    for name in modules:
+        start = time.perf_counter()
+        importlib.import_module(name)
+        import_times[name] = time.perf_counter() - start
+
+
+def check_warm_up():
+    """Habilita el botón Calculate cuando terminó la importación en segundo plano."""
+    global figure
+    if warm_up_thread.is_alive():
+        window.after(POLL_INTERVAL_MS, check_warm_up)
+        return
+
+    from matplotlib.figure import Figure
+
+    # Figura única reutilizada por todos los gráficos; el lienzo se crea en el primer gráfico
+    figure = Figure(figsize=(8, 6))
+    start_history()
+    calculate_button.configure(text="Calculate")
+    calculate_button.state(["!disabled"])
+    startup_times["ready"] = time.perf_counter() - PROGRAM_START
+    if options.startup_timing:
+        report_startup()
+
+
+def report_startup():
+    """Escribe los tiempos de arranque en la salida de errores y cierra la ventana."""
+    print(f"first paint: {startup_times['first_paint'] * 1000:.0f} ms", file=sys.stderr)
+    print(f"ready:       {startup_times['ready'] * 1000:.0f} ms", file=sys.stderr)
+    for name, seconds in import_times.items():
+        print(f"  import {name:<36} {seconds * 1000:7.1f} ms", file=sys.stderr)
+    close_window()
 
-    canvas = FigureCanvasTkAgg(fig, master=graph_frame)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
 def update_input_fields(*args):
     """
@@ -474,7 +1086,7 @@ def update_input_fields(*args):
     ttk.Entry(input_frame, textvariable=input_variable).grid(column=1, row=1, padx=10, pady=10)
     
     # Campos adicionales según el tipo de cálculo
-    if calculation_type in ["Area", "Volume", "Average", "Surface Area", "Centroid / Center of Mass"]:
+    if calculation_type in BOUNDED_TYPES:
         ttk.Label(input_frame, text="Lower Bound:").grid(column=0, row=2, padx=10, pady=10)
         ttk.Entry(input_frame, textvariable=input_lower_bound).grid(column=1, row=2, padx=10, pady=10)
         
@@ -489,6 +1101,11 @@ def update_input_fields(*args):
         ttk.Label(input_frame, text="Variable 2:").grid(column=0, row=2, padx=10, pady=10)
         ttk.Entry(input_frame, textvariable=input_variable_2).grid(column=1, row=2, padx=10, pady=10)
 
+    elif calculation_type == "Gradient / Hessian":
+        # Las variables son todos los símbolos de la función; el campo Variable no se usa
+        ttk.Checkbutton(input_frame, text="Include Hessian", variable=input_hessian).grid(
+            column=1, row=2, padx=10, pady=10, sticky="w")
+
     elif calculation_type == "Chain Rule":
         ttk.Label(input_frame, text="Outer Function:").grid(column=0, row=2, padx=10, pady=10)
         ttk.Entry(input_frame, textvariable=input_outer_function).grid(column=1, row=2, padx=10, pady=10)
@@ -496,50 +1113,181 @@ def update_input_fields(*args):
         ttk.Label(input_frame, text="Inner Function:").grid(column=0, row=3, padx=10, pady=10)
         ttk.Entry(input_frame, textvariable=input_inner_function).grid(column=1, row=3, padx=10, pady=10)
 
+    # Errores de las entradas, validadas mientras se escribe (ver on_input_changed)
+    ttk.Label(input_frame, textvariable=validation, foreground="red").grid(column=0, row=4, columnspan=2, padx=10)
 
-# Configuración de la ventana principal
-window = tk.Tk()
-window.title("Advanced Calculator with Graphs")
-
-# Variables de control
-calculation_var = tk.StringVar()
-input_function = tk.StringVar()
-input_variable = tk.StringVar()
-input_lower_bound = tk.StringVar()
-input_upper_bound = tk.StringVar()
-input_limit_point = tk.StringVar()
-input_variable_2 = tk.StringVar()
-input_outer_function = tk.StringVar()
-input_inner_function = tk.StringVar()
-result = tk.StringVar()
-
-# Frames para organizar la interfaz
-menu_frame = ttk.Frame(window)
-menu_frame.grid(column=0, row=0, padx=10, pady=10)
-input_frame = ttk.Frame(window)
-input_frame.grid(column=0, row=1, padx=10, pady=10)
-result_frame = ttk.Frame(window)
-result_frame.grid(column=0, row=2, padx=10, pady=10)
-graph_frame = ttk.Frame(window)
-graph_frame.grid(column=0, row=3, padx=10, pady=10)
-
-# Menú de selección de tipo de cálculo
-calculation_types = ["Integral", "Derivative", "Limit", "Area", "Volume", "Surface Area", "Average","Centroid / Center of Mass","Partial Derivative", "Chain Rule"]
-ttk.Label(menu_frame, text="Calculation Type:").grid(column=0, row=0, padx=10, pady=10)
-calculation_menu = ttk.Combobox(menu_frame, textvariable=calculation_var, values=calculation_types)
-calculation_menu.grid(column=1, row=0, padx=10, pady=10)
-calculation_menu.set("Integral")
-
-# Inicialización de campos de entrada
-update_input_fields()
-
-ttk.Button(result_frame, text="Calculate", command=calculate).grid(column=0, row=0, padx=10, pady=10)
-
-ttk.Label(result_frame, textvariable=result).grid(column=1, row=0, padx=10, pady=10)
-
-window.grid_columnconfigure(0, weight=1)
-window.grid_rowconfigure(3, weight=1)
-
-calculation_var.trace("w", update_input_fields)
-
-window.mainloop()
+
+def parse_args(argv=None):
+    """
+    Interpreta las opciones de línea de comandos de la interfaz.
+
+    Args:
+        argv (list): Argumentos (por defecto, los de ``sys.argv``)
+
+    Returns:
+        argparse.Namespace: Opciones ``log``, ``profile_dir``, ``profile_threshold``,
+        ``simplify``, ``termwise``, ``speculate``, ``history``, ``warm_start`` y ``startup_timing``
+    """
+    parser = argparse.ArgumentParser(description="Calculadora gráfica con SymPy.")
+    parser.add_argument("--log", default=DEFAULT_LOG_PATH,
+                        help="Archivo JSON lines con los tiempos de cada cálculo ('' para desactivarlo)")
+    parser.add_argument("--profile-dir", default=None,
+                        help="Guarda perfiles de cProfile y tracemalloc de los cálculos lentos en este directorio")
+    parser.add_argument("--profile-threshold", type=float, default=DEFAULT_PROFILE_THRESHOLD,
+                        help="Segundos a partir de los cuales se guarda el perfil de un cálculo")
+    parser.add_argument("--simplify", default="background",
+                        choices=["none", "cheap", "full", "budget", "background"],
+                        help="Política de simplificación; 'background' muestra el resultado sin simplificar "
+                             "y lo reemplaza cuando la simplificación termina")
+    parser.add_argument("--termwise", action="store_true",
+                        help="Integra y deriva las sumas término a término, reutilizando los términos ya calculados")
+    parser.add_argument("--no-speculate", action="store_false", dest="speculate",
+                        help="No calcular en segundo plano mientras se escriben las entradas")
+    parser.add_argument("--history", default=DEFAULT_HISTORY_PATH,
+                        help="Base de datos SQLite con el historial de cálculos ('' para desactivarlo)")
+    parser.add_argument("--warm-start", type=int, default=WARM_START_ENTRIES,
+                        help="Entradas más usadas del historial que se precargan en las cachés al iniciar")
+    parser.add_argument("--startup-timing", action="store_true",
+                        help="Muestra el tiempo hasta el primer dibujado y la importación de cada módulo, y termina")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    options = parse_args()
+
+    # Configuración de la ventana principal
+    window = tk.Tk()
+    window.title("Advanced Calculator with Graphs")
+
+    # Variables de control
+    calculation_var = tk.StringVar()
+    input_function = tk.StringVar()
+    input_variable = tk.StringVar()
+    input_lower_bound = tk.StringVar()
+    input_upper_bound = tk.StringVar()
+    input_limit_point = tk.StringVar()
+    input_variable_2 = tk.StringVar()
+    input_outer_function = tk.StringVar()
+    input_inner_function = tk.StringVar()
+    input_hessian = tk.BooleanVar(value=False)
+    input_time_limit = tk.StringVar(value="30")
+    result = tk.StringVar()
+    status = tk.StringVar()
+    validation = tk.StringVar()
+
+    # Proceso de cálculo; se inicia después de mostrar la ventana. No es demonio para que
+    # --termwise pueda repartir los términos entre procesos (se cierra en close_window)
+    worker = CalculationWorker(preload=("calculator_core",), daemon=False)
+    simplify_worker = CalculationWorker(preload=("calculator_core",))
+
+    # Entradas y momento de inicio del último cálculo enviado (ver report_timings)
+    current_request = None
+
+    # Validación en segundo plano y cálculo especulativo (ver on_input_changed y speculate)
+    parser_pool = ThreadPoolExecutor(max_workers=1)
+    parse_job = None
+    speculation = None
+    pending_speculation = None
+    # Cálculo pedido con Calculate que espera a que termine un cálculo especulativo obsoleto
+    queued_calculation = None
+    # Búsqueda en el historial de la última pulsación de Calculate (ver check_history_lookup)
+    history_lookup = None
+    filling_inputs = False
+
+    # Historial de cálculos; se abre al terminar la importación en segundo plano (ver start_history)
+    history = None
+    history_window = None
+    history_tree = None
+    history_preview = None
+    history_image = None
+    history_query = tk.StringVar()
+    history_query.trace("w", refresh_history)
+
+    # Frames para organizar la interfaz
+    menu_frame = ttk.Frame(window)
+    menu_frame.grid(column=0, row=0, padx=10, pady=10)
+    input_frame = ttk.Frame(window)
+    input_frame.grid(column=0, row=1, padx=10, pady=10)
+    result_frame = ttk.Frame(window)
+    result_frame.grid(column=0, row=2, padx=10, pady=10)
+    graph_frame = ttk.Frame(window)
+    graph_frame.grid(column=0, row=3, padx=10, pady=10)
+
+    # La figura se crea al terminar la importación en segundo plano (ver check_warm_up)
+    figure = None
+    canvas = None
+
+    # Último cálculo graficado y nivel de detalle actual de las mallas 3D
+    last_calculation = None
+    mesh_level = "fine"
+    refine_job = None
+
+    # Menú de selección de tipo de cálculo
+    calculation_types = CALCULATION_TYPES
+    ttk.Label(menu_frame, text="Calculation Type:").grid(column=0, row=0, padx=10, pady=10)
+    calculation_menu = ttk.Combobox(menu_frame, textvariable=calculation_var, values=calculation_types)
+    calculation_menu.grid(column=1, row=0, padx=10, pady=10)
+    calculation_menu.set("Integral")
+
+    # Inicialización de campos de entrada
+    update_input_fields()
+
+    calculate_button = ttk.Button(result_frame, text="Warming up...", command=calculate, state="disabled")
+    calculate_button.grid(column=0, row=0, padx=10, pady=10)
+    cancel_button = ttk.Button(result_frame, text="Cancel", command=cancel_calculation, state="disabled")
+    cancel_button.grid(column=1, row=0, padx=10, pady=10)
+
+    ttk.Label(result_frame, text="Time Limit (s):").grid(column=2, row=0, padx=10, pady=10)
+    ttk.Entry(result_frame, textvariable=input_time_limit, width=6).grid(column=3, row=0, padx=10, pady=10)
+    progress_bar = ttk.Progressbar(result_frame, mode="indeterminate", length=120)
+    progress_bar.grid(column=4, row=0, padx=10, pady=10)
+    history_button = ttk.Button(result_frame, text="History...", command=open_history, state="disabled")
+    history_button.grid(column=5, row=0, padx=10, pady=10)
+
+    ttk.Label(result_frame, textvariable=result).grid(column=0, row=1, columnspan=6, padx=10, pady=10)
+    ttk.Label(result_frame, textvariable=status, foreground="gray").grid(column=0, row=2, columnspan=6, padx=10)
+
+    # Deslizadores de límites (ver setup_bound_sliders); se muestran solo con resultados con límites
+    lower_slider_value = tk.DoubleVar()
+    upper_slider_value = tk.DoubleVar()
+    bounds_calculation = None
+    bounds_explorer = None
+    bounds_domain = None
+    bounds_update_job = None
+    bounds_frame = ttk.Frame(result_frame)
+    bounds_frame.grid(column=0, row=3, columnspan=6, padx=10, pady=5)
+    ttk.Label(bounds_frame, text="Lower:").grid(column=0, row=0, padx=5)
+    lower_scale = ttk.Scale(bounds_frame, variable=lower_slider_value, command=on_bound_slider, length=200)
+    lower_scale.grid(column=1, row=0, padx=5)
+    ttk.Label(bounds_frame, text="Upper:").grid(column=2, row=0, padx=5)
+    upper_scale = ttk.Scale(bounds_frame, variable=upper_slider_value, command=on_bound_slider, length=200)
+    upper_scale.grid(column=3, row=0, padx=5)
+    for scale in (lower_scale, upper_scale):
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            scale.bind(sequence, on_bound_scroll)
+    bounds_frame.grid_remove()
+
+    window.grid_columnconfigure(0, weight=1)
+    window.grid_rowconfigure(3, weight=1)
+
+    calculation_var.trace("w", update_input_fields)
+    for control in (calculation_var, input_function, input_variable, input_lower_bound, input_upper_bound,
+                    input_limit_point, input_variable_2, input_outer_function, input_inner_function,
+                    input_hessian):
+        control.trace("w", on_input_changed)
+
+    window.protocol("WM_DELETE_WINDOW", close_window)
+
+    # Mostrar la ventana antes de importar SymPy, NumPy y matplotlib
+    window.update()
+    startup_times = {"first_paint": time.perf_counter() - PROGRAM_START}
+
+    # Proceso de cálculo; importa el núcleo mientras espera, así el primer cálculo no paga ese costo
+    worker.start()
+    simplify_worker.start()
+
+    import_times = {}
+    warm_up_thread = threading.Thread(target=warm_up, args=(WARM_UP_MODULES, import_times), daemon=True)
+    warm_up_thread.start()
+    window.after(POLL_INTERVAL_MS, check_warm_up)
+    window.mainloop()
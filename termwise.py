@@ -0,0 +1,177 @@
+"""
+Operaciones término a término
+-----------------------------
+Integración y derivación de sumas largas repartiendo los términos entre procesos.
+
+``sp.integrate`` y ``sp.diff`` usan un solo núcleo aunque la función sea una
+suma de muchos términos independientes (polinomios largos, series de
+Fourier). ``apply_termwise`` separa los términos de la suma de nivel
+superior, opera cada uno por separado (en un grupo de procesos si hay
+suficientes) y suma los resultados.
+
+La derivada siempre puede separarse. Una integral no: si algún término
+queda como ``Integral`` sin evaluar, esos términos se vuelven a integrar
+juntos, porque sumados pueden tener antiderivada aunque por separado no.
+
+Cada término operado se memoriza, de modo que una función que solo cambia
+en algunos términos reutiliza el resultado de los demás.
+
+Los procesos demonio (los de ``batch.py`` y del servicio HTTP) no pueden
+crear procesos hijos; dentro de ellos los términos se operan en secuencia y
+solo se aprovecha la memoria de términos. El proceso de cálculo de la
+interfaz no es demonio (ver ``CalculationWorker``), así que allí los
+términos sí se reparten.
+
+Dependencias:
+    - sympy: Para cálculos simbólicos
+"""
+
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import sympy as sp
+
+from calculation_worker import can_use_processes
+
+# Operaciones admitidas por apply_termwise
+TERMWISE_OPERATIONS = ["integrate", "diff"]
+
+# Número mínimo de términos sin memorizar para usar el grupo de procesos
+MIN_PARALLEL_TERMS = 4
+
+# Número de términos operados que se conservan en memoria
+TERM_CACHE_SIZE = 1024
+
+_terms = OrderedDict()
+_lock = threading.Lock()
+_executor = None
+_executor_workers = None
+
+
+def _apply(operation, term, variable):
+    """Opera un solo término; se ejecuta también en los procesos del grupo."""
+    if operation == "integrate":
+        return sp.integrate(term, variable)
+    return sp.diff(term, variable)
+
+
+def split_terms(expression):
+    """
+    Separa los términos de la suma de nivel superior (sin expandir la expresión).
+
+    Args:
+        expression (sympy.Expr): Expresión
+
+    Returns:
+        tuple: Términos; un solo elemento si la expresión no es una suma
+    """
+    return sp.Add.make_args(expression)
+
+
+def _get_executor(workers):
+    """Devuelve el grupo de procesos compartido, recreándolo si cambia su tamaño."""
+    global _executor, _executor_workers
+    with _lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False, cancel_futures=True)
+            # "spawn" para no copiar los hilos en curso del proceso
+            _executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+            _executor_workers = workers
+        return _executor
+
+
+def _remember(key, result):
+    with _lock:
+        _terms[key] = result
+        _terms.move_to_end(key)
+        while len(_terms) > TERM_CACHE_SIZE:
+            _terms.popitem(last=False)
+
+
+def _lookup(key):
+    with _lock:
+        result = _terms.get(key)
+        if result is not None:
+            _terms.move_to_end(key)
+        return result
+
+
+def _apply_all(operation, terms, variable, workers):
+    """
+    Opera varios términos, con memoria y, si conviene, en el grupo de procesos.
+
+    Returns:
+        dict: Resultado por término
+    """
+    results = {}
+    missing = []
+    for term in terms:
+        result = _lookup((operation, term, variable))
+        if result is None:
+            missing.append(term)
+        else:
+            results[term] = result
+
+    if len(missing) >= MIN_PARALLEL_TERMS and workers != 1 and can_use_processes():
+        executor = _get_executor(workers)
+        computed = executor.map(_apply, [operation] * len(missing), missing, [variable] * len(missing))
+    else:
+        computed = (_apply(operation, term, variable) for term in missing)
+    for term, result in zip(missing, computed):
+        _remember((operation, term, variable), result)
+        results[term] = result
+    return results
+
+
+def apply_termwise(operation, expression, variable, workers=None):
+    """
+    Integra o deriva una expresión término a término.
+
+    Args:
+        operation (str): "integrate" o "diff"
+        expression (sympy.Expr): Expresión a operar
+        variable (sympy.Symbol): Variable de integración o derivación
+        workers (int): Procesos del grupo (por defecto, uno por núcleo; 1 para no usar procesos)
+
+    Returns:
+        sympy.Expr: Suma de los resultados de cada término
+
+    Raises:
+        ValueError: Si la operación no existe
+    """
+    if operation not in TERMWISE_OPERATIONS:
+        raise ValueError(f"Operación desconocida: {operation}")
+    workers = workers or os.cpu_count() or 1
+    terms = split_terms(expression)
+    if len(terms) == 1:
+        return _apply_all(operation, terms, variable, 1)[terms[0]]
+
+    results = _apply_all(operation, terms, variable, workers)
+    if operation == "integrate":
+        failed = [term for term in terms if results[term].has(sp.Integral)]
+        if len(failed) > 1:
+            # Sumados pueden tener antiderivada aunque cada uno por separado no la tenga
+            remainder = sp.Add(*failed)
+            combined = _apply_all(operation, (remainder,), variable, 1)[remainder]
+            return sp.Add(*(results[term] for term in terms if term not in failed), combined)
+    return sp.Add(*(results[term] for term in terms))
+
+
+def clear_terms():
+    """Descarta los términos memorizados."""
+    with _lock:
+        _terms.clear()
+
+
+def shutdown():
+    """Detiene el grupo de procesos, si existe."""
+    global _executor, _executor_workers
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(cancel_futures=True)
+        _executor = None
+        _executor_workers = None